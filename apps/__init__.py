@@ -1,6 +1,33 @@
-"""Module contains exported applications. """
+"""Module contains exported applications. The apps are imported on first access, so only
+the installed apps and their dependencies are imported.
+"""
 
-from apps.happy_birthder.happy_birthder import HappyBirthder
-from apps.holidays.holidays import Holidays
-from apps.reminder.reminder import Reminder
-from apps.vote_or_die.vote_or_die import VoteOrDie
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from apps.happy_birthder.happy_birthder import HappyBirthder
+    from apps.holidays.holidays import Holidays
+    from apps.reminder.reminder import Reminder
+    from apps.vote_or_die.vote_or_die import VoteOrDie
+
+_EXPORTS = {
+    'HappyBirthder': 'apps.happy_birthder.happy_birthder',
+    'Holidays': 'apps.holidays.holidays',
+    'Reminder': 'apps.reminder.reminder',
+    'VoteOrDie': 'apps.vote_or_die.vote_or_die',
+}
+
+__all__ = ['HappyBirthder', 'Holidays', 'Reminder', 'VoteOrDie', ]
+
+
+def __getattr__(name: str) -> Any:
+    """Return exported app, importing its module on first access. """
+
+    module_name: str | None = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value: Any = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
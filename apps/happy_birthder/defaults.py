@@ -19,10 +19,6 @@ CONGRATULATION_PHRASES = [
     'Birthdays are filled with yesterday’s memories, today’s joys, and tomorrow’s dreams.',
 ]
 
-SCHEDULER_SETTINGS = {
-    'apscheduler.timezone': TIME_ZONE,
-}
-
 TENOR_SEARCH_TERM = [
     'darthvaderbirthday',
     'gameofthronesbirthday',
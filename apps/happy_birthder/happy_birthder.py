@@ -5,8 +5,7 @@ import random
 from datetime import date, datetime, timedelta
 from urllib.parse import urljoin
 
-from aiohttp import ClientResponseError, ClientSession
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from aiohttp import ClientResponseError
 
 from apps.happy_birthder import settings
 from apps.happy_birthder.mixins import CommandsMixin, DialogsMixin
@@ -18,17 +17,17 @@ from meeseeks.logger import LOGGER
 class GifReceiver:  # pylint: disable=too-few-public-methods
     """Provide functionality for getting gifs from TenorAPI. """
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, session):
         self._api_key = api_key
         self._anon_id = ''
+        self._session = session
 
     async def _get_anon_id(self):
         if self._anon_id:
             return self._anon_id
 
         url = urljoin(settings.TENOR_API_URL, f'anonid?key={self._api_key}')
-        async with ClientSession(raise_for_status=True) as session:
-            response_raw = await session.get(url=url)
+        async with self._session.get(url=url, raise_for_status=True) as response_raw:
             response = await response_raw.json()
 
         self._anon_id = response['anon_id']
@@ -48,12 +47,11 @@ class GifReceiver:  # pylint: disable=too-few-public-methods
             f'search?tag={tag}&key={self._api_key}'
             f'&limit={settings.TENOR_IMAGE_LIMIT}&anon_id={anon_id}',
         )
-        async with ClientSession(raise_for_status=True) as session:
-            try:
-                response_raw = await session.get(url)
+        try:
+            async with self._session.get(url, raise_for_status=True) as response_raw:
                 response = await response_raw.json()
-            except ClientResponseError:
-                return []
+        except ClientResponseError:
+            return []
 
         gifs: list = response['results']
         filtered_gifs = []
@@ -81,33 +79,33 @@ class HappyBirthder(CommandsMixin, DialogsMixin, MeeseeksCore):
 
         self.__dict__.update(kwargs)
 
-        self.gif_receiver = GifReceiver(settings.TENOR_API_KEY)
-        self.scheduler = AsyncIOScheduler(settings.SCHEDULER_SETTINGS)
+        self.gif_receiver = GifReceiver(settings.TENOR_API_KEY, self._http_session)
 
     async def check_users_avatars(self):
         """Checks if the users set their avatars. """
 
         persons_without_avatar = ''
-        server_users = await self._restapi.get_users()
-        async with ClientSession() as session:
-            for user in server_users.values():
-                if self.check_user_status(user):
-                    url = urljoin(settings.ROCKET_CHAT_API, f'/avatar/{user["username"]}')
-                    response_raw = await session.get(url)
-                    if response_raw.content_type == 'image/svg+xml':
-                        persons_without_avatar += f'\n@{user["username"]}'
-                        await self._restapi.write_msg(settings.NOTIFY_SET_AVATAR, user['_id'])
-
-            if persons_without_avatar and settings.BIRTHDAY_LOGGING_CHANNEL:
-                await self._restapi.write_msg(
-                    settings.PERSONS_WITHOUT_AVATAR_RESPONSE + persons_without_avatar,
-                    settings.BIRTHDAY_LOGGING_CHANNEL,
-                )
+        server_users = await self._user_directory.get_users()
+        for user in server_users.values():
+            if self.check_user_status(user):
+                url = urljoin(settings.ROCKET_CHAT_API, f'/avatar/{user["username"]}')
+                async with self._http_session.get(url) as response_raw:
+                    content_type = response_raw.content_type
+
+                if content_type == 'image/svg+xml':
+                    persons_without_avatar += f'\n@{user["username"]}'
+                    await self._restapi.write_msg(settings.NOTIFY_SET_AVATAR, user['_id'])
+
+        if persons_without_avatar and settings.BIRTHDAY_LOGGING_CHANNEL:
+            await self._restapi.write_msg(
+                settings.PERSONS_WITHOUT_AVATAR_RESPONSE + persons_without_avatar,
+                settings.BIRTHDAY_LOGGING_CHANNEL,
+            )
 
     async def update_users(self):
         """Receive all user in chat and updates information in database. """
 
-        server_users = await self._restapi.get_users()
+        server_users = await self._user_directory.get_users()
         for user in server_users.values():
             if self.check_user_status(user):
                 if not await User.get(user['_id']):
@@ -254,33 +252,10 @@ class HappyBirthder(CommandsMixin, DialogsMixin, MeeseeksCore):
         if settings.CHECK_USERS_AVATARS:
             await self.check_users_avatars()
 
-    @staticmethod
-    def parse_crontab(crontab: str) -> dict[str, str]:
-        """Return parsed params from given crontab string. """
-
-        second, minute, hour, day, month, day_of_week = crontab.split()
-
-        return {
-            'second': second,
-            'minute': minute,
-            'hour': hour,
-            'day': day,
-            'month': month,
-            'day_of_week': day_of_week,
-        }
-
     async def start_scheduler(self):
-        """Starts all scheduler jobs. """
-
-        self.scheduler.add_job(
-            self.scheduler_jobs,
-            id='schedule',
-            coalesce=False,
-            max_instances=1,
-            trigger='cron',
-            **self.parse_crontab(settings.HB_CRONTAB)
-        )
-        self.scheduler.start()
+        """Registers all scheduler jobs. """
+
+        self._scheduler.add_job(self.app_name, 'schedule', self.scheduler_jobs, settings.HB_CRONTAB)
 
     @staticmethod
     async def _connect_base():
@@ -106,7 +106,6 @@ class CommandsMixin(CommandsBase, ABC):
         and sends response to Rocket.Chat.
         """
 
-        server_users = await self._restapi.get_users()
         arguments = self._get_arguments(self._command_method.command_name)
         users_info = [user_info_raw.split() for user_info_raw in arguments]
         response = ''
@@ -114,11 +113,8 @@ class CommandsMixin(CommandsBase, ABC):
         for user_info in users_info:
             user_name = user_info[0].replace('@', '')
             user_in_base = await User.query.where(User.name == user_name).gino.first()
-            user_id = ''
-
-            for server_user_values in server_users.values():
-                if user_name == server_user_values['username']:
-                    user_id = server_user_values['_id']
+            server_user = await self._user_directory.get_user_by_username(user_name)
+            user_id = server_user['_id'] if server_user else ''
 
             if user_id == '':
                 response += f'\n@{user_name} - User does not exist in Rocket.Chat'
@@ -173,7 +169,7 @@ class CommandsMixin(CommandsBase, ABC):
         then sends response to Rocket.Chat.
         """
 
-        server_users = await self._restapi.get_users()
+        server_users = await self._user_directory.get_users()
         for user in server_users.values():
             if self.check_user_status(user):
                 if not await User.get(user['_id']):
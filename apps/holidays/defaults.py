@@ -2,8 +2,4 @@
 
 from meeseeks.settings import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
-SCHEDULER_SETTINGS = {
-    'apscheduler.timezone': TIME_ZONE,
-}
-
 XML_CALENDAR_HOST = 'http://xmlcalendar.ru'
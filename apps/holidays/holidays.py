@@ -6,9 +6,6 @@ from datetime import datetime, timedelta
 from urllib.parse import urljoin
 from xml.etree import ElementTree
 
-from aiohttp import ClientSession
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-
 from apps.holidays import settings
 from meeseeks import MeeseeksCore
 from meeseeks.logger import LOGGER
@@ -17,41 +14,27 @@ from meeseeks.logger import LOGGER
 class Holidays(MeeseeksCore):
     """Holidays application. """
 
-    _custom_holidays = ''
-    _year_of_holiday = ''
-    _days = []
-    _holidays_names = {}
-    _now = None
-    _future_date = None
-    _number_of_days_in_advance = None
-    _xml_file = None
-
     app_name = 'holidays'
 
     def __init__(self, **kwargs):
         super().__init__()
 
-        self.scheduler = AsyncIOScheduler(settings.SCHEDULER_SETTINGS)
-
         self.__dict__.update(kwargs)
 
-    @staticmethod
-    async def _get_xml_file(year):
+    async def _get_xml_file(self, year):
         """Return object of bytes xml file. """
 
         api_url = urljoin(settings.XML_CALENDAR_HOST, f'/data/ru/{year}/calendar.xml')
-        async with ClientSession() as session:
-            response_raw = await session.get(api_url)
-            response_raw.raise_for_status()
-            file_bytes = response_raw.content._buffer[0]  # pylint: disable=protected-access
+        async with self._http_session.get(api_url, raise_for_status=True) as response_raw:
+            file_bytes = await response_raw.read()
 
         return io.BytesIO(file_bytes)
 
-    async def _send_notification(self, response):
+    async def _send_notification(self, response, number_of_days_in_advance):
         """Send notification about holiday in Rocket.Chat. """
 
         if response:
-            if self._number_of_days_in_advance == 7:
+            if number_of_days_in_advance == 7:
                 response_msg = f'Через неделю **"{response["title"]}"**: '
                 if response['start'] == response['end']:
                     response_msg += f'не работаем **{response["start"]}**'
@@ -67,49 +50,50 @@ class Holidays(MeeseeksCore):
 
         return None
 
-    async def _get_custom_holiday_response(self):
+    @staticmethod
+    async def _get_custom_holiday_response(future_date):
         """Check custom holidays and return response. """
 
         response = {}
         if settings.CUSTOM_HOLIDAYS:
-            self._custom_holidays = json.loads(settings.CUSTOM_HOLIDAYS)
-            advance_date = self._now + timedelta(days=self._number_of_days_in_advance)
+            custom_holidays = json.loads(settings.CUSTOM_HOLIDAYS)
 
-            for title, custom_days in self._custom_holidays.items():
+            for title, custom_days in custom_holidays.items():
                 start_date = datetime.strptime(
-                    f'{self._future_date.year}.{custom_days[0]}', '%Y.%m.%d'
+                    f'{future_date.year}.{custom_days[0]}', '%Y.%m.%d'
                 ).date()
-                if advance_date.month == start_date.month and advance_date.day == start_date.day:
+                if future_date.month == start_date.month and future_date.day == start_date.day:
                     response.update({'title': title})
                     response.update({'start': start_date})
 
                     if len(custom_days) > 1:
                         end_date = datetime.strptime(
-                            f'{self._future_date.year}.{custom_days[1]}', '%Y.%m.%d').date()
+                            f'{future_date.year}.{custom_days[1]}', '%Y.%m.%d').date()
                     else:
                         end_date = start_date
                     response.update({'end': end_date})
 
         return response
 
-    async def _get_start_date_of_holiday(self):
+    @staticmethod
+    async def _get_start_date_of_holiday(future_date, days, holidays_names):
         """Return start date of holidays. """
 
         response = {}
         prev_date = None
 
-        for day in self._days:
+        for day in days:
             if day['type'] == '1':
                 holiday_date = datetime.strptime(
-                    f'{self._future_date.year}.{day["day"]}', '%Y.%m.%d'
+                    f'{future_date.year}.{day["day"]}', '%Y.%m.%d'
                 ).date()
 
-                if (self._future_date.month == holiday_date.month and
-                        self._future_date.day == holiday_date.day):
+                if (future_date.month == holiday_date.month and
+                        future_date.day == holiday_date.day):
                     if prev_date and (holiday_date - prev_date).days == 1:
                         break
 
-                    holiday_title = self._holidays_names.get(day.get('holiday_id'))
+                    holiday_title = holidays_names.get(day.get('holiday_id'))
                     if holiday_title:
                         response.update({'title': holiday_title})
                     response.update({'start': holiday_date})
@@ -121,20 +105,21 @@ class Holidays(MeeseeksCore):
 
         return prev_date, response
 
-    async def _get_end_date_of_holiday(self, prev_date, response):
+    @staticmethod
+    async def _get_end_date_of_holiday(future_date, days, holidays_names, prev_date, response):
         """Return end date of holiday. """
 
         if response:
-            for day in self._days:
+            for day in days:
                 if 'holiday_id' in day or 'from' in day:
                     date = datetime.strptime(
-                        f'{self._future_date.year}.{day["day"]}', '%Y.%m.%d'
+                        f'{future_date.year}.{day["day"]}', '%Y.%m.%d'
                     ).date()
                     if prev_date > date:
                         continue
 
                     if prev_date and (date - prev_date).days == 1:
-                        holiday_title = self._holidays_names.get(day.get('holiday_id'))
+                        holiday_title = holidays_names.get(day.get('holiday_id'))
                         if holiday_title:
                             response.update({'title': holiday_title})
                         response.update({'end': date})
@@ -142,80 +127,69 @@ class Holidays(MeeseeksCore):
 
         return response
 
-    async def _get_holiday_response(self):
+    async def _get_holiday_response(self, future_date, xml_file):
         """Check holidays from xml file and return response. """
 
-        root = ElementTree.parse(self._xml_file).getroot()
+        holidays_names = {}
+        days = []
+        root = ElementTree.parse(xml_file).getroot()
         for holiday_raw in root.findall('holidays/holiday'):
-            self._holidays_names.update({
+            holidays_names.update({
                 holiday_raw.attrib['id']: holiday_raw.attrib['title']
             })
 
         for day_raw in root.findall('days/day'):
-            self._days.append({
+            days.append({
                 'day': day_raw.attrib['d'],
                 'type': day_raw.attrib['t'],
                 'holiday_id': day_raw.attrib.get('h'),
                 'from': day_raw.attrib.get('f'),
             })
 
-        prev_date, response = await self._get_start_date_of_holiday()
-        response = await self._get_end_date_of_holiday(prev_date, response)
+        prev_date, response = await self._get_start_date_of_holiday(
+            future_date, days, holidays_names,
+        )
+        response = await self._get_end_date_of_holiday(
+            future_date, days, holidays_names, prev_date, response,
+        )
 
         return response
 
     async def _check_holidays(self, number_of_days_in_advance):
-        """Check custom holidays and holidays from xml file and send response in Rocket.Chat. """
-
-        self._now = datetime.today()
-        self._number_of_days_in_advance = number_of_days_in_advance
-        self._future_date = self._now + timedelta(days=self._number_of_days_in_advance)
-        self._xml_file = await self._get_xml_file(self._future_date.year)
-
-        await self._send_notification(await self._get_custom_holiday_response())
-
-        await self._send_notification(await self._get_holiday_response())
+        """Check custom holidays and holidays from xml file and send response in Rocket.Chat.
+        The state of the check is kept in locals, so the checks of both jobs may run at once.
+        """
 
-    @staticmethod
-    def _parse_crontab(crontab: str) -> dict[str, str]:
-        """Return parsed params from given crontab string. """
+        future_date = datetime.today() + timedelta(days=number_of_days_in_advance)
+        xml_file = await self._get_xml_file(future_date.year)
 
-        second, minute, hour, day, month, day_of_week = crontab.split()
+        await self._send_notification(
+            await self._get_custom_holiday_response(future_date), number_of_days_in_advance,
+        )
 
-        return {
-            'second': second,
-            'minute': minute,
-            'hour': hour,
-            'day': day,
-            'month': month,
-            'day_of_week': day_of_week,
-        }
+        await self._send_notification(
+            await self._get_holiday_response(future_date, xml_file), number_of_days_in_advance,
+        )
 
     async def _start_scheduler(self):
-        """Starts all scheduler jobs. """
+        """Registers all scheduler jobs. """
 
-        self.scheduler.add_job(
+        self._scheduler.add_job(
+            self.app_name,
+            'check_week_before',
             self._check_holidays,
-            id='check_week_before',
+            settings.HOLIDAYS_CRONTAB_WEEK_BEFORE,
             kwargs={'number_of_days_in_advance': 7},
-            coalesce=False,
-            max_instances=1,
-            trigger='cron',
-            **self._parse_crontab(settings.HOLIDAYS_CRONTAB_WEEK_BEFORE),
         )
 
-        self.scheduler.add_job(
+        self._scheduler.add_job(
+            self.app_name,
+            'check_day_before',
             self._check_holidays,
-            id='check_day_before',
+            settings.HOLIDAYS_CRONTAB_DAY_BEFORE,
             kwargs={'number_of_days_in_advance': 1},
-            coalesce=False,
-            max_instances=1,
-            trigger='cron',
-            **self._parse_crontab(settings.HOLIDAYS_CRONTAB_DAY_BEFORE),
         )
 
-        self.scheduler.start()
-
     async def setup(self):
         """Trying to log in Meeseeks to Rocket.Chat server. """
 
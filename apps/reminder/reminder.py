@@ -1,6 +1,7 @@
 """Module contains Holidays application classes. """
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import hashlib
+import json
 
 from apps.reminder import settings
 from meeseeks import MeeseeksCore
@@ -15,8 +16,6 @@ class Reminder(MeeseeksCore):
     def __init__(self, **kwargs):
         super().__init__()
 
-        self.scheduler = AsyncIOScheduler(settings.SCHEDULER_SETTINGS)
-
         self.__dict__.update(kwargs)
 
     async def _send_reminder(self, text, channel):
@@ -25,36 +24,23 @@ class Reminder(MeeseeksCore):
         return await self._restapi.write_msg(f'{settings.REMINDER_MESSAGE_TOPIC}{text}',
                                              channel)
 
-    @staticmethod
-    def _parse_crontab(crontab: str) -> dict[str, str]:
-        """Return parsed params from given crontab string. """
-
-        second, minute, hour, day, month, day_of_week = crontab.split()
-
-        return {
-            'second': second,
-            'minute': minute,
-            'hour': hour,
-            'day': day,
-            'month': month,
-            'day_of_week': day_of_week,
-        }
-
     async def _start_scheduler(self):
-        """Starts all scheduler jobs. """
+        """Registers all scheduler jobs. """
 
         for reminder in settings.REMINDERS_LIST:
-            self.scheduler.add_job(
+            # The id depends on the reminder rather than its position in the list, so the time
+            # of its last run is kept when other reminders are added or removed
+            digest = hashlib.sha1(
+                json.dumps(reminder, sort_keys=True).encode(), usedforsecurity=False,
+            ).hexdigest()
+            self._scheduler.add_job(
+                self.app_name,
+                f'reminder-{digest[:12]}',
                 self._send_reminder,
+                reminder['crontab'],
                 kwargs={'text': reminder['text'], 'channel': reminder['channel']},
-                coalesce=False,
-                max_instances=1,
-                trigger='cron',
-                **self._parse_crontab(reminder['crontab']),
             )
 
-        self.scheduler.start()
-
     async def setup(self):
         """Trying to log in Meeseeks to Rocket.Chat server. """
 
@@ -52,7 +52,7 @@ class CommandsMixin(CommandsBase, ABC):
                 response = await self._write_command_attachment(title, '\n'.join(options))
 
                 for i in range(0, len(options)):
-                    await self._restapi.add_reaction(
+                    await self._add_reaction(
                         response['message']['_id'], settings.EMOJIS[i], True)
             else:
                 await self._write_command_msg(settings.TOO_MANY_ARGS)
@@ -1,8 +1,7 @@
 """Module contains functionality for interaction with Rocket.Chat RestAPI. """
 
-import json
-
-from meeseeks import settings
+from meeseeks import codec, settings
+from meeseeks.outbox import PRIORITY_INTERACTIVE
 from meeseeks.restapi import RestAPI as RestAPIBase
 
 
@@ -12,7 +11,7 @@ class RestAPI(RestAPIBase):
     async def write_attachments_msg(self, title, text, room_id):
         """Sends message to Rocket.Chat with attachments. """
 
-        msg = json.dumps({
+        msg = codec.dumps({
             'channel': room_id,
             'text': '_Please vote using reactions_',
             'alias': settings.ALIAS,
@@ -28,4 +27,4 @@ class RestAPI(RestAPIBase):
             }]
         })
 
-        return await self.make_request(settings.CHAT_MESSAGE_POST_REQUEST, 'post', msg)
+        return await self.post_message(msg, PRIORITY_INTERACTIVE)
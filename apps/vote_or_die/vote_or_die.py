@@ -17,7 +17,7 @@ class VoteOrDie(CommandsMixin, DialogsMixin, MeeseeksCore):
 
         self.__dict__.update(kwargs)
 
-        self._restapi = RestAPI(self._headers)
+        self._restapi = self._restapi.specialize(RestAPI)
 
     async def setup(self):
         """Trying to log in Meeseeks to Rocket.Chat server. """
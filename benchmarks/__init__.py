@@ -0,0 +1 @@
+"""Package contains benchmarks of the hot paths of Meeseeks. """
@@ -0,0 +1,84 @@
+"""Module contains command for running benchmarks of the hot paths of Meeseeks. """
+
+import argparse
+import asyncio
+import sys
+
+from benchmarks.cases import BENCHMARKS
+from benchmarks.runner import Result, compare, format_results, load_baseline, measure, save_baseline
+from benchmarks.workload import load_frames, make_frames
+from meeseeks import settings
+
+
+async def run(names: list[str], messages: int, alloc_messages: int,
+              recording: str | None) -> list[Result]:
+    """Runs the benchmarks with the given names or all of them. """
+
+    frames: list[str] = await load_frames(recording) if recording else make_frames(1000)
+    results: list[Result] = []
+    for benchmark_class in BENCHMARKS:
+        if names and benchmark_class.name not in names:
+            continue
+
+        benchmark = benchmark_class(frames)
+        await benchmark.setup()
+        try:
+            results.append(await measure(benchmark.name, benchmark.step, messages, alloc_messages))
+        finally:
+            await benchmark.teardown()
+
+    return results
+
+
+def main() -> None:
+    """Entry point. """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of the hot paths of Meeseeks',
+        epilog='The arguments, lookup and loop benchmarks import the apps given by --apps. '
+               'apps.HappyBirthder needs gino and psycopg2 and the PG_NAME, PG_HOST, PG_PORT, '
+               'PG_USER, PG_PASSWORD, COMPANY_NAME and TENOR_API_KEY environment variables, '
+               'so pass --apps meeseeks.MeeseeksBaseApp to run them without it.',
+    )
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help=f'benchmarks to run: {", ".join(b.name for b in BENCHMARKS)}')
+    parser.add_argument('--messages', type=int, default=20000,
+                        help='number of messages processed by each benchmark')
+    parser.add_argument('--alloc-messages', type=int, default=1000,
+                        help='number of messages processed when measuring allocations')
+    parser.add_argument('--apps', default=','.join(settings.INSTALLED_APPS),
+                        help='comma-separated apps used instead of INSTALLED_APPS')
+    parser.add_argument('--frames', help='recording made with RECORD_FRAMES to use instead of '
+                                         'the synthetic workload')
+    parser.add_argument('--save', metavar='BASELINE', help='save the results as the baseline')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='compare the results with the baseline and exit with status 1 '
+                             'if there are regressions')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fraction of change relative to the baseline which is not '
+                             'considered as a regression')
+    args = parser.parse_args()
+    settings.INSTALLED_APPS = tuple(app.strip() for app in args.apps.split(',') if app.strip())
+
+    results: list[Result] = asyncio.run(
+        run(args.names, args.messages, args.alloc_messages, args.frames),
+    )
+    baseline: dict[str, dict[str, float]] | None = None
+    if args.compare:
+        baseline = load_baseline(args.compare)
+
+    print(format_results(results, baseline))
+    if args.save:
+        print(f'Baseline is saved to {save_baseline(args.save, results)}')
+
+    if baseline is not None:
+        regressions: list[str] = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""Module contains benchmarks of the hot paths of processing of incoming frames. """
+
+# Benchmarks drive the internals of the core directly
+# pylint: disable=protected-access
+
+import itertools
+import json
+from typing import Any, AsyncIterator, Iterator
+
+from benchmarks.workload import rebase_frames
+from meeseeks import codec, defaults, settings
+from meeseeks.cache import SingleFlight, TTLCache
+from meeseeks.context import ChangedRoomMessageCtx, ContextRoom
+from meeseeks.core import MeeseeksCore
+from meeseeks.dispatcher import Dispatcher
+from meeseeks.directory import UserDirectory
+from meeseeks.envelope import parse_envelope
+from meeseeks.filters import FrameFilter
+from meeseeks.keepalive import Keepalive
+from meeseeks.outbox import Outbox
+from meeseeks.recorder import ReplayWebSocket
+from meeseeks.restapi import RestAPI, create_client_session
+from meeseeks.router import CommandRouter, normalize_msg
+from meeseeks.rtapi import RealTimeAPI
+from meeseeks.serializers import ContextSerializer
+from tests.mock_server import BOT_USER_ID, MockRocketChatServer
+
+
+class Benchmark:
+    """Base class of benchmarks which process one message per step. """
+
+    name: str = ''
+
+    def __init__(self, frames: list[str]):
+        self._frames: list[str] = frames
+
+    async def setup(self) -> None:
+        """Starts the services the benchmark depends on. """
+
+    async def step(self) -> None:
+        """Processes the next message. """
+
+        raise NotImplementedError
+
+    async def teardown(self) -> None:
+        """Releases resources of the benchmark. """
+
+
+def _serialize(raw_context: dict[str, Any]) -> Any:
+    """Return context of the given frame. """
+
+    return ContextSerializer(raw_context, raw_context['msg'], raw_context['collection']).serialize()
+
+
+def _get_room_messages(frames: list[str]) -> list[ChangedRoomMessageCtx]:
+    """Return contexts of the room messages among the frames. """
+
+    contexts: list[ChangedRoomMessageCtx] = []
+    for frame in frames:
+        raw_context: dict[str, Any] = json.loads(frame)
+        if raw_context.get('collection') == 'stream-room-messages':
+            contexts.append(_serialize(raw_context))
+
+    return contexts
+
+
+def _add_apps(core: MeeseeksCore) -> CommandRouter:
+    """Creates the installed apps of the core and returns the router of their commands. """
+
+    core._apps, core._router = [], CommandRouter()
+    core._starting_apps, core._failed_apps = set(), set()
+    for app in core._init_apps():
+        core._add_app(app)
+
+    return core._router
+
+
+class DecodeBenchmark(Benchmark):
+    """Decoding of frames received over the websocket by the codec selected by JSON_CODEC. """
+
+    name = 'decode'
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        self._next_frame: Iterator[str] = itertools.cycle(self._frames)
+
+    async def step(self) -> None:
+        codec.loads(next(self._next_frame))
+
+
+class EncodeBenchmark(Benchmark):
+    """Encoding of frames by the codec selected by JSON_CODEC. """
+
+    name = 'encode'
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        self._next_raw_context: Iterator[dict[str, Any]] = itertools.cycle(
+            [json.loads(frame) for frame in self._frames],
+        )
+
+    async def step(self) -> None:
+        codec.dumps(next(self._next_raw_context))
+
+
+class SerializeBenchmark(Benchmark):
+    """Serializing of room messages by ContextSerializer. """
+
+    name = 'serialize'
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        raw_contexts: list[dict[str, Any]] = [json.loads(frame) for frame in self._frames]
+        self._next_raw_context: Iterator[dict[str, Any]] = itertools.cycle(
+            raw_context for raw_context in raw_contexts
+            if raw_context.get('collection') == 'stream-room-messages'
+        )
+
+    async def step(self) -> None:
+        _serialize(next(self._next_raw_context))
+
+
+class ArgumentsBenchmark(Benchmark):
+    """Parsing of messages into envelopes, including normalizing of messages, lookup of
+    requested commands and extracting of command arguments.
+    """
+
+    name = 'arguments'
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        core: MeeseeksCore = MeeseeksCore()
+        core._restapi = RestAPI(core._headers)
+        self._router: CommandRouter = _add_apps(core)
+        self._next_ctx: Iterator[ChangedRoomMessageCtx] = itertools.cycle(
+            _get_room_messages(self._frames),
+        )
+
+    async def step(self) -> None:
+        ctx: ChangedRoomMessageCtx = next(self._next_ctx)
+        parse_envelope(
+            ctx.msg,
+            f'@{settings.USER_NAME}',
+            ctx.room.type == ContextRoom.DIALOG_ROOM_TYPE,
+            self._router,
+        )
+
+
+class LookupBenchmark(Benchmark):
+    """Lookup of requested commands among the commands of all installed apps. """
+
+    name = 'lookup'
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        core: MeeseeksCore = MeeseeksCore()
+        core._restapi = RestAPI(core._headers)
+        self._router: CommandRouter = _add_apps(core)
+        self._next_command: Iterator[str] = itertools.cycle(
+            normalize_msg(ctx.msg.replace(f'@{settings.USER_NAME}', '', 1))
+            for ctx in _get_room_messages(self._frames)
+        )
+
+    async def step(self) -> None:
+        self._router.resolve(next(self._next_command))
+
+
+class LoopBenchmark(Benchmark):
+    """Iterations of MeeseeksCore.loop with all installed apps, including processing of
+    the frame by the apps. Replies are sent to the mock Rocket.Chat server.
+    """
+
+    name = 'loop'
+
+    async def _receive_frames(self) -> AsyncIterator[str]:
+        """Return the result of the login and then the frames endlessly. On each round
+        the ids of the messages are changed, otherwise the messages would be dropped as
+        duplicates.
+        """
+
+        yield json.dumps({
+            'msg': 'result',
+            'id': defaults.RC_REALTIME_LOGIN,
+            'result': {'id': BOT_USER_ID, 'token': 'benchmark-token'},
+        })
+        for round_number in itertools.count():
+            for frame in self._frames:
+                yield frame.replace('"_id": "', f'"_id": "{round_number}-', 1)
+
+    def __init__(self, frames: list[str]):
+        super().__init__(frames)
+
+        self._server: MockRocketChatServer = MockRocketChatServer(
+            users=1000, bot_username=settings.USER_NAME,
+        )
+        self._api: str = settings.ROCKET_CHAT_API
+
+        # The components are created in the same order as in MeeseeksCore.run, but the apps
+        # are not set up because it is not a part of the processing of frames
+        core: MeeseeksCore = MeeseeksCore()
+        core._http_session = create_client_session()
+        core._websocket = ReplayWebSocket(self._receive_frames())
+        core._rtapi = RealTimeAPI(core._websocket)
+        core._keepalive = Keepalive(
+            core._rtapi,
+            settings.KEEPALIVE_INTERVAL,
+            settings.KEEPALIVE_TIMEOUT,
+            settings.KEEPALIVE_MAX_RTT,
+        )
+        core._users_cache = TTLCache(settings.USERS_CACHE_SIZE, settings.USERS_CACHE_TTL)
+        # The rate limit of the outbox would measure the pacing instead of the core
+        core._outbox = Outbox(1e9, 1e9, 0, 0, 0)
+        core._restapi = RestAPI(
+            core._headers,
+            core._http_session,
+            core._users_cache,
+            SingleFlight(settings.REST_RESULT_CACHE_TTL),
+            core._outbox,
+        )
+        core._user_directory = UserDirectory(core._restapi)
+        _add_apps(core)
+        core._dispatcher = Dispatcher(
+            core._process_frame, settings.DISPATCH_CONCURRENCY, settings.DISPATCH_QUEUE_SIZE,
+        )
+        self._core: MeeseeksCore = core
+
+    async def setup(self) -> None:
+        await self._server.start()
+        settings.ROCKET_CHAT_API = self._server.api_url
+        self._core._outbox.start()
+        # The bot logs in as the bot user of the mock server and subscribes to the messages,
+        # which are sent from that moment on
+        await self._core.login()
+        self._frames = rebase_frames(self._frames)
+        self._core._frame_filter = FrameFilter(self._core._user_id)
+        self._core._dispatcher.start()
+
+    async def step(self) -> None:
+        await self._core.loop()
+        await self._core.join()
+
+    async def teardown(self) -> None:
+        await self._core._dispatcher.stop()
+        await self._core._outbox.stop()
+        if self._core._http_session is not None:
+            await self._core._http_session.close()
+
+        await self._server.stop()
+        settings.ROCKET_CHAT_API = self._api
+
+
+BENCHMARKS: tuple[type[Benchmark], ...] = (
+    DecodeBenchmark,
+    EncodeBenchmark,
+    SerializeBenchmark,
+    ArgumentsBenchmark,
+    LookupBenchmark,
+    LoopBenchmark,
+)
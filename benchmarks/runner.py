@@ -0,0 +1,149 @@
+"""Module contains runner of benchmarks which measures throughput and memory allocations
+and compares the results with the saved baseline.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+Step = Callable[[], Awaitable[None]]
+
+
+class Result:
+    """Contains result of a benchmark. """
+
+    __slots__ = ('name', 'messages', 'seconds', 'allocated', 'retained', )
+
+    def __init__(self, name: str, messages: int, seconds: float, allocated: float,
+                 retained: float):
+        self.name: str = name
+        self.messages: int = messages
+        self.seconds: float = seconds
+        self.allocated: float = allocated
+        self.retained: float = retained
+
+    @property
+    def per_second(self) -> float:
+        """Return number of messages processed per second. """
+
+        return self.messages / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Return result in the format of baselines. """
+
+        return {
+            'messages_per_second': self.per_second,
+            'allocated_bytes_per_message': self.allocated,
+            'retained_bytes_per_message': self.retained,
+        }
+
+
+async def measure(name: str, step: Step, messages: int, alloc_messages: int) -> Result:
+    """Runs the given coroutine function processing one message at a time. First the time of
+    processing of all messages is measured, then the peak of memory allocated while processing
+    each message and the memory left allocated after processing are measured by tracemalloc
+    on a smaller number of messages, because tracing slows down the processing.
+    """
+
+    for _ in range(min(messages // 10, 1000)):
+        await step()
+
+    started_at: float = time.perf_counter()
+    for _ in range(messages):
+        await step()
+
+    seconds: float = time.perf_counter() - started_at
+
+    allocated: int = 0
+    tracemalloc.start()
+    try:
+        before: int = tracemalloc.get_traced_memory()[0]
+        for _ in range(alloc_messages):
+            current: int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await step()
+            allocated += tracemalloc.get_traced_memory()[1] - current
+
+        retained: int = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    alloc_messages = max(alloc_messages, 1)
+    return Result(name, messages, seconds, allocated / alloc_messages, retained / alloc_messages)
+
+
+def _get_baseline_path(name: str) -> str:
+    """Return path to the baseline with the given name. """
+
+    return os.path.join(BASELINES_DIR, f'{name}.json')
+
+
+def save_baseline(name: str, results: list[Result]) -> str:
+    """Saves the results as the baseline with the given name and return its path. """
+
+    os.makedirs(BASELINES_DIR, exist_ok=True)
+    path: str = _get_baseline_path(name)
+    with open(path, 'w', encoding='utf-8') as baseline:
+        json.dump({result.name: result.as_dict() for result in results}, baseline, indent=2)
+
+    return path
+
+
+def load_baseline(name: str) -> dict[str, dict[str, float]]:
+    """Return the baseline with the given name. """
+
+    with open(_get_baseline_path(name), encoding='utf-8') as baseline:
+        results: dict[str, dict[str, float]] = json.load(baseline)
+
+    return results
+
+
+def compare(
+        results: list[Result], baseline: dict[str, dict[str, float]], tolerance: float,
+) -> list[str]:
+    """Return descriptions of regressions: throughput dropped or allocations grew
+    by more than the given fraction compared to the baseline.
+    """
+
+    regressions: list[str] = []
+    for result in results:
+        previous: dict[str, Any] | None = baseline.get(result.name)
+        if previous is None:
+            continue
+
+        previous_per_second: float = previous['messages_per_second']
+        if result.per_second < previous_per_second * (1 - tolerance):
+            regressions.append(f'{result.name}: {result.per_second:.0f} messages per second, '
+                               f'was {previous_per_second:.0f}')
+
+        previous_allocated: float = previous['allocated_bytes_per_message']
+        if result.allocated > previous_allocated * (1 + tolerance):
+            regressions.append(f'{result.name}: {result.allocated:.0f} bytes allocated '
+                               f'per message, was {previous_allocated:.0f}')
+
+    return regressions
+
+
+def format_results(
+        results: list[Result], baseline: dict[str, dict[str, float]] | None = None,
+) -> str:
+    """Return table of the results with the changes relative to the baseline if there is one. """
+
+    lines: list[str] = [
+        f'{"benchmark":<24}{"msg/s":>14}{"us/msg":>10}{"alloc B/msg":>14}{"kept B/msg":>12}'
+    ]
+    for result in results:
+        line: str = (f'{result.name:<24}{result.per_second:>14.0f}'
+                     f'{1e6 / result.per_second if result.per_second else 0:>10.2f}'
+                     f'{result.allocated:>14.0f}{result.retained:>12.0f}')
+        previous: dict[str, float] | None = (baseline or {}).get(result.name)
+        if previous and previous['messages_per_second']:
+            change: float = result.per_second / previous['messages_per_second'] - 1
+            line += f'  {change:+.1%} msg/s'
+        lines.append(line)
+
+    return '\n'.join(lines)
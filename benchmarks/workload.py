@@ -0,0 +1,94 @@
+"""Module contains synthetic workload of Rocket.Chat frames for benchmarks. """
+
+import json
+import time
+from typing import Any
+
+from meeseeks import settings
+from meeseeks.context import get_message_version
+from meeseeks.recorder import FrameReplayer, rewrite_frame
+from tests.mock_server import BOT_USER_ID, GENERAL_ROOM_ID
+
+DIRECT_ROOM_ID = f'{BOT_USER_ID}user0000000000001'
+
+# Every 20 messages contain 14 messages in channels which do not mention the bot, 2 commands,
+# 1 unknown command, 1 direct message, 1 link preview and 1 message of the bot itself
+_MIX = (
+    ('chatter', 14, ),
+    ('command', 2, ),
+    ('unknown_command', 1, ),
+    ('direct', 1, ),
+    ('link_preview', 1, ),
+    ('own', 1, ),
+)
+
+
+def _make_message(kind: str, number: int, ts: int) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return room message of the given kind and the options of its room. """
+
+    user_id: str = BOT_USER_ID if kind == 'own' else f'user{number % 1000:013d}'
+    message: dict[str, Any] = {
+        '_id': f'msg{number:014d}',
+        'rid': GENERAL_ROOM_ID,
+        'msg': f'Message number {number} about nothing in particular',
+        'ts': {'$date': ts},
+        'u': {'_id': user_id, 'username': f'user{number % 1000}', 'name': f'User {number}'},
+        '_updatedAt': {'$date': ts},
+    }
+    options: dict[str, Any] = {'roomParticipant': True, 'roomType': 'c', 'roomName': 'general'}
+    if kind == 'command':
+        message['msg'] = f'@{settings.USER_NAME} help'
+    elif kind == 'unknown_command':
+        message['msg'] = f'@{settings.USER_NAME} make me a sandwich, please'
+    elif kind == 'direct':
+        message['rid'] = DIRECT_ROOM_ID
+        message['msg'] = 'hello'
+        options = {'roomParticipant': True, 'roomType': 'd'}
+    elif kind == 'link_preview':
+        message['msg'] = f'@{settings.USER_NAME} https://example.com'
+        message['urls'] = [{'url': 'https://example.com', 'meta': {'pageTitle': 'Example'}}]
+
+    return message, options
+
+
+def make_frames(count: int) -> list[str]:
+    """Return the given number of encoded 'changed' events of stream-room-messages. """
+
+    kinds: list[str] = [kind for kind, weight in _MIX for _ in range(weight)]
+    ts: int = int(time.time() * 1000)
+    frames: list[str] = []
+    for number in range(count):
+        message, options = _make_message(kinds[number % len(kinds)], number, ts)
+        frames.append(json.dumps({
+            'msg': 'changed',
+            'collection': 'stream-room-messages',
+            'id': 'id',
+            'fields': {'eventName': '__my_messages__', 'args': [message, options]},
+        }))
+
+    return frames
+
+
+def rebase_frames(frames: list[str]) -> list[str]:
+    """Return the frames with the dates shifted so that the last room message is sent now,
+    that is, the messages are fresh for the bot which has just logged in.
+    """
+
+    raw_contexts: list[dict[str, Any]] = [json.loads(frame) for frame in frames]
+    versions: list[int] = [
+        get_message_version(raw_context['fields']['args'][0]) for raw_context in raw_contexts
+        if raw_context.get('collection') == 'stream-room-messages'
+    ]
+    if not versions:
+        return frames
+
+    shift: int = int(time.time() * 1000) - max(versions)
+    return [json.dumps(rewrite_frame(raw_context, shift, {})) for raw_context in raw_contexts]
+
+
+async def load_frames(path: str) -> list[str]:
+    """Return frames recorded with RECORD_FRAMES. The dates are rebased to the time of
+    loading and the recorded bot is replaced by the bot of the mock server.
+    """
+
+    return [frame async for frame in FrameReplayer(path, user_id=BOT_USER_ID).frames()]
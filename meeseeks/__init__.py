@@ -1,5 +1,31 @@
-"""Package contains tools for building Rocket.Chat apps. """
+"""Package contains tools for building Rocket.Chat apps. The classes are imported on first
+access, so importing a module of the package does not import the core and its dependencies.
+"""
 
-from meeseeks.meeseeks_app import MeeseeksBaseApp
-from meeseeks.core import MeeseeksCore
-from meeseeks.restapi import RestAPI
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from meeseeks.core import MeeseeksCore
+    from meeseeks.meeseeks_app import MeeseeksBaseApp
+    from meeseeks.restapi import RestAPI
+
+_EXPORTS = {
+    'MeeseeksBaseApp': 'meeseeks.meeseeks_app',
+    'MeeseeksCore': 'meeseeks.core',
+    'RestAPI': 'meeseeks.restapi',
+}
+
+__all__ = ['MeeseeksBaseApp', 'MeeseeksCore', 'RestAPI', ]
+
+
+def __getattr__(name: str) -> Any:
+    """Return exported class, importing its module on first access. """
+
+    module_name: str | None = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value: Any = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,28 @@
+"""Module contains exponential backoff used for retries. """
+
+import random
+
+
+class Backoff:
+    """Exponential backoff with full jitter. Each next delay is a random value between zero
+    and the base delay doubled for each previous attempt, but not more than the maximum delay.
+    """
+
+    def __init__(self, base: float, maximum: float):
+        self._base: float = base
+        self._maximum: float = maximum
+
+        self.attempts: int = 0
+
+    def next_delay(self) -> float:
+        """Return delay (in seconds) before the next attempt. """
+
+        delay: float = random.uniform(0, min(self._maximum, self._base * 2 ** self.attempts))
+        self.attempts += 1
+
+        return delay
+
+    def reset(self) -> None:
+        """Starts counting attempts from the beginning. """
+
+        self.attempts = 0
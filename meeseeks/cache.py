@@ -0,0 +1,157 @@
+"""Module contains in-memory caches. """
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+_K = TypeVar('_K', bound=Hashable)
+_V = TypeVar('_V')
+
+
+class TTLCache(Generic[_K, _V]):
+    """LRU cache which entries expire after the given time to live (in seconds). """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize: int = maxsize
+        self._ttl: float = ttl
+        self._data: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: _K) -> _V | None:
+        """Return cached value or None if there is no value or it is expired. """
+
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: _K, value: _V) -> None:
+        """Put value to the cache evicting the least recently used entry if the cache is full. """
+
+        self._data[key] = (time.monotonic() + self._ttl, value, )
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: _K) -> None:
+        """Remove value from the cache. """
+
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values from the cache. """
+
+        self._data.clear()
+
+
+class LatestVersions(Generic[_K]):
+    """Latest versions of the given number of the most recently updated keys. The evicted
+    keys are remembered only by the highest of their versions, so the version of a key which
+    is not kept is considered new only if it is higher than that.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize: int = maxsize
+        self._data: OrderedDict[_K, int] = OrderedDict()
+
+        self.evicted_version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: _K) -> bool:
+        return key in self._data
+
+    def update(self, key: _K, version: int) -> bool:
+        """Remember the version of the key evicting the least recently updated key if
+        the set is full. Return False if the version is not newer than the known one.
+        """
+
+        known_version: int | None = self._data.get(key, self.evicted_version)
+        if known_version is not None and version <= known_version:
+            return False
+
+        self._data[key] = version
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            _, evicted_version = self._data.popitem(last=False)
+            self.evicted_version = max(evicted_version, self.evicted_version or evicted_version)
+
+        return True
+
+
+class SingleFlight(Generic[_K, _V]):
+    """Shares the result of a call between all callers which make the call with the same key
+    while it is in flight. Optionally keeps the result for the given time (in seconds)
+    after the call is completed.
+    """
+
+    def __init__(self, result_ttl: float = 0, maxsize: int = 256):
+        self._in_flight: dict[_K, asyncio.Task[_V]] = {}
+        self._results: TTLCache[_K, _V] | None = (
+            TTLCache(maxsize, result_ttl) if result_ttl > 0 else None
+        )
+
+        self.calls: int = 0
+        self.collapsed: int = 0
+
+    async def do(self, key: _K, func: Callable[[], Awaitable[_V]]) -> _V:
+        """Return result of the call in flight with the same key or make a new call. """
+
+        if self._results is not None:
+            cached_result: _V | None = self._results.get(key)
+            if cached_result is not None:
+                self.collapsed += 1
+                return cached_result
+
+        in_flight: asyncio.Task[_V] | None = self._in_flight.get(key)
+        if in_flight is not None:
+            self.collapsed += 1
+        else:
+            # The call runs in its own task, so cancelling one of the callers does not cancel
+            # the call for the others
+            in_flight = asyncio.ensure_future(self._call(key, func))
+            in_flight.add_done_callback(self._retrieve_exception)
+            self._in_flight[key] = in_flight
+            self.calls += 1
+
+        return await asyncio.shield(in_flight)
+
+    async def _call(self, key: _K, func: Callable[[], Awaitable[_V]]) -> _V:
+        """Makes the call and keeps its result if results are kept. """
+
+        try:
+            result: _V = await func()
+        finally:
+            del self._in_flight[key]
+
+        if self._results is not None:
+            self._results.set(key, result)
+
+        return result
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task[_V]) -> None:
+        """Marks the exception of the call as retrieved, because all callers may be
+        cancelled before the call is completed.
+        """
+
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,50 @@
+"""Module contains JSON codec used to encode and decode messages of Rocket.Chat. The codec
+is selected by JSON_CODEC when the module is imported: orjson is used if it is installed,
+otherwise the standard json module.
+"""
+
+import json
+from typing import Any, Callable
+
+from meeseeks import settings
+from meeseeks.exceptions import BadConfigure
+
+try:
+    import orjson
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+Loads = Callable[[str | bytes], Any]
+
+Dumps = Callable[[Any], str]
+
+
+def _orjson_dumps(obj: Any) -> str:
+    """Return JSON document as str, because websockets sends str as a text frame. """
+
+    return orjson.dumps(obj).decode()
+
+
+def get_codec(name: str) -> tuple[str, Loads, Dumps]:
+    """Return name, decoding and encoding functions of the codec with the given name
+    ('orjson' or 'json'). 'auto' means orjson if it is installed.
+    """
+
+    if name == 'auto':
+        name = 'orjson' if HAS_ORJSON else 'json'
+
+    if name == 'orjson':
+        if not HAS_ORJSON:
+            raise BadConfigure('JSON_CODEC is orjson, but orjson is not installed')
+
+        return name, orjson.loads, _orjson_dumps
+
+    if name == 'json':
+        return name, json.loads, json.dumps
+
+    raise BadConfigure(f'Unknown JSON_CODEC {name!r}')
+
+
+NAME, loads, dumps = get_codec(settings.JSON_CODEC)
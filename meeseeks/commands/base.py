@@ -1,67 +1,96 @@
 """Module contains necessary implementation for Meeseeks commands. """
 
 from abc import ABC
-from typing import Callable
+from typing import Any, Callable
 
 from meeseeks import settings
 from meeseeks.context import ChangedRoomMessageCtx, ContextRoom
 from meeseeks.core import MeeseeksCore
+from meeseeks.outbox import PRIORITY_INTERACTIVE
+from meeseeks.request import COMMAND_METHOD, CTX, RequestLocal
 from meeseeks.commands.decorators import cmd, CommandMethod
-from meeseeks.exceptions import CommandDoesNotExist
+from meeseeks.envelope import Envelope, get_arguments, parse_envelope
+from meeseeks.router import normalize_msg
 from meeseeks.type import UserInfo
 
 
 class Communication(MeeseeksCore, ABC):
     """Contains methods for processing incoming Rocket.Chat messages. """
 
-    _ctx: ChangedRoomMessageCtx
+    _ctx: RequestLocal[ChangedRoomMessageCtx] = CTX
 
     def _get_response_msg(self) -> str:
         """Return message without prefix sent by user. """
 
         return self._ctx.msg.replace(f'@{settings.USER_NAME}', '', 1)
 
+    def _get_envelope(self) -> Envelope:
+        """Return envelope of the message parsed by the core or parse it if there is none. """
+
+        if self._ctx.envelope is not None:
+            return self._ctx.envelope
+
+        return parse_envelope(
+            self._ctx.msg,
+            f'@{settings.USER_NAME}',
+            self._ctx.room.type == ContextRoom.DIALOG_ROOM_TYPE,
+        )
+
     async def _write_command_msg(self, msg: str) -> None:
         """Sends message to channel from which command was called. """
 
-        await self._restapi.write_msg(msg, self._ctx.room.id)
+        await self._write_msg(msg, self._ctx.room.id, PRIORITY_INTERACTIVE)
 
 
 class CommandsBase(Communication, ABC):
     """Contains methods for running commands on client Rocket.Chat. """
 
+    _command_method: RequestLocal[CommandMethod | None] = COMMAND_METHOD
+
     def __init__(self) -> None:
         super().__init__()
 
         self._command_methods: list[CommandMethod] = self._get_command_methods()
-        self._command_method: CommandMethod | None = None
 
     def _get_command_methods(self) -> list[CommandMethod]:
         """Return methods that are Meeseeks commands. """
 
         command_methods: list[CommandMethod] = []
         for method_name in dir(self):
-            method = getattr(self, method_name)
+            # Request local attributes are not set when the app is created
+            method: Any = getattr(self, method_name, None)
             if hasattr(method, 'command_name'):
                 command_methods.append(method)
 
         return command_methods
 
+    def get_command_methods(self) -> list[CommandMethod]:
+        """Return methods that are Meeseeks commands. """
+
+        return self._command_methods
+
     @staticmethod
     def _normalize_msg(message: str) -> str:
         """Return normalized message. """
 
-        return ' '.join(list(map(lambda word: word.strip().lower(), message.split())))
+        return normalize_msg(message)
 
     def _get_arguments(self, command_name: str) -> list[str]:
         """Return arguments from message sent by user. """
 
-        response_msg: str = self._normalize_msg(self._get_response_msg())
-        arguments: list[str] = response_msg.replace(command_name, '', 1).strip().split(',')
-        strip_arg: Callable[[str], str] = lambda arg: arg.strip()
-        arguments = list(map(strip_arg, arguments))
+        envelope: Envelope = self._get_envelope()
+        if envelope.command == command_name:
+            return list(envelope.arguments)
+
+        return list(get_arguments(envelope.text, command_name))
+
+    def get_command_arguments(self) -> list[str]:
+        """Return arguments of the running command. """
 
-        return arguments if arguments[0] != '' else []
+        if self._command_method is None:
+            return []
+
+        return self._get_arguments(self._command_method.command_name)
 
     async def check_permissions(self, roles: list | None = None) -> bool:
         """Checks if user who called command has necessary role. """
@@ -75,31 +104,15 @@ class CommandsBase(Communication, ABC):
 
         return allow
 
-    async def _process_command(self) -> None:
-        """Performs Meeseeks command processing. """
-
-        if (isinstance(self._ctx, ChangedRoomMessageCtx) and self._ctx.user.id != self._user_id and
-                self._ctx.link_previews is False and self._ctx.fresh_msg_date and
-                self._ctx.msg.startswith(f'@{settings.USER_NAME}')):
-            raw_message: str = self._get_response_msg()
-            requested_command: str = self._normalize_msg(raw_message)
-
-            try:
-                self._command_method = next(method for method in self._command_methods if
-                                            requested_command.startswith(method.command_name))
-            except StopIteration as exc:
-                raise CommandDoesNotExist from exc
-
-            if self._command_method:
-                await self._command_method()
-
-    async def process(self, ctx: ChangedRoomMessageCtx) -> None:
-        """Process Meeseeks command on user request. """
-
-        await super().process(ctx)
+    async def process_command(
+            self, ctx: ChangedRoomMessageCtx, command_method: CommandMethod,
+    ) -> None:
+        """Runs Meeseeks command on user request. The command method is set by
+        the command decorator.
+        """
 
         self._ctx = ctx
-        await self._process_command()
+        await command_method()
 
     @cmd(name='help', description='Get commands list for this application',)
     async def cmd_help(self) -> None:
@@ -151,5 +164,6 @@ class DialogsBase(Communication, ABC):
         self._ctx = ctx
         if (self._ctx.user.id != self._user_id and self._ctx.fresh_msg_date and
                 self._ctx.room.type == ContextRoom.DIALOG_ROOM_TYPE):
+            text: str = self._get_envelope().text
             for dialog_method in self._dialogs_methods:
-                await dialog_method(self._get_response_msg().lower())
+                await dialog_method(text)
@@ -1,10 +1,20 @@
 """Module contains Meeseeks commands decorators. """
 
 import asyncio
+import cProfile
+import os
+import tempfile
+import time
+from contextvars import Token
 from functools import wraps
-from typing import Callable, TypeVar, TYPE_CHECKING
+from types import MethodType
+from typing import Any, Callable, TypeVar, TYPE_CHECKING, cast
 
+from meeseeks import settings
 from meeseeks.exceptions import CommandParamNotSpecified, PermissionMissing
+from meeseeks.logger import LOGGER
+from meeseeks.metrics import REGISTRY
+from meeseeks.request import COMMAND_METHOD
 from meeseeks.type import CommandMethod
 
 if TYPE_CHECKING:
@@ -12,10 +22,23 @@ if TYPE_CHECKING:
 
 _T = TypeVar('_T', bound='CommandsBase')
 
+_COMMANDS_DURATION = REGISTRY.histogram(
+    'meeseeks_command_duration_seconds',
+    'Duration of commands by phase: permission checks, command body and total.',
+    ('app', 'command', 'phase', ),
+)
+
+# Only one profiler can be active at a time in the process
+_profiler: cProfile.Profile | None = None
+
 
 class CommandDecorator:
     """A base class that can either be used as a command method decorator to configure it. """
 
+    def __init__(self) -> None:
+        # Invocations are counted per decorated command
+        self._invocations: int = 0
+
     async def configure(
             self, func_self: _T, *args: tuple, **kwargs: dict
     ) -> None:
@@ -26,19 +49,107 @@ class CommandDecorator:
     def configure_meta(self, decorated_func: Callable) -> None:
         """Pass meta data to decorated function. """
 
-    def _decorate_callable(self, func: Callable) -> Callable:
-        """Wraps decorating function. """
+    def _start_profiler(self, command_name: str) -> cProfile.Profile | None:
+        """Starts profiler for 1 in PROFILE_COMMAND_RATE invocations of the command specified
+        by PROFILE_COMMAND. Only one invocation is profiled at a time, the invocations which
+        start while it runs are neither profiled nor counted. The profiler captures all
+        the code run by the event loop, including other coroutines and other invocations of
+        the command running concurrently with it, so the profile is named after the task of
+        the profiled invocation.
+        """
 
-        if asyncio.iscoroutinefunction(func):
-            @wraps(func)
-            async def inner(func_self: _T, *args: tuple, **kwargs: dict) -> None:
-                await self.configure(func_self, *args, **kwargs)
-                await func(func_self, *args, **kwargs)
+        global _profiler  # pylint: disable=global-statement
+
+        if command_name != settings.PROFILE_COMMAND or _profiler is not None:
+            return None
+
+        self._invocations += 1
+        if self._invocations % max(settings.PROFILE_COMMAND_RATE, 1):
+            return None
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+        return _profiler
+
+    @staticmethod
+    def _stop_profiler(profiler: cProfile.Profile, command_name: str) -> None:
+        """Stops profiler and dumps the collected statistics to PROFILE_DIR. """
+
+        global _profiler  # pylint: disable=global-statement
+
+        profiler.disable()
+        _profiler = None
+
+        task: asyncio.Task | None = asyncio.current_task()
+        task_name: str = task.get_name().replace(' ', '_') if task is not None else 'no_task'
+        profile_dir: str = settings.PROFILE_DIR or tempfile.gettempdir()
+        path: str = os.path.join(
+            profile_dir, f'{command_name.replace(" ", "_")}-{task_name}-{time.time_ns()}.prof',
+        )
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError as exc:
+            LOGGER.error('Failed to dump profile of "%s" command: %s', command_name, exc)
         else:
-            @wraps(func)
-            async def inner(func_self: _T, *args: tuple, **kwargs: dict) -> None:
+            LOGGER.info('Profile of "%s" command is dumped to %s', command_name, path)
+
+    @staticmethod
+    def _observe(func_self: _T, command_name: str, timings: tuple[float, float, float]) -> None:
+        """Counts duration of the command and logs it if the command is slow. """
+
+        started_at, configured_at, finished_at = timings
+        total: float = finished_at - started_at
+        _COMMANDS_DURATION.labels(func_self.app_name, command_name, 'configure').observe(
+            configured_at - started_at,
+        )
+        _COMMANDS_DURATION.labels(func_self.app_name, command_name, 'body').observe(
+            finished_at - configured_at,
+        )
+        _COMMANDS_DURATION.labels(func_self.app_name, command_name, 'total').observe(total)
+
+        if total >= settings.SLOW_COMMAND_THRESHOLD:
+            LOGGER.warning(
+                'Slow command "%s" of %s: %.3f seconds (permission checks %.3f seconds), '
+                'arguments: %s', command_name, func_self.app_name, total,
+                configured_at - started_at, func_self.get_command_arguments(),
+            )
+
+    def _decorate_callable(self, func: Callable) -> Callable:
+        """Wraps decorating function. The wrapper makes the command the running command method
+        of the current request and measures time spent in permission checks and in the command
+        body.
+        """
+
+        is_coroutine: bool = asyncio.iscoroutinefunction(func)
+
+        @wraps(func)
+        async def inner(func_self: _T, *args: tuple, **kwargs: dict) -> None:
+            command_name: str = getattr(inner, 'command_name', func.__name__)
+            token: Token[CommandMethod | None] = COMMAND_METHOD.bind(
+                func_self,
+                cast(CommandMethod, MethodType(inner, func_self)),
+            )
+            try:
+                started_at: float = time.perf_counter()
                 await self.configure(func_self, *args, **kwargs)
-                func(func_self, *args, **kwargs)
+                configured_at: float = time.perf_counter()
+                profiler: cProfile.Profile | None = self._start_profiler(command_name)
+                try:
+                    result: Any = func(func_self, *args, **kwargs)
+                    if is_coroutine:
+                        await result
+                finally:
+                    finished_at: float = time.perf_counter()
+                    if profiler is not None:
+                        self._stop_profiler(profiler, command_name)
+
+                    self._observe(
+                        func_self, command_name, (started_at, configured_at, finished_at, ),
+                    )
+            finally:
+                COMMAND_METHOD.reset(func_self, token)
 
         self.configure_meta(inner)
 
@@ -35,7 +35,7 @@ class CommandsMixin(CommandsBase, ABC):
     async def cmd_users_info(self) -> None:
         """Receives users from Rocket.Chat and sends response to Rocket.Chat. """
 
-        users: dict[str, dict] = await self._restapi.get_users()
+        users: dict[str, dict] = await self._user_directory.get_users()
         title: str = 'Hi, here is the information about the users :point_down:\n'
         response: str = ''
 
@@ -1,17 +1,57 @@
 """Module contains context classes. """
 
-from datetime import datetime, timedelta
-from typing import Any, Type
+from typing import Any, Callable, Generic, TypeVar
 
+from meeseeks.envelope import Envelope
 from meeseeks.exceptions import SerializerError
 from meeseeks.logger import LOGGER
 from meeseeks.serializers import ctx_factory
 from meeseeks.type import ContextRoomOptions
 
+_V = TypeVar('_V')
+
+
+def get_message_version(message: dict[str, Any]) -> int:
+    """Return time (in milliseconds) the message was edited or sent if it was not edited. """
+
+    version: int = message.get('editedAt', message['ts'])['$date']
+    return version
+
+
+class _Lazy(Generic[_V]):
+    """Attribute of context which is computed by the given function on the first access
+    and kept in the slot with the same name prefixed by underscore. The attribute may be set
+    explicitly, in that case it is not computed at all.
+    """
+
+    def __init__(self, compute: Callable[[Any], _V]):
+        self._compute: Callable[[Any], _V] = compute
+        self._slot: str = ''
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = f'_{name}'
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> _V:
+        if obj is None:
+            return self  # type: ignore[return-value]
+
+        try:
+            value: _V = getattr(obj, self._slot)
+        except AttributeError:
+            value = self._compute(obj)
+            setattr(obj, self._slot, value)
+
+        return value
+
+    def __set__(self, obj: Any, value: _V) -> None:
+        setattr(obj, self._slot, value)
+
 
 class Context:
     """Contains default context attrs. """
 
+    __slots__ = ('_raw_context', 'method', )
+
     def __init__(self, raw_context: tuple):
         self._raw_context = raw_context
         self.method: str = ''
@@ -25,7 +65,9 @@ class Context:
 class ContextUser:
     """Contains user context. """
 
-    def __init__(self, _id: str, username: str, name: str):
+    __slots__ = ('id', 'username', 'name', )
+
+    def __init__(self, _id: str = '', username: str = '', name: str = ''):
         self.id: str = _id
         self.username: str = username
         self.name: str = name
@@ -34,69 +76,92 @@ class ContextUser:
 class ContextRoom:
     """Contains room context. """
 
+    __slots__ = ('id', 'type', 'participant', 'name', )
+
     CHANNEL_ROOM_TYPE = 'c'
     DIALOG_ROOM_TYPE = 'd'
     PRIVATE_ROOM_TYPE = 'p'
 
-    def __init__(self, room_id: str, options: ContextRoomOptions):
-        self.id = room_id
-        self.type = options.get('roomType')
-        self.participant = options.get('roomParticipant')
-        self.name = options.get('roomName')
+    def __init__(
+            self, room_id: str = '', options: ContextRoomOptions | dict[str, Any] | None = None,
+    ):
+        options = options or {}
+        self.id: str = room_id
+        self.type: str | None = options.get('roomType')
+        self.participant: bool | None = options.get('roomParticipant')
+        self.name: str | None = options.get('roomName')
+
+
+def _get_user(ctx: 'ChangedRoomMessageCtx') -> ContextUser:
+    """Return author of the message. """
+
+    user: dict[str, str] = ctx.message.get('u', {})
+    return ContextUser(user.get('_id', ''), user.get('username', ''), user.get('name', ''))
+
+
+def _get_room(ctx: 'ChangedRoomMessageCtx') -> ContextRoom:
+    """Return room the message was sent to. """
+
+    return ContextRoom(ctx.message.get('rid', ''), ctx.room_options)
+
+
+def _check_link_previews(ctx: 'ChangedRoomMessageCtx') -> bool:
+    """Check if the message is an update adding link previews. """
+
+    urls: list[dict[str, Any]] = ctx.message.get('urls') or []
+    return bool(urls) and 'meta' in urls[0]
 
 
 class ChangedRoomMessageCtx(Context):
-    """Contains room message context. """
+    """Contains room message context. The author, the room and the check of link previews
+    are computed from the raw message on the first access. Freshness of the message is set
+    by the core, because it depends on the time the bot subscribed to the messages, as well as
+    the envelope of the message, because it depends on the commands of the installed apps.
+    """
+
+    __slots__ = (
+        'message', 'room_options', 'msg', 'fresh_msg_date', 'envelope', '_user', '_room',
+        '_link_previews',
+    )
+
+    user: _Lazy[ContextUser] = _Lazy(_get_user)
+    room: _Lazy[ContextRoom] = _Lazy(_get_room)
+    link_previews: _Lazy[bool] = _Lazy(_check_link_previews)
 
     def __init__(self, *args: dict):
         super().__init__(args)
 
-        self._args: dict = {}
-
-        self.user: Type[ContextUser] | ContextUser = ContextUser
-        self.fresh_msg_date: bool = False
-        self.link_previews: bool = False
-        self.room: Type[ContextRoom] | ContextRoom = ContextRoom
+        self.message: dict[str, Any] = {}
+        self.room_options: dict[str, Any] = {}
         self.msg: str = ''
+        self.fresh_msg_date: bool = False
+        self.envelope: Envelope | None = None
 
     def serialize(self) -> None:
         """Method serialize context. """
 
         try:
-            self._args = self._raw_context[0]['fields']['args']
-
-            self.method: str = self._raw_context[0]['msg']
-            self.msg = self._args[0]['msg']
-            self.user = ContextUser(**self._args[0]['u'])
-            self.fresh_msg_date = self._check_msg_date()
-            self.link_previews = self._check_link_previews()
-            self.room = ContextRoom(self._args[0]['rid'], self._args[1])
-        except (KeyError, TypeError, ValueError, ) as exc:
+            args: list[Any] = self._raw_context[0]['fields']['args']
+
+            self.method = self._raw_context[0]['msg']
+            self.message = args[0]
+            self.room_options = args[1]
+            self.msg = self.message['msg']
+            # The fields are parsed lazily, but the message must contain all of them
+            if (not isinstance(self.message['u']['_id'], str) or
+                    not isinstance(self.message['rid'], str) or
+                    not isinstance(self.message['ts']['$date'], int)):
+                raise ValueError('malformed message')
+        except (IndexError, KeyError, TypeError, ValueError, ) as exc:
             LOGGER.error('Failed to serialize %s: %s', self.__class__.__name__, exc)
             raise SerializerError from exc
 
-    def _check_msg_date(self) -> bool:
-        """Return data of context message. """
-
-        ts: int = self._args[0]['ts']['$date']
-        updated_at: str = (
-                datetime.utcfromtimestamp(ts / 1000) + timedelta(seconds=1)
-        ).strftime('%Y-%m-%d %H:%M:%S')
-        now: str = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-
-        return updated_at >= now
-
-    def _check_link_previews(self) -> bool:
-        if 'urls' in self._args[0]:
-            if self._args[0]['urls'] and 'meta' in self._args[0]['urls'][0]:
-                return True
-
-        return False
-
 
 class LoginCtx(Context):
     """Contains login context. """
 
+    __slots__ = ('_args', 'user_id', 'token', )
+
     def __init__(self, *args: dict):
         super().__init__(args)
 
@@ -117,5 +182,34 @@ class LoginCtx(Context):
             raise SerializerError from exc
 
 
+class UserChangedCtx(Context):
+    """Contains context of realtime event about changes of a certain user. """
+
+    __slots__ = ('event', 'payload', 'user_id', )
+
+    def __init__(self, *args: dict):
+        super().__init__(args)
+
+        self.event: str = ''
+        self.payload: dict[str, Any] = {}
+        self.user_id: str = ''
+
+    def serialize(self) -> None:
+        """Method serialize context. """
+
+        try:
+            self.event = self._raw_context[0]['fields']['eventName']
+            self.payload = self._raw_context[0]['fields']['args'][0]
+            if 'u' in self.payload:
+                self.user_id = self.payload['u']['_id']
+            elif 'userId' in self.payload:
+                self.user_id = self.payload['userId']
+            else:
+                self.user_id = self.payload['_id']
+        except (IndexError, KeyError, TypeError, ValueError, ) as exc:
+            raise SerializerError from exc
+
+
 ctx_factory.register('changed', 'stream-room-messages', ChangedRoomMessageCtx)
+ctx_factory.register('changed', 'stream-notify-logged', UserChangedCtx)
 ctx_factory.register('result', 'login', LoginCtx)
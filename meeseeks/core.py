@@ -1,35 +1,80 @@
 """Module contains basic functionality used by all applications. """
 
 import asyncio
-import json
-from types import ModuleType
-from typing import Generic, Type, TypeVar
+import importlib
+import time
+from typing import Any, Callable, Generic, Mapping, Type, TypeVar
 from urllib.parse import ParseResult, urljoin, urlparse
 
-import websockets
-from aiohttp import ClientResponseError
+from aiohttp import ClientSession
+from aiohttp.web import AppRunner
 from websockets import WebSocketClientProtocol  # pylint: disable=no-name-in-module
-from websockets.exceptions import ConnectionClosedOK
 
-from meeseeks import settings
-from meeseeks.context import Context, ChangedRoomMessageCtx, LoginCtx
+from meeseeks import codec, settings
+from meeseeks.backoff import Backoff
+from meeseeks.cache import SingleFlight, TTLCache
+from meeseeks.context import (
+    ChangedRoomMessageCtx,
+    Context,
+    ContextRoom,
+    LoginCtx,
+    UserChangedCtx,
+)
+from meeseeks.directory import UserDirectory
+from meeseeks.dispatcher import Dispatcher
+from meeseeks.envelope import Envelope, parse_envelope
 from meeseeks.exceptions import (
     AbortCommandExecution,
     BadConfigure,
-    CommandDoesNotExist,
     LogInFailed,
     SerializerError,
 )
+from meeseeks.filters import DROP_OVERLOAD, FrameFilter
+from meeseeks.keepalive import Keepalive
+from meeseeks.leader import LeaderElector, create_elector
 from meeseeks.logger import LOGGER
-from meeseeks.restapi import RestAPI
+from meeseeks.metrics import REGISTRY, start_metrics_server
+from meeseeks.outbox import PRIORITY_BULK, PRIORITY_INTERACTIVE, Outbox
+from meeseeks.recorder import FrameRecorder
+from meeseeks.restapi import RestAPI, create_client_session
+from meeseeks.router import CommandHandler, CommandRouter
 from meeseeks.rtapi import RealTimeAPI
+from meeseeks.scheduler import JobStore, Scheduler
 from meeseeks.serializers import ContextSerializer
+from meeseeks.supervisor import Connect, ConnectionSupervisor
+from meeseeks.type import CommandMethod, UserInfo
 
 _ACCESS_DENIED_MSG = 'Access denied, not enough permissions'
+_APP_IS_NOT_STARTED = '{} is not available, it failed to start'
+_APP_IS_STARTING = '{} is starting, try again shortly'
+_APPS_ARE_STARTING = 'Apps are starting, try again shortly'
 _COMMAND_DOES_NOT_EXIST = 'Requested command does not exist'
 
 _T = TypeVar('_T', bound='MeeseeksCore')
 
+_APPS_SETUP_DURATION = REGISTRY.gauge(
+    'meeseeks_app_setup_seconds',
+    'Time it took to set the apps up when the bot started.',
+    ('app', ),
+)
+
+_COMMANDS = REGISTRY.counter(
+    'meeseeks_commands_total',
+    'Number of commands dispatched to the apps.',
+    ('app', 'command', ),
+)
+
+_FRAMES_RECEIVED = REGISTRY.counter(
+    'meeseeks_frames_received_total',
+    'Number of frames received from Rocket.Chat by message type.',
+    ('msg', ),
+)
+
+_UNKNOWN_COMMANDS = REGISTRY.counter(
+    'meeseeks_unknown_commands_total',
+    'Number of requested commands which do not exist.',
+)
+
 
 class MeeseeksCore(Generic[_T]):
     """Provide basic functionality for building applications. """
@@ -38,23 +83,36 @@ class MeeseeksCore(Generic[_T]):
 
     _url: ParseResult = urlparse(settings.ROCKET_CHAT_API)
     _headers: dict[str, str] = {}
+    _dispatcher: Dispatcher
+    _failed_apps: set
+    _frame_filter: FrameFilter
+    _http_session: ClientSession | None = None
+    _keepalive: Keepalive
+    _leader: LeaderElector = LeaderElector()
+    _outbox: Outbox
+    _overloaded: bool = False
+    _recorder: FrameRecorder | None = None
     _restapi: RestAPI
+    _router: CommandRouter
     _rtapi: RealTimeAPI
+    _scheduler: Scheduler
+    _starting_apps: set
+    _supervisor: ConnectionSupervisor
     _token: str = ''
+    _users_cache: TTLCache[str, UserInfo]
+    _user_directory: UserDirectory
     _user_id: str = ''
     _apps: list = []
 
     def __init__(self) -> None:
-        self._ctx: Context | None = None
-        self._request: str = ''
         self._websocket: WebSocketClientProtocol = WebSocketClientProtocol
         self._websocket_protocol: str = 'wss' if self._url.scheme == 'https' else 'ws'
 
     async def check_bot_permissions(self) -> None:
         """Check if Meeseeks has valid permission on Rocket.Chat. """
 
-        server_users: dict[str, dict] = await self._restapi.get_users()
-        if 'roles' not in server_users[self._user_id]:
+        bot_user: dict[str, Any] | None = await self._user_directory.get_user(self._user_id)
+        if not bot_user or 'roles' not in bot_user:
             raise BadConfigure('Give Meeseeks permission "View Full Other User Info"'
                                'on Rocket.Chat')
 
@@ -71,83 +129,294 @@ class MeeseeksCore(Generic[_T]):
 
         await self.check_bot_permissions()
 
+    async def _complete_login(self, ctx: LoginCtx) -> None:
+        """Prepares the bot to work after successful login. After reconnection only
+        the subscriptions are restored.
+        """
+
+        self._user_id = ctx.user_id
+        self._token = ctx.token
+        self._headers.update({
+            'X-Auth-Token': self._token,
+            'X-User-Id': self._user_id,
+            'Content-type': 'application/json'
+        })
+
+        await self._restapi.set_online_status()
+
+        LOGGER.info('%s: Login complete', self.__class__.__name__)
+        if self._rtapi.subscriptions:
+            await self._rtapi.resubscribe()
+        else:
+            await self.bot_configure()
+            await self._rtapi.stream_all_messages()
+            await self._rtapi.stream_notify_logged(settings.RC_USER_CHANGED_EVENTS)
+
     async def login(self) -> bool:
-        """Trying to log in Meeseeks to Rocket.Chat server. """
+        """Trying to log in Meeseeks to Rocket.Chat server. The resume token received
+        on the previous login is used instead of password if there is one.
+        """
 
         await self._rtapi.connect()
 
+        backoff: Backoff = Backoff(settings.RECONNECT_BACKOFF_BASE, settings.RECONNECT_BACKOFF_MAX)
         for i in range(0, settings.CONNECT_ATTEMPTS):
-            await self._rtapi.login()
+            await self._rtapi.login(self._token or None)
             try:
                 for _ in range(0, 4):
-                    raw_context: WebSocketClientProtocol = json.loads(await self._websocket.recv())
+                    raw_context: dict[str, Any] = codec.loads(await self._recv())
 
                     try:
                         serializer: ContextSerializer = ContextSerializer(
                             raw_context, raw_context['msg'], raw_context['id'],
                         )
-                        self._ctx = serializer.serialize()
+                        ctx: Context = serializer.serialize()
                     except (KeyError, ValueError, ):
                         continue
 
-                    if isinstance(self._ctx, LoginCtx):
-                        self._user_id = self._ctx.user_id
-                        self._token = self._ctx.token
-                        self._headers.update({
-                            'X-Auth-Token': self._token,
-                            'X-User-Id': self._user_id,
-                            'Content-type': 'application/json'
-                        })
-
-                        await self._restapi.set_online_status()
-
-                        LOGGER.info('%s: Login complete', self.__class__.__name__)
-                        await self.bot_configure()
-                        await self._rtapi.stream_all_messages()
+                    if isinstance(ctx, LoginCtx):
+                        await self._complete_login(ctx)
                         return True
             except SerializerError:
+                # The resume token may be expired, so the next attempt uses password
+                self._token = ''
                 LOGGER.error('%s: '
                              'Unsuccessful connection attempt. Retrying...    '
                              'Step: %s/%s', self.__class__.__name__, i+1, settings.CONNECT_ATTEMPTS)
-                await asyncio.sleep(3)
+                await asyncio.sleep(backoff.next_delay())
 
         raise LogInFailed(f'{self.__class__.__name__}: Cannot log in to Rocket.Chat server')
 
+    async def _write_msg(
+            self, text: str, rid: str, priority: int = PRIORITY_BULK, transport: str | None = None,
+    ) -> dict[str, Any]:
+        """Sends message to chat over the given transport ('rest' or 'ddp') or the one
+        specified by MESSAGE_TRANSPORT.
+        """
+
+        if (transport or settings.MESSAGE_TRANSPORT) != 'ddp':
+            return await self._restapi.write_msg(text, rid, priority)
+
+        async def send_message() -> tuple[dict[str, Any], Mapping[str, str]]:
+            return await self._rtapi.send_message(text, rid), {}
+
+        return await self._outbox.send(send_message, priority)
+
+    async def _add_reaction(
+            self, msg_id: str, emoji: str, should_react: bool, transport: str | None = None,
+    ) -> dict[str, Any]:
+        """Add or remove reaction on message over the given transport ('rest' or 'ddp')
+        or the one specified by MESSAGE_TRANSPORT.
+        """
+
+        if (transport or settings.MESSAGE_TRANSPORT) != 'ddp':
+            return await self._restapi.add_reaction(msg_id, emoji, should_react)
+
+        async def set_reaction() -> tuple[dict[str, Any], Mapping[str, str]]:
+            return await self._rtapi.set_reaction(msg_id, emoji, should_react), {}
+
+        return await self._outbox.send(set_reaction, PRIORITY_INTERACTIVE)
+
+    def get_command_methods(self) -> list[CommandMethod]:
+        """Return methods that are Meeseeks commands. """
+
+        return []
+
     async def process(self, ctx: ChangedRoomMessageCtx) -> None:
         """Method for its further redefinition to implement the Meeseeks app functionality. """
 
+    async def process_command(
+            self, ctx: ChangedRoomMessageCtx, command_method: CommandMethod,
+    ) -> None:
+        """Method for its further redefinition to run the Meeseeks command of the app. """
+
+    async def teardown(self) -> None:
+        """Method for its further redefinition to release resources of the app when
+        the bot stops.
+        """
+
     @staticmethod
     def _apps_receive(name: str) -> Type[_T] | None:
-        """Receive application class. """
+        """Receive application class by the dotted path to it. Only the module of the app
+        is imported.
+        """
 
-        components: list[str] = name.split('.')
-        module: ModuleType = __import__(components[0])
-        app_class: Type[_T] | None = None
-
-        for comp in components[1:]:
-            app_class = getattr(module, comp)
+        module_name, _, class_name = name.rpartition('.')
+        if not module_name:
+            return None
 
+        app_class: Type[_T] = getattr(importlib.import_module(module_name), class_name)
         return app_class
 
     def _init_apps(self) -> list[_T]:
-        """Return list of apps classes. """
+        """Return list of apps classes. The apps specified by WORKER_APPS are run in
+        worker processes.
+        """
 
         app_instances: list = []
+        worker_apps: dict[str, int | None] = {}
+        if settings.WORKER_APPS:
+            # The workers module depends on the core, so it is imported only when needed
+            workers: Any = importlib.import_module('meeseeks.workers')
+            worker_apps = workers.parse_worker_apps(settings.WORKER_APPS)
+
         for app in settings.INSTALLED_APPS:
+            if app in worker_apps:
+                app_instances.append(workers.RemoteApp(app, worker_apps[app], **self.__dict__))
+                continue
+
             app_class = self._apps_receive(app)
             if app_class:
                 app_instances.append(app_class(**self.__dict__))
 
         return app_instances
 
+    def _add_commands(self, app: _T) -> None:
+        """Registers the commands of the app which are not registered yet. """
+
+        for command_method in app.get_command_methods():
+            if (app, command_method, ) not in self._router.get(command_method.command_name):
+                self._router.add(app, command_method)
+
+    def _add_app(self, app: _T) -> None:
+        """Starts passing the messages and the commands to the app. """
+
+        self._apps.append(app)
+        self._add_commands(app)
+
+    async def _setup_app(self, app: _T) -> float:
+        """Sets the app up and starts passing the messages and the commands to it.
+        Return time (in seconds) the setup took.
+        """
+
+        started_at: float = time.monotonic()
+        await asyncio.wait_for(app.setup(), settings.APP_SETUP_TIMEOUT)
+        self._add_app(app)
+
+        duration: float = time.monotonic() - started_at
+        _APPS_SETUP_DURATION.labels(app.app_name).set(duration)
+        return duration
+
+    async def _setup_apps(self, apps: list[_T]) -> list[BaseException]:
+        """Sets the apps up at the same time and reports how long it took. Return errors
+        of the apps which are not set up.
+        """
+
+        started_at: float = time.monotonic()
+        results: list[float | BaseException] = await asyncio.gather(
+            *(self._setup_app(app) for app in apps), return_exceptions=True,
+        )
+
+        errors: list[BaseException] = []
+        for app, result in zip(apps, results):
+            self._starting_apps.discard(app)
+            if isinstance(result, BaseException):
+                self._failed_apps.add(app)
+
+            if isinstance(result, asyncio.TimeoutError):
+                LOGGER.error('%s: %s is not set up in %s seconds', self.__class__.__name__,
+                             app.app_name, settings.APP_SETUP_TIMEOUT)
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                LOGGER.error('%s: Failed to set up %s', self.__class__.__name__, app.app_name,
+                             exc_info=result)
+                errors.append(result)
+            else:
+                LOGGER.info('%s: Set up %s in %.3f seconds', self.__class__.__name__,
+                            app.app_name, result)
+
+        LOGGER.info('%s: Set up %d of %d apps in %.3f seconds', self.__class__.__name__,
+                    len(apps) - len(errors), len(apps), time.monotonic() - started_at)
+        return errors
+
+    async def _setup_core_apps(self) -> tuple[list[_T], list[_T]]:
+        """Creates the apps and sets the ones specified by CORE_APPS up, so the bot can
+        start answering. Return all the apps and the other apps, which are set up in
+        the background. The commands of the other apps are registered up front and
+        answered that the app is starting until it is set up.
+        """
+
+        apps: list[_T] = self._init_apps()
+        for app in apps:
+            self.check_app_name(app)
+
+        core_apps: set[str] = {name.strip() for name in settings.CORE_APPS.split(',')}
+        other_apps: list[_T] = [app for app in apps if app.app_name not in core_apps]
+        self._apps: list[_T] = []
+        self._router = CommandRouter()
+        self._failed_apps = set()
+        self._starting_apps = set(other_apps)
+        for app in other_apps:
+            self._add_commands(app)
+
+        errors: list[BaseException] = await self._setup_apps(
+            [app for app in apps if app.app_name in core_apps],
+        )
+        if errors:
+            raise errors[0]
+
+        return apps, other_apps
+
+    @staticmethod
+    def _get_frame_key(raw_context: dict[str, Any]) -> str:
+        """Return key of the room the frame is related to. Frames with the same key
+        are processed in the order they were received.
+        """
+
+        try:
+            room_id: str = raw_context['fields']['args'][0]['rid']
+        except (IndexError, KeyError, TypeError, ):
+            return ''
+
+        return room_id
+
+    async def _recv(self) -> str:
+        """Receives the next frame and records it if recording is enabled. """
+
+        frame: str = await self._websocket.recv()
+        if self._recorder is not None:
+            self._recorder.record(frame)
+
+        return frame
+
+    async def join(self) -> None:
+        """Waits until all received frames are processed. """
+
+        await self._dispatcher.join()
+
     async def loop(self) -> None:
-        """Method is intended for calling in endless loop to process Rocket.Chat callbacks. """
+        """Method is intended for calling in endless loop to read Rocket.Chat callbacks and pass
+        them to the dispatcher. Pings, pongs and results of DDP calls are handled at once.
+        The reader never waits for the dispatcher, otherwise they would not be read while
+        the dispatcher is busy, so callbacks which do not fit in the work queue are dropped.
+        """
+
+        raw_context: dict[str, Any] = codec.loads(await self._recv())
+        _FRAMES_RECEIVED.labels(str(raw_context.get('msg', ''))).inc()
+        if await self._keepalive.process(raw_context):
+            return None
+
+        if self._rtapi.resolve(raw_context):
+            return None
 
-        raw_context: WebSocketClientProtocol = json.loads(await self._websocket.recv())
-        if raw_context.get('msg') == 'ping':
-            await self._rtapi.pong()
+        if not self._frame_filter.accept(raw_context):
             return None
 
+        if await self._dispatcher.try_submit(self._get_frame_key(raw_context), raw_context):
+            self._overloaded = False
+            return None
+
+        if not self._overloaded:
+            LOGGER.warning('%s: Work queue is full, dropping callbacks',
+                           self.__class__.__name__)
+            self._overloaded = True
+
+        self._frame_filter.drop(DROP_OVERLOAD)
+        return None
+
+    async def _process_frame(self, raw_context: dict[str, Any]) -> None:
+        """Serializes Rocket.Chat callback and passes it to the apps. """
+
         try:
             serializer: ContextSerializer = ContextSerializer(
                 raw_context, raw_context['msg'], raw_context['collection'],
@@ -156,53 +425,258 @@ class MeeseeksCore(Generic[_T]):
             return None
 
         try:
-            self._ctx = serializer.serialize()
+            ctx: Context = serializer.serialize()
         except SerializerError:
             return None
 
-        if isinstance(self._ctx, ChangedRoomMessageCtx):
-            exc_counter = 0
+        if isinstance(ctx, ChangedRoomMessageCtx):
+            ctx.fresh_msg_date = self._frame_filter.is_fresh(ctx.message)
+            envelope: Envelope = parse_envelope(
+                ctx.msg,
+                f'@{settings.USER_NAME}',
+                ctx.room.type == ContextRoom.DIALOG_ROOM_TYPE,
+                self._router,
+            )
+            ctx.envelope = envelope
             for app in self._apps:
-                try:
-                    await app.process(self._ctx)
-                except AbortCommandExecution:
-                    await self._restapi.write_msg(_ACCESS_DENIED_MSG, self._ctx.room.id)
-                    break
-                except CommandDoesNotExist:
-                    exc_counter += 1
-
-            if exc_counter == len(self._apps):
-                await self._restapi.write_msg(_COMMAND_DOES_NOT_EXIST, self._ctx.room.id)
+                await app.process(ctx)
+
+            if self._is_command(ctx, envelope):
+                await self._process_command(ctx, envelope)
+        elif isinstance(ctx, UserChangedCtx):
+            self._users_cache.invalidate(ctx.user_id)
+            self._user_directory.apply_event(ctx)
+
+    def _is_command(self, ctx: ChangedRoomMessageCtx, envelope: Envelope) -> bool:
+        """Check if the message is a Meeseeks command. """
+
+        return (ctx.user.id != self._user_id and ctx.link_previews is False and
+                ctx.fresh_msg_date and envelope.mentioned)
+
+    async def _process_command(self, ctx: ChangedRoomMessageCtx, envelope: Envelope) -> None:
+        """Runs the requested command in the apps it belongs to. """
+
+        command_handlers = self._router.get(envelope.command)
+        if not command_handlers:
+            # The commands of the apps in the workers are known only after their start
+            if self._starting_apps:
+                await self._write_msg(_APPS_ARE_STARTING, ctx.room.id, PRIORITY_INTERACTIVE)
+                return
+
+            _UNKNOWN_COMMANDS.labels().inc()
+            await self._write_msg(_COMMAND_DOES_NOT_EXIST, ctx.room.id, PRIORITY_INTERACTIVE)
+            return
+
+        # The command is answered by the apps which are set up, for example, "help"
+        available_handlers: list[CommandHandler] = [
+            (app, command_method, ) for app, command_method in command_handlers
+            if app not in self._starting_apps and app not in self._failed_apps
+        ]
+        if not available_handlers:
+            unavailable_app: MeeseeksCore = command_handlers[0][0]
+            text: str = (_APP_IS_STARTING if unavailable_app in self._starting_apps
+                         else _APP_IS_NOT_STARTED)
+            await self._write_msg(text.format(unavailable_app.app_name), ctx.room.id,
+                                  PRIORITY_INTERACTIVE)
+            return
+
+        for app, command_method in available_handlers:
+            _COMMANDS.labels(app.app_name, command_method.command_name).inc()
+            try:
+                await app.process_command(ctx, command_method)
+            except AbortCommandExecution:
+                await self._write_msg(_ACCESS_DENIED_MSG, ctx.room.id, PRIORITY_INTERACTIVE)
+                break
 
     async def setup(self) -> None:
         """Add functional in app after login. """
 
         raise NotImplementedError(f'Implement method setup in {self.__class__.__name__}.')
 
-    async def run(self) -> None:
-        """Entry point for run Meeseeks app. """
+    def _register_metrics(self, single_flight: SingleFlight) -> None:
+        """Exports the state of the core components as metrics. The values are computed
+        only when the metrics are collected.
+        """
+
+        gauges: dict[str, tuple[str, Callable[[], float]]] = {
+            'meeseeks_dispatch_queue_depth': (
+                'Number of frames waiting for processing.', lambda: self._dispatcher.depth,
+            ),
+            'meeseeks_outbox_queue_depth': (
+                'Number of outbound messages waiting for sending.', lambda: self._outbox.depth,
+            ),
+            'meeseeks_users_cache_size': (
+                'Number of users in the cache of users information.',
+                lambda: len(self._users_cache),
+            ),
+        }
+        counters: dict[str, tuple[str, Callable[[], float]]] = {
+            'meeseeks_outbox_messages_sent_total': (
+                'Number of sent outbound messages.', lambda: self._outbox.sent,
+            ),
+            'meeseeks_outbox_messages_retried_total': (
+                'Number of retries of outbound messages.', lambda: self._outbox.retries,
+            ),
+            'meeseeks_outbox_messages_failed_total': (
+                'Number of outbound messages which were not sent.', lambda: self._outbox.failed,
+            ),
+            'meeseeks_reconnects_total': (
+                'Number of reconnections to Rocket.Chat.', lambda: self._supervisor.reconnects,
+            ),
+            'meeseeks_disconnected_seconds_total': (
+                'Time spent disconnected from Rocket.Chat.', lambda: self._supervisor.downtime,
+            ),
+            'meeseeks_keepalive_forced_reconnects_total': (
+                'Number of connections closed because pings were not answered in time.',
+                lambda: self._keepalive.forced_reconnects,
+            ),
+            'meeseeks_rest_requests_collapsed_total': (
+                'Number of GET requests which shared the result of an identical request.',
+                lambda: single_flight.collapsed,
+            ),
+            'meeseeks_rest_requests_sent_total': (
+                'Number of GET requests which were sent, not counting the collapsed ones.',
+                lambda: single_flight.calls,
+            ),
+            'meeseeks_users_cache_hits_total': (
+                'Number of users found in the cache of users information.',
+                lambda: self._users_cache.hits,
+            ),
+            'meeseeks_users_cache_misses_total': (
+                'Number of users which were missing or expired in the cache of users '
+                'information.',
+                lambda: self._users_cache.misses,
+            ),
+        }
+        for name, (documentation, function) in gauges.items():
+            REGISTRY.gauge(name, documentation).labels().set_function(function)
+
+        for name, (documentation, function) in counters.items():
+            REGISTRY.counter(name, documentation).labels().set_function(function)
+
+        REGISTRY.histogram(
+            'meeseeks_outbox_latency_seconds', 'Time from queueing to sending outbound messages.',
+        ).attach(self._outbox.latency)
+        REGISTRY.histogram(
+            'meeseeks_websocket_rtt_seconds', 'Round-trip time of pings over the websocket.',
+        ).attach(self._keepalive.rtt)
+
+    async def _start_metrics_server(self) -> AppRunner | None:
+        """Starts serving the metrics if METRICS_PORT is set. The bot works without
+        the metrics if the port cannot be used.
+        """
+
+        if not settings.METRICS_PORT:
+            return None
+
+        try:
+            return await start_metrics_server(
+                REGISTRY, settings.METRICS_HOST, settings.METRICS_PORT,
+            )
+        except OSError:
+            LOGGER.exception('%s: Failed to serve metrics on %s:%s', self.__class__.__name__,
+                             settings.METRICS_HOST, settings.METRICS_PORT)
+            return None
+
+    async def _on_connect(self, websocket: WebSocketClientProtocol) -> None:
+        """Logs in to Rocket.Chat using the new connection. """
+
+        self._websocket = websocket
+        self._rtapi.attach(websocket)
+        self._keepalive.reset()
+        await self.login()
+
+    async def run(self, connect: Connect | None = None) -> None:
+        """Entry point for run Meeseeks app. The connection to Rocket.Chat is opened by
+        the given coroutine function if there is one, for example, to replay recorded frames.
+        """
 
         websocket_url: str = urljoin(f'{self._websocket_protocol}://{self._url.netloc}',
                                      'websocket')
-        async with websockets.connect(websocket_url) as websocket:
-            self._websocket = websocket
-            self._rtapi = RealTimeAPI(self._request, self._websocket)
-            self._restapi = RestAPI(self._headers)
+        async with create_client_session() as http_session:
+            self._http_session = http_session
+            self._rtapi = RealTimeAPI(self._websocket)
+            self._keepalive = Keepalive(
+                self._rtapi,
+                settings.KEEPALIVE_INTERVAL,
+                settings.KEEPALIVE_TIMEOUT,
+                settings.KEEPALIVE_MAX_RTT,
+            )
+            self._supervisor = ConnectionSupervisor(
+                websocket_url,
+                self._on_connect,
+                settings.RECONNECT_BACKOFF_BASE,
+                settings.RECONNECT_BACKOFF_MAX,
+                connect,
+            )
+            if settings.RECORD_FRAMES:
+                self._recorder = FrameRecorder(settings.RECORD_FRAMES)
+
+            self._users_cache = TTLCache(settings.USERS_CACHE_SIZE, settings.USERS_CACHE_TTL)
+            self._outbox = Outbox(
+                settings.OUTBOX_RATE,
+                settings.OUTBOX_BURST,
+                settings.OUTBOX_MAX_RETRIES,
+                settings.OUTBOX_BACKOFF_BASE,
+                settings.OUTBOX_BACKOFF_MAX,
+            )
+            single_flight: SingleFlight = SingleFlight(settings.REST_RESULT_CACHE_TTL)
+            self._restapi = RestAPI(
+                self._headers,
+                self._http_session,
+                self._users_cache,
+                single_flight,
+                self._outbox,
+            )
+            self._user_directory = UserDirectory(self._restapi)
+            self._leader = create_elector(settings.LEADER_ELECTION)
+            self._scheduler = Scheduler(
+                JobStore(settings.SCHEDULER_STORE),
+                self._leader,
+                settings.SCHEDULER_MAX_CONCURRENCY,
+                settings.SCHEDULER_MISFIRE_GRACE,
+                settings.SCHEDULER_COALESCE,
+            )
 
-            await self.login()
+            started_at: float = time.monotonic()
+            await self._supervisor.connect()
+            connected_in: float = time.monotonic() - started_at
+            self._leader.start(settings.LEADER_CHECK_INTERVAL)
+            self._user_directory.start(settings.USERS_DIRECTORY_REFRESH_INTERVAL)
+            self._outbox.start()
+            self._frame_filter = FrameFilter(
+                self._user_id, settings.FRESH_MESSAGE_GRACE, settings.SEEN_MESSAGES_SIZE,
+            )
 
-            self._apps: list[_T] = self._init_apps()
-            for app in self._apps:
-                self.check_app_name(app)
-                await app.setup()
-
-            while True:
-                try:
-                    await self.loop()
-                except ClientResponseError as exc:
-                    LOGGER.error(exc)
-                except ConnectionClosedOK:
-                    LOGGER.info('ConnectionClosedOk, relogin ...')
-                    self._websocket = await websockets.connect(websocket_url)
-                    self._rtapi = RealTimeAPI(self._request, self._websocket)
-                    await self.login()
+            apps, other_apps = await self._setup_core_apps()
+            self._scheduler.start()
+            self._dispatcher = Dispatcher(
+                self._process_frame, settings.DISPATCH_CONCURRENCY, settings.DISPATCH_QUEUE_SIZE,
+            )
+            self._dispatcher.start()
+            self._keepalive.start()
+            self._register_metrics(single_flight)
+            metrics_server: AppRunner | None = await self._start_metrics_server()
+
+            LOGGER.info('%s: Started answering in %.3f seconds (connected in %.3f seconds)',
+                        self.__class__.__name__, time.monotonic() - started_at, connected_in)
+            setup: asyncio.Task = asyncio.create_task(self._setup_apps(other_apps))
+            try:
+                await self._supervisor.run(self.loop)
+            finally:
+                setup.cancel()
+                await asyncio.gather(setup, return_exceptions=True)
+                if metrics_server is not None:
+                    await metrics_server.cleanup()
+
+                await self._keepalive.stop()
+                await self._dispatcher.stop()
+                await self._scheduler.stop()
+                await asyncio.gather(*(app.teardown() for app in apps))
+
+                await self._leader.stop()
+                await self._user_directory.stop()
+                await self._outbox.stop()
+                await self._supervisor.close()
+                if self._recorder is not None:
+                    self._recorder.close()
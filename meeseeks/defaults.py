@@ -11,6 +11,13 @@ INSTALLED_APPS = (
 
 RC_REALTIME_LOGIN = 'login'
 
+# Realtime events which change information about users
+RC_USER_CHANGED_EVENTS = (
+    'roles-change',
+    'Users:Deleted',
+    'Users:NameChanged',
+)
+
 CHAT_MESSAGE_POST_REQUEST = '/chat.postMessage'
 
 CHAT_REACT_POST_REQUEST = '/chat.react'
@@ -27,7 +34,7 @@ GROUP_INFO_GET_REQUEST = '/groups.info'
 
 ROOMS_GET_REQUEST = '/rooms.get'
 
-USERS_LIST_REQUEST = '/users.list?count=0'
+USERS_LIST_REQUEST = '/users.list'
 
 USERS_INFO_REQUEST = '/users.info'
 
@@ -0,0 +1,168 @@
+"""Module contains in-memory directory of Rocket.Chat users. """
+
+import asyncio
+import time
+from typing import Any
+
+from aiohttp import ClientResponseError
+
+from meeseeks.context import UserChangedCtx
+from meeseeks.logger import LOGGER
+from meeseeks.restapi import RestAPI
+
+# Users updated a bit earlier than the previous refresh started are requested again
+# to tolerate the difference between the clocks of Meeseeks and Rocket.Chat server.
+_UPDATED_SINCE_MARGIN = 60000
+
+
+class UserDirectory:
+    """Keeps all Rocket.Chat users in memory indexed by id and username. The first refresh
+    loads all users page by page, next ones load only users updated since the previous refresh.
+    Realtime events about users are applied as soon as they are received. Until all users are
+    loaded, users requested by id are received one by one.
+    """
+
+    def __init__(self, restapi: RestAPI):
+        self._restapi: RestAPI = restapi
+        self._by_id: dict[str, dict[str, Any]] = {}
+        self._by_username: dict[str, dict[str, Any]] = {}
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._query_updated: bool = True
+        self._refreshed_at: int | None = None
+        self._refresher: asyncio.Task | None = None
+
+    def _put(self, user: dict[str, Any]) -> None:
+        """Add user to the indexes or replace the existing one. """
+
+        previous_user: dict[str, Any] | None = self._by_id.get(user['_id'])
+        if previous_user is not None:
+            self._by_username.pop(previous_user.get('username', ''), None)
+
+        self._by_id[user['_id']] = user
+        if 'username' in user:
+            self._by_username[user['username']] = user
+
+    def _remove(self, user_id: str) -> None:
+        """Remove user from the indexes. """
+
+        user: dict[str, Any] | None = self._by_id.pop(user_id, None)
+        if user is not None:
+            self._by_username.pop(user.get('username', ''), None)
+
+    async def refresh(self) -> None:
+        """Loads all users on the first call and users updated since the previous call
+        on the next ones. If Rocket.Chat rejects the query of updated users, all users are
+        reloaded on each call.
+        """
+
+        async with self._lock:
+            started_at: int = int(time.time() * 1000)
+            updated_since: int | None = None
+            if self._refreshed_at is not None and self._query_updated:
+                updated_since = self._refreshed_at - _UPDATED_SINCE_MARGIN
+
+            try:
+                users: list[dict[str, Any]] = [
+                    user async for user in self._restapi.iter_users(updated_since)
+                ]
+            except ClientResponseError as exc:
+                # Newer versions of Rocket.Chat do not accept the query parameter
+                if updated_since is None or not 400 <= exc.status < 500:
+                    raise
+
+                LOGGER.warning('%s: Query of updated users is rejected (%s), all users are '
+                               'reloaded from now on', self.__class__.__name__, exc.status)
+                self._query_updated = False
+                updated_since = None
+                users = [user async for user in self._restapi.iter_users()]
+
+            if updated_since is None:
+                # The users deleted since the previous load are not kept
+                self._by_id, self._by_username = {}, {}
+
+            for user in users:
+                self._put(user)
+
+            self._refreshed_at = started_at
+
+    async def _ensure_loaded(self) -> None:
+        """Loads all users if they were not loaded yet. """
+
+        if self._refreshed_at is None:
+            await self.refresh()
+
+    async def get_users(self) -> dict[str, dict[str, Any]]:
+        """Return all users by their ids. """
+
+        await self._ensure_loaded()
+        return dict(self._by_id)
+
+    async def get_user(self, user_id: str) -> dict[str, Any] | None:
+        """Return user with the given id. Until all users are loaded, the user is received
+        by users.info, so checking the bot user on login does not wait for the load.
+        """
+
+        if self._refreshed_at is not None:
+            return self._by_id.get(user_id)
+
+        try:
+            return dict(await self._restapi.get_user_info(user_id))
+        except ClientResponseError as exc:
+            if exc.status in (400, 404, ):
+                return None
+
+            raise
+
+    async def get_user_by_username(self, username: str) -> dict[str, Any] | None:
+        """Return user with the given username. """
+
+        await self._ensure_loaded()
+        return self._by_username.get(username)
+
+    def apply_event(self, ctx: UserChangedCtx) -> None:
+        """Apply realtime event about changes of a certain user. """
+
+        user: dict[str, Any] | None = self._by_id.get(ctx.user_id)
+        if ctx.event == 'Users:Deleted':
+            self._remove(ctx.user_id)
+        elif user is None:
+            return
+        elif ctx.event == 'Users:NameChanged':
+            self._put({
+                **user,
+                'name': ctx.payload.get('name', user.get('name')),
+                'username': ctx.payload.get('username', user.get('username')),
+            })
+        elif ctx.event == 'roles-change':
+            roles: list[str] = [role for role in user.get('roles', [])
+                                if role != ctx.payload.get('_id')]
+            if ctx.payload.get('type') == 'added':
+                roles.append(ctx.payload['_id'])
+            self._put({**user, 'roles': roles})
+
+    async def _refresh_forever(self, interval: float) -> None:
+        """Loads the directory and then refreshes it with the given interval (in seconds). """
+
+        while True:
+            try:
+                await self.refresh()
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('%s: Failed to refresh users', self.__class__.__name__)
+
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Starts loading all users in the background and periodic refreshing of
+        the directory.
+        """
+
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_forever(interval))
+
+    async def stop(self) -> None:
+        """Stops periodic refreshing of the directory. """
+
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
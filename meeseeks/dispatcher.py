@@ -0,0 +1,117 @@
+"""Module contains dispatcher of incoming Rocket.Chat frames. """
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from meeseeks.logger import LOGGER
+
+FrameHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class Dispatcher:
+    """Runs handlers of incoming frames in a pool of workers. Frames with the same key
+    (for example, room id) are handled one by one in the order they were submitted,
+    frames with different keys are handled concurrently.
+    """
+
+    def __init__(self, handler: FrameHandler, concurrency: int, queue_size: int):
+        self._handler: FrameHandler = handler
+        self._concurrency: int = max(concurrency, 1)
+        self._capacity: asyncio.Semaphore = asyncio.Semaphore(max(queue_size, 1))
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+        self._deferred: dict[str, deque[dict[str, Any]]] = {}
+        self._workers: list[asyncio.Task] = []
+        self._pending: int = 0
+        self._stopping: bool = False
+        self._idle: asyncio.Event = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def depth(self) -> int:
+        """Return number of frames which are waiting for handling. """
+
+        return self._queue.qsize() + sum(len(frames) for frames in self._deferred.values())
+
+    def start(self) -> None:
+        """Starts pool of workers. """
+
+        if not self._workers:
+            self._stopping = False
+            self._workers = [asyncio.create_task(self._worker())
+                             for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        """Stops pool of workers. Frames which are not handled yet are dropped. """
+
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, key: str, frame: dict[str, Any]) -> None:
+        """Puts frame to the work queue. Waits if the queue is full. """
+
+        await self._capacity.acquire()
+        self._pending += 1
+        self._idle.clear()
+        self._queue.put_nowait((key, frame, ))
+
+    async def try_submit(self, key: str, frame: dict[str, Any]) -> bool:
+        """Puts frame to the work queue if there is a free place, never waiting.
+        Return False if the queue is full.
+        """
+
+        if self._capacity.locked():
+            return False
+
+        await self.submit(key, frame)
+        return True
+
+    async def join(self) -> None:
+        """Waits until all submitted frames are handled. """
+
+        await self._idle.wait()
+
+    async def _handle(self, frame: dict[str, Any]) -> None:
+        """Runs handler and releases the place in the work queue. CancelledError raised by
+        the handler itself (for example, by a cancelled request) does not stop the worker,
+        only stopping the dispatcher does.
+        """
+
+        try:
+            await self._handler(frame)
+        except asyncio.CancelledError:
+            if self._stopping:
+                raise
+
+            LOGGER.error('%s: Handling of frame was cancelled', self.__class__.__name__)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('%s: Failed to handle frame', self.__class__.__name__)
+        finally:
+            self._capacity.release()
+            self._pending -= 1
+            if not self._pending:
+                self._idle.set()
+
+    async def _worker(self) -> None:
+        """Takes frames from the work queue and handles them. If another worker is busy
+        with a frame with the same key, the frame is passed to that worker.
+        """
+
+        while True:
+            key, frame = await self._queue.get()
+            if key in self._deferred:
+                self._deferred[key].append(frame)
+                continue
+
+            deferred: deque[dict[str, Any]] = deque()
+            self._deferred[key] = deferred
+            try:
+                await self._handle(frame)
+                while deferred:
+                    await self._handle(deferred.popleft())
+            finally:
+                del self._deferred[key]
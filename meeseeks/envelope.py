@@ -0,0 +1,51 @@
+"""Module contains envelope of a room message which is parsed once and shared by all apps. """
+
+from dataclasses import dataclass
+
+from meeseeks.router import CommandRouter, normalize_msg
+
+
+@dataclass(frozen=True, slots=True)
+class Envelope:
+    """Contains the parts of a room message the apps need. """
+
+    # The message starts with the mention of the bot
+    mentioned: bool
+    # The message without the mention, lowercased and with single spaces between words
+    text: str
+    # Name of the requested command or empty string if there is no such command
+    command: str
+    # Comma-separated arguments of the command
+    arguments: tuple[str, ...]
+    # The message is sent to the direct room with the bot
+    direct: bool
+
+
+def get_arguments(text: str, command: str) -> tuple[str, ...]:
+    """Return arguments of the command from the normalized message. """
+
+    arguments: tuple[str, ...] = tuple(
+        argument.strip() for argument in text.replace(command, '', 1).strip().split(',')
+    )
+
+    return arguments if arguments[0] != '' else ()
+
+
+def parse_envelope(
+        msg: str, mention: str, direct: bool, router: CommandRouter | None = None,
+) -> Envelope:
+    """Return envelope of the message. The command is looked up by the given router if
+    there is one.
+    """
+
+    mentioned: bool = msg.startswith(mention)
+    text: str = normalize_msg(msg.replace(mention, '', 1))
+    command: str = ''
+    arguments: tuple[str, ...] = ()
+    if router is not None:
+        handlers = router.resolve(text)
+        if handlers:
+            command = handlers[0][1].command_name
+            arguments = get_arguments(text, command)
+
+    return Envelope(mentioned, text, command, arguments, direct)
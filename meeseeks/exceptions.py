@@ -27,3 +27,23 @@ class CommandDoesNotExist(Exception):
 
 class BadConfigure(Exception):
     """Raise when Meeseeks not configured correctly on Rocket.Chat. """
+
+
+class DDPCallFailed(Exception):
+    """Raises when Rocket.Chat returns error in response to DDP method call. """
+
+    def __init__(self, error: dict):
+        super().__init__(error.get('message') or error.get('error'))
+        self.error: dict = error
+
+
+class OutboxStopped(Exception):
+    """Raises when the queue of outbound messages is stopped before the message is sent. """
+
+
+class WorkerError(Exception):
+    """Raises when the worker process of an app or the core fails to handle a call. """
+
+
+class CallNotSent(ConnectionError):
+    """Raises when DDP method call is not sent because the connection to Rocket.Chat is lost. """
@@ -0,0 +1,108 @@
+"""Module contains filter which drops irrelevant Rocket.Chat callbacks before serializing them. """
+
+import time
+from collections import Counter
+from typing import Any
+
+from meeseeks import settings
+from meeseeks.cache import LatestVersions
+from meeseeks.context import ContextRoom, get_message_version
+from meeseeks.metrics import REGISTRY
+
+DROP_DUPLICATE = 'duplicate'
+
+DROP_LINK_PREVIEWS = 'link_previews'
+
+DROP_MALFORMED = 'malformed'
+
+DROP_NOT_MENTIONED = 'not_mentioned'
+
+DROP_OVERLOAD = 'overload'
+
+DROP_OWN_MESSAGE = 'own_message'
+
+DROP_STALE = 'stale'
+
+_FRAMES_DROPPED = REGISTRY.counter(
+    'meeseeks_frames_dropped_total',
+    'Number of frames dropped before processing by reason.',
+    ('reason', ),
+)
+
+
+class FrameFilter:
+    """Classifies room messages looking only at the fields it needs. Messages which can be
+    neither a command nor a dialog message are dropped, as well as messages sent long before
+    the filter is created (that is, before the bot subscribed to the messages) and versions
+    of messages which are not newer than the passed ones. Other callbacks are always passed.
+
+    The versions of the given number of the recently passed messages are kept. The message
+    which is forgotten is passed again only if its version is newer than the versions of all
+    forgotten messages, so reactions to it do not pass, but its edits do.
+    """
+
+    def __init__(self, user_id: str, grace: float = 60, seen_size: int = 10000):
+        self._user_id: str = user_id
+        self._mention: str = f'@{settings.USER_NAME}'
+        self._fresh_since: int = int((time.time() - grace) * 1000)
+        self._seen: LatestVersions[str] = LatestVersions(seen_size)
+
+        self.dropped: Counter[str] = Counter()
+        self.passed: int = 0
+
+    def is_fresh(self, message: dict[str, Any]) -> bool:
+        """Check if the message was sent or edited after the bot subscribed to the messages.
+        Messages sent a bit earlier are considered fresh too, because the clocks of the bot
+        and Rocket.Chat may differ.
+        """
+
+        return get_message_version(message) >= self._fresh_since
+
+    def classify(self, raw_context: dict[str, Any]) -> str | None:
+        """Return the reason to drop the callback or None if it must be processed.
+        Versions of passed messages are remembered to drop their duplicates and older versions.
+        """
+
+        if (raw_context.get('msg') != 'changed' or
+                raw_context.get('collection') != 'stream-room-messages'):
+            return None
+
+        reason: str | None = None
+        try:
+            message: dict[str, Any] = raw_context['fields']['args'][0]
+            room_type: str = raw_context['fields']['args'][1]['roomType']
+            urls: list[dict] = message.get('urls') or []
+
+            if message['u']['_id'] == self._user_id:
+                reason = DROP_OWN_MESSAGE
+            elif urls and 'meta' in urls[0]:
+                reason = DROP_LINK_PREVIEWS
+            elif not self.is_fresh(message):
+                reason = DROP_STALE
+            elif (room_type != ContextRoom.DIALOG_ROOM_TYPE and
+                    not message['msg'].startswith(self._mention)):
+                reason = DROP_NOT_MENTIONED
+            elif not self._seen.update(message['_id'], get_message_version(message)):
+                # Reactions and link previews resend the message without changing its version
+                reason = DROP_DUPLICATE
+        except (AttributeError, IndexError, KeyError, TypeError, ):
+            reason = DROP_MALFORMED
+
+        return reason
+
+    def accept(self, raw_context: dict[str, Any]) -> bool:
+        """Check if the callback must be processed and count the result. """
+
+        reason: str | None = self.classify(raw_context)
+        if reason:
+            self.drop(reason)
+            return False
+
+        self.passed += 1
+        return True
+
+    def drop(self, reason: str) -> None:
+        """Counts the callback dropped for the given reason. """
+
+        self.dropped[reason] += 1
+        _FRAMES_DROPPED.labels(reason).inc()
@@ -0,0 +1,109 @@
+"""Module contains keepalive of the websocket connection to Rocket.Chat. """
+
+import asyncio
+import itertools
+import time
+from typing import Any
+
+from meeseeks.logger import LOGGER
+from meeseeks.metrics import Histogram
+from meeseeks.rtapi import RealTimeAPI
+from meeseeks.supervisor import CONNECTION_ERRORS
+
+
+class Keepalive:
+    """Answers server pings and sends client pings with the given interval (in seconds),
+    measuring round-trip time. The connection is closed to force reconnection when nothing
+    is received for the given timeout or a ping is not answered for the given maximum
+    round-trip time.
+    """
+
+    def __init__(self, rtapi: RealTimeAPI, interval: float, timeout: float, max_rtt: float):
+        self._rtapi: RealTimeAPI = rtapi
+        self._interval: float = interval
+        self._timeout: float = timeout
+        self._max_rtt: float = max_rtt
+        self._ping_ids: itertools.count = itertools.count()
+        self._pings: dict[str, float] = {}
+        self._received_at: float = time.monotonic()
+        self._pinger: asyncio.Task | None = None
+
+        self.rtt: Histogram = Histogram()
+        self.forced_reconnects: int = 0
+
+    def reset(self) -> None:
+        """Forgets the pings sent over the previous connection. """
+
+        self._pings.clear()
+        self._received_at = time.monotonic()
+
+    async def process(self, raw_context: dict[str, Any]) -> bool:
+        """Registers the received callback and answers it if it is a ping. Return True
+        if the callback is a ping or a pong which needs no further processing.
+        """
+
+        now: float = time.monotonic()
+        self._received_at = now
+        msg: Any = raw_context.get('msg')
+        if msg == 'ping':
+            await self._rtapi.pong(raw_context.get('id'))
+            return True
+
+        if msg != 'pong':
+            return False
+
+        sent_at: float | None = self._pings.pop(raw_context.get('id', ''), None)
+        if sent_at is not None:
+            rtt: float = now - sent_at
+            self.rtt.observe(rtt)
+            if rtt > self._max_rtt:
+                await self._force_reconnect(f'round-trip time is {rtt:.3f} seconds')
+
+        return True
+
+    async def _force_reconnect(self, reason: str) -> None:
+        """Closes the connection, so the reader reconnects. """
+
+        LOGGER.warning('%s: Closing connection: %s', self.__class__.__name__, reason)
+        self.forced_reconnects += 1
+        self.reset()
+        await self._rtapi.close()
+
+    async def check(self) -> None:
+        """Checks the connection and sends the next ping. """
+
+        now: float = time.monotonic()
+        silence: float = now - self._received_at
+        if any(now - sent_at > self._max_rtt for sent_at in self._pings.values()):
+            await self._force_reconnect('ping is not answered')
+        elif silence > self._timeout:
+            await self._force_reconnect(f'nothing received for {silence:.3f} seconds')
+        elif not self._pings:
+            ping_id: str = f'keepalive-{next(self._ping_ids)}'
+            self._pings[ping_id] = now
+            await self._rtapi.ping(ping_id)
+
+    async def _ping_forever(self) -> None:
+        """Checks the connection with the given interval. """
+
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.check()
+            except CONNECTION_ERRORS:
+                # The reader will notice the connection is lost and reconnect
+                self.reset()
+
+    def start(self) -> None:
+        """Starts sending pings. """
+
+        if self._pinger is None:
+            self._pinger = asyncio.create_task(self._ping_forever())
+
+    async def stop(self) -> None:
+        """Stops sending pings. """
+
+        if self._pinger is not None:
+            self._pinger.cancel()
+            await asyncio.gather(self._pinger, return_exceptions=True)
+            self._pinger = None
@@ -0,0 +1,223 @@
+"""Module contains election of the leader among the replicas of the bot. Only the leader runs
+scheduled jobs, so birthday greetings and reminders are posted once however many replicas
+process the messages. The leadership is a lock: a file lock for the replicas on one host or
+sharing a file system, or a Postgres advisory lock.
+"""
+
+import asyncio
+import fcntl
+import os
+import tempfile
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from meeseeks import settings
+from meeseeks.exceptions import BadConfigure
+from meeseeks.logger import LOGGER
+
+try:
+    import asyncpg
+except ImportError:
+    HAS_ASYNCPG = False
+else:
+    HAS_ASYNCPG = True
+
+_R = TypeVar('_R')
+
+
+class LeaderElector:
+    """Base class of the backends of the leader election. The replica without a backend
+    is always the leader.
+    """
+
+    def __init__(self) -> None:
+        self._is_leader: bool = False
+        self._checker: asyncio.Task | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Return True if the replica was the leader on the last check. """
+
+        return self._is_leader
+
+    async def _acquire(self) -> bool:
+        """Acquires the lock or checks it is still held. """
+
+        return True
+
+    async def _release(self) -> None:
+        """Releases the lock. """
+
+    async def try_acquire(self) -> bool:
+        """Return True if the replica is the leader, trying to become one if it is not. """
+
+        try:
+            is_leader: bool = await self._acquire()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('%s: Failed to check leadership', self.__class__.__name__)
+            is_leader = False
+
+        if is_leader != self._is_leader:
+            LOGGER.info('%s: %s leadership', self.__class__.__name__,
+                        'Acquired' if is_leader else 'Lost')
+
+        self._is_leader = is_leader
+        return is_leader
+
+    async def release(self) -> None:
+        """Gives up the leadership. """
+
+        await self._release()
+        self._is_leader = False
+
+    def guard(self, job: Callable[..., Awaitable[_R]]) -> Callable[..., Awaitable[_R | None]]:
+        """Return job which runs only if the replica holds the lease, i.e. it is the leader
+        right before the run. Otherwise the run is skipped.
+        """
+
+        @wraps(job)
+        async def run_if_leader(*args: Any, **kwargs: Any) -> _R | None:
+            if not await self.try_acquire():
+                LOGGER.debug('%s: Skipped %s, not the leader',
+                             self.__class__.__name__, getattr(job, '__name__', job))
+                return None
+
+            return await job(*args, **kwargs)
+
+        return run_if_leader
+
+    async def _check_forever(self, interval: float) -> None:
+        """Tries to become the leader or checks the leadership with the given interval
+        (in seconds).
+        """
+
+        while True:
+            await self.try_acquire()
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Starts periodic checks of the leadership. """
+
+        if self._checker is None:
+            self._checker = asyncio.create_task(self._check_forever(interval))
+
+    async def stop(self) -> None:
+        """Stops periodic checks and gives up the leadership. """
+
+        if self._checker is not None:
+            self._checker.cancel()
+            await asyncio.gather(self._checker, return_exceptions=True)
+            self._checker = None
+
+        await self.release()
+
+
+class FileLockElector(LeaderElector):
+    """Leader is the replica which holds the exclusive lock of the file. The lock is released
+    by the operating system if the replica dies.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+
+        self._path: str = path
+        self._fd: int | None = None
+
+    async def _acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        fd: int = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    async def _release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class PostgresLockElector(LeaderElector):
+    """Leader is the replica which holds the session-level advisory lock with the given key.
+    The lock is released by Postgres if the connection of the replica is lost, so
+    the connection is checked on each attempt.
+    """
+
+    def __init__(self, dsn: str, key: int):
+        super().__init__()
+
+        if not HAS_ASYNCPG:
+            raise BadConfigure('LEADER_ELECTION is postgres, but asyncpg is not installed')
+
+        self._dsn: str = dsn
+        self._key: int = key
+        self._connection: Any = None
+        self._locked: bool = False
+
+    async def _close(self) -> None:
+        """Closes the connection, which releases the lock if it is held. """
+
+        connection: Any = self._connection
+        self._connection = None
+        self._locked = False
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+    async def _acquire(self) -> bool:
+        if self._connection is not None and self._connection.is_closed():
+            await self._close()
+
+        if self._connection is None:
+            self._connection = await asyncpg.connect(self._dsn)
+
+        try:
+            if self._locked:
+                # The lock is held by the session as long as the connection is alive
+                await self._connection.fetchval('SELECT 1')
+            else:
+                self._locked = await self._connection.fetchval(
+                    'SELECT pg_try_advisory_lock($1)', self._key,
+                )
+        except Exception:
+            await self._close()
+            raise
+
+        return self._locked
+
+    async def _release(self) -> None:
+        try:
+            if self._locked:
+                await self._connection.execute('SELECT pg_advisory_unlock($1)', self._key)
+        finally:
+            await self._close()
+
+
+def create_elector(backend: str) -> LeaderElector:
+    """Return the leader election backend with the given name ('file' or 'postgres').
+    Empty name means the replica is always the leader.
+    """
+
+    if not backend:
+        return LeaderElector()
+
+    if backend == 'file':
+        return FileLockElector(
+            settings.LEADER_LOCK_FILE or os.path.join(tempfile.gettempdir(), 'meeseeks.lock'),
+        )
+
+    if backend == 'postgres':
+        if not settings.LEADER_DSN:
+            raise BadConfigure('LEADER_ELECTION is postgres, but LEADER_DSN is not specified')
+
+        return PostgresLockElector(settings.LEADER_DSN, settings.LEADER_LOCK_KEY)
+
+    raise BadConfigure(f'Unknown LEADER_ELECTION {backend!r}')
@@ -0,0 +1,308 @@
+"""Module contains metrics of Meeseeks runtime and their export in Prometheus text format. """
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Generic, TypeVar
+
+from aiohttp import web
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+    JobSubmissionEvent,
+)
+from apscheduler.schedulers.base import BaseScheduler
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, )
+
+_M = TypeVar('_M', 'Value', 'Histogram')
+
+
+class Value:
+    """Contains value of counter or gauge. The value may be computed by the given function
+    when the metrics are collected instead of being updated on each event.
+    """
+
+    __slots__ = ('_value', '_function', )
+
+    def __init__(self) -> None:
+        self._value: float = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increases the value. """
+
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decreases the value. """
+
+        self._value -= amount
+
+    def set(self, value: float) -> None:
+        """Sets the value. """
+
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Computes the value by the given function when the metrics are collected. """
+
+        self._function = function
+
+    def get(self) -> float:
+        """Return the value. """
+
+        if self._function is not None:
+            return self._function()
+
+        return self._value
+
+
+class Histogram:
+    """Counts observed values in the buckets with the given upper bounds. """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count the given value. """
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Return labels in Prometheus text format. """
+
+    if not labels:
+        return ''
+
+    pairs: list[str] = []
+    for name, value in labels.items():
+        escaped: str = value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+        pairs.append(f'{name}="{escaped}"')
+
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_number(value: float) -> str:
+    """Return number in Prometheus text format. """
+
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value))
+
+
+class Family(Generic[_M]):
+    """Contains metrics with the same name which differ in the values of their labels. """
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            metric_type: str,
+            factory: Callable[[], _M],
+            labelnames: tuple[str, ...],
+    ):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.metric_type: str = metric_type
+        self._factory: Callable[[], _M] = factory
+        self._labelnames: tuple[str, ...] = labelnames
+        self._children: dict[tuple[str, ...], _M] = {}
+
+    def labels(self, *values: str) -> _M:
+        """Return metric with the given values of labels. """
+
+        child: _M | None = self._children.get(values)
+        if child is None:
+            if len(values) != len(self._labelnames):
+                raise ValueError(f'{self.name} expects labels {self._labelnames}')
+
+            child = self._children[values] = self._factory()
+
+        return child
+
+    def attach(self, child: _M, *values: str) -> None:
+        """Exports the metric kept by another object with the given values of labels. """
+
+        self._children[values] = child
+
+    def _render_child(self, labels: dict[str, str], child: _M) -> list[str]:
+        """Return samples of the metric in Prometheus text format. """
+
+        if isinstance(child, Value):
+            return [f'{self.name}{_format_labels(labels)} {_format_number(child.get())}']
+
+        lines: list[str] = []
+        cumulative: int = 0
+        for upper_bound, count in zip(child.buckets + (float('inf'), ), child.counts):
+            cumulative += count
+            bucket_labels: dict[str, str] = {**labels, 'le': _format_number(upper_bound)}
+            lines.append(f'{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+
+        lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_number(child.sum)}')
+        lines.append(f'{self.name}_count{_format_labels(labels)} {child.count}')
+
+        return lines
+
+    def render(self) -> list[str]:
+        """Return the metrics in Prometheus text format. """
+
+        lines: list[str] = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+        ]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(dict(zip(self._labelnames, values)), child))
+
+        return lines
+
+
+class Registry:
+    """Contains all metrics of Meeseeks. Metrics are created on the first request
+    and shared by all next requests with the same name.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, Family[Any]] = {}
+
+    def _get_family(
+            self,
+            name: str,
+            documentation: str,
+            metric_type: str,
+            factory: Callable[[], Any],
+            labelnames: tuple[str, ...],
+    ) -> Family[Any]:
+        """Return family with the given name creating it if there is none. """
+
+        family: Family[Any] | None = self._families.get(name)
+        if family is None:
+            family = Family(name, documentation, metric_type, factory, labelnames)
+            self._families[name] = family
+        elif family.metric_type != metric_type:
+            raise ValueError(f'{name} is already registered as {family.metric_type}')
+
+        return family
+
+    def counter(
+            self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+    ) -> Family[Value]:
+        """Return counter with the given name. """
+
+        return self._get_family(name, documentation, 'counter', Value, labelnames)
+
+    def gauge(
+            self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+    ) -> Family[Value]:
+        """Return gauge with the given name. """
+
+        return self._get_family(name, documentation, 'gauge', Value, labelnames)
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Family[Histogram]:
+        """Return histogram with the given name. """
+
+        return self._get_family(
+            name, documentation, 'histogram', lambda: Histogram(buckets), labelnames,
+        )
+
+    def render(self) -> str:
+        """Return all metrics in Prometheus text format. """
+
+        lines: list[str] = []
+        for family in list(self._families.values()):
+            lines.extend(family.render())
+
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+_JOBS = REGISTRY.counter(
+    'meeseeks_scheduler_jobs_total',
+    'Number of runs of scheduled jobs by result.',
+    ('app', 'job', 'result', ),
+)
+
+_JOBS_DURATION = REGISTRY.histogram(
+    'meeseeks_scheduler_job_duration_seconds',
+    'Duration of scheduled jobs.',
+    ('app', 'job', ),
+)
+
+
+def instrument_scheduler(scheduler: BaseScheduler, app_name: str = '') -> None:
+    """Counts runs and duration of the jobs of the given scheduler. If the app name is not
+    given, ids of the jobs are expected to be prefixed by the names of their apps
+    as 'app:job'.
+    """
+
+    started_at: dict[tuple[str, Any], float] = {}
+
+    def get_labels(job_id: str) -> tuple[str, str]:
+        if app_name:
+            return app_name, job_id
+
+        app, _, job = job_id.partition(':')
+        return app, job
+
+    def listener(event: JobEvent) -> None:
+        if isinstance(event, JobSubmissionEvent):
+            for run_time in event.scheduled_run_times:
+                started_at[(event.job_id, run_time, )] = time.monotonic()
+            return
+
+        result: str = 'missed'
+        if event.code == EVENT_JOB_EXECUTED:
+            result = 'executed'
+        elif event.code == EVENT_JOB_ERROR:
+            result = 'failed'
+
+        _JOBS.labels(*get_labels(event.job_id), result).inc()
+        submitted_at: float | None = started_at.pop(
+            (event.job_id, event.scheduled_run_time, ), None,
+        )
+        if submitted_at is not None:
+            _JOBS_DURATION.labels(*get_labels(event.job_id)).observe(
+                time.monotonic() - submitted_at,
+            )
+
+    scheduler.add_listener(
+        listener, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED,
+    )
+
+
+async def start_metrics_server(registry: Registry, host: str, port: int) -> web.AppRunner:
+    """Starts HTTP server which exports the metrics in Prometheus text format. """
+
+    async def handle_metrics(_request: web.Request) -> web.Response:
+        return web.Response(
+            text=registry.render(),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+        )
+
+    app: web.Application = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner: web.AppRunner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError:
+        await runner.cleanup()
+        raise
+
+    return runner
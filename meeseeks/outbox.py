@@ -0,0 +1,284 @@
+"""Module contains queue of outbound Rocket.Chat messages. """
+
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Mapping
+
+from aiohttp import ClientConnectionError, ClientConnectorError, ClientResponseError
+
+from meeseeks.backoff import Backoff
+from meeseeks.exceptions import CallNotSent, DDPCallFailed, OutboxStopped
+from meeseeks.logger import LOGGER
+from meeseeks.metrics import Histogram
+
+PRIORITY_INTERACTIVE = 0
+
+PRIORITY_BULK = 10
+
+_TOO_MANY_REQUESTS = 429
+
+SendMessage = Callable[[], Awaitable[tuple[dict[str, Any], Mapping[str, str]]]]
+
+
+class _Message:
+    """Contains message waiting for sending. """
+
+    __slots__ = ('send', 'future', 'priority', 'number', 'backoff', 'queued_at', )
+
+    def __init__(
+            self,
+            send: SendMessage,
+            future: asyncio.Future[dict[str, Any]],
+            priority: int,
+            number: int,
+            backoff: Backoff,
+    ):
+        self.send: SendMessage = send
+        self.future: asyncio.Future[dict[str, Any]] = future
+        self.priority: int = priority
+        self.number: int = number
+        self.backoff: Backoff = backoff
+        self.queued_at: float = time.monotonic()
+
+    def fail(self, exc: Exception) -> None:
+        """Passes the exception to the sender if it still waits for the message. """
+
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class TokenBucket:
+    """Allows the given number of actions per second with bursts up to the given capacity. """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate: float = rate
+        self._capacity: float = max(capacity, 1)
+        self._tokens: float = self._capacity
+        self._updated_at: float = time.monotonic()
+        self._paused_until: float = 0.0
+
+    def _refill(self) -> None:
+        """Adds tokens accumulated since the previous refill. """
+
+        now: float = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def pause(self, delay: float) -> None:
+        """Forbids actions for the given time (in seconds). """
+
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    async def acquire(self) -> None:
+        """Waits until the action is allowed. """
+
+        while True:
+            pause: float = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+def get_rate_limit_delay(headers: Mapping[str, str] | None) -> float:
+    """Return time (in seconds) to wait according to the rate limit headers of Rocket.Chat. """
+
+    if not headers:
+        return 0.0
+
+    delay: float = 0.0
+    try:
+        if 'Retry-After' in headers:
+            delay = float(headers['Retry-After'])
+        elif headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in headers:
+            # Rocket.Chat reports reset time as a timestamp in milliseconds
+            delay = int(headers['X-RateLimit-Reset']) / 1000 - time.time()
+    except ValueError:
+        return 0.0
+
+    return max(delay, 0.0)
+
+
+class Outbox:
+    """Sends messages one by one in the order of their priorities (the lower value,
+    the higher priority) pacing them with the token bucket. Messages rejected because
+    of the rate limit or not sent because the connection failed are put back to the queue
+    with exponential backoff, so other messages are sent meanwhile. Messages which may be
+    already stored by Rocket.Chat are not retried, because posting is not idempotent.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: float,
+            max_retries: int,
+            backoff_base: float,
+            backoff_max: float,
+    ):
+        self._bucket: TokenBucket = TokenBucket(rate, burst)
+        self._max_retries: int = max_retries
+        self._backoff_base: float = backoff_base
+        self._backoff_max: float = backoff_max
+        self._queue: asyncio.PriorityQueue[tuple[int, int, _Message]] = asyncio.PriorityQueue()
+        self._counter: itertools.count = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._current: _Message | None = None
+        self._retrying: dict[_Message, asyncio.TimerHandle] = {}
+
+        self.latency: Histogram = Histogram()
+        self.sent: int = 0
+        self.retries: int = 0
+        self.failed: int = 0
+
+    @property
+    def depth(self) -> int:
+        """Return number of messages which are waiting for sending. """
+
+        return self._queue.qsize() + len(self._retrying)
+
+    def start(self) -> None:
+        """Starts sending messages. """
+
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._send_forever())
+
+    async def stop(self) -> None:
+        """Stops sending messages. Messages which are not sent yet, including the one being
+        sent, fail with OutboxStopped.
+        """
+
+        current: _Message | None = self._current
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        unsent: list[_Message] = [current] if current is not None else []
+        for message, handle in self._retrying.items():
+            handle.cancel()
+            unsent.append(message)
+
+        self._retrying.clear()
+        while not self._queue.empty():
+            unsent.append(self._queue.get_nowait()[2])
+
+        for message in unsent:
+            message.fail(OutboxStopped('Outbox is stopped before the message is sent'))
+
+    def _put(self, message: _Message) -> None:
+        """Puts the message to the queue. """
+
+        self._queue.put_nowait((message.priority, message.number, message, ))
+
+    async def send(self, send: SendMessage, priority: int = PRIORITY_BULK) -> dict[str, Any]:
+        """Puts message to the queue and waits until it is sent. """
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._put(_Message(
+            send,
+            future,
+            priority,
+            next(self._counter),
+            Backoff(self._backoff_base, self._backoff_max),
+        ))
+
+        return await future
+
+    def _get_retry_delay(self, exc: Exception, backoff: Backoff) -> float | None:
+        """Return time (in seconds) to wait before retrying or None if sending must not
+        be retried. If the rate limit of Rocket.Chat is exceeded, sending of all messages is
+        paused for the time the limit requires.
+        """
+
+        if backoff.attempts >= self._max_retries:
+            return None
+
+        if isinstance(exc, ClientResponseError):
+            if exc.status != _TOO_MANY_REQUESTS:
+                return None
+
+            rate_limit_delay: float = get_rate_limit_delay(exc.headers)
+        elif isinstance(exc, DDPCallFailed):
+            if exc.error.get('error') != 'too-many-requests':
+                return None
+
+            # Rocket.Chat reports time to reset the DDP rate limiter in milliseconds
+            rate_limit_delay = exc.error.get('details', {}).get('timeToReset', 0) / 1000
+        elif isinstance(exc, (ClientConnectorError, CallNotSent)):
+            # The connection was not established or lost before sending, so the message
+            # was not sent
+            return backoff.next_delay()
+        else:
+            # The message may be already stored by Rocket.Chat, so sending it again may
+            # duplicate it
+            return None
+
+        self._bucket.pause(rate_limit_delay)
+        return max(rate_limit_delay, backoff.next_delay())
+
+    def _retry_later(self, message: _Message, delay: float) -> None:
+        """Puts the message back to the queue after the given time (in seconds). """
+
+        def retry() -> None:
+            del self._retrying[message]
+            self._put(message)
+
+        self._retrying[message] = asyncio.get_running_loop().call_later(delay, retry)
+
+    async def _deliver(self, message: _Message) -> None:
+        """Sends message. If sending must be retried, the message is put back to the queue
+        later.
+        """
+
+        await self._bucket.acquire()
+        try:
+            response, headers = await message.send()
+        except (
+                ClientConnectionError,
+                ClientResponseError,
+                ConnectionError,
+                DDPCallFailed,
+                asyncio.TimeoutError,
+        ) as exc:
+            delay: float | None = self._get_retry_delay(exc, message.backoff)
+            if delay is None:
+                self.failed += 1
+                message.fail(exc)
+                return
+
+            LOGGER.warning('%s: Failed to send message (%s), retrying in %.2f seconds',
+                           self.__class__.__name__, exc, delay)
+            self.retries += 1
+            self._retry_later(message, delay)
+            return
+
+        self._bucket.pause(get_rate_limit_delay(headers))
+        self.sent += 1
+        self.latency.observe(time.monotonic() - message.queued_at)
+        if not message.future.cancelled():
+            message.future.set_result(response)
+
+    async def _send_forever(self) -> None:
+        """Takes messages from the queue and sends them. """
+
+        while True:
+            _, _, message = await self._queue.get()
+            if message.future.cancelled():
+                continue
+
+            self._current = message
+            try:
+                await self._deliver(message)
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception('%s: Failed to send message', self.__class__.__name__)
+                self.failed += 1
+                message.fail(exc)
+            finally:
+                self._current = None
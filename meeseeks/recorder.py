@@ -0,0 +1,173 @@
+"""Module contains recorder of Rocket.Chat frames and replayer of the recordings. """
+
+import asyncio
+import gzip
+import json
+import time
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Iterator
+
+REDACTED = '[redacted]'
+
+
+def is_login_result(frame: dict[str, Any]) -> bool:
+    """Check if the frame is the result of the login, which contains the id of the bot
+    and its resume token.
+    """
+
+    result: Any = frame.get('result')
+    return (frame.get('msg') == 'result' and isinstance(result, dict) and
+            'id' in result and 'token' in result)
+
+
+def _is_id_key(key: str) -> bool:
+    """Check if the field with the given name contains an id, for example, _id or userId. """
+
+    return key in ('id', '_id', ) or key.endswith('Id')
+
+
+def rewrite_frame(value: Any, shift: int, user_ids: dict[str, str]) -> Any:
+    """Return the frame with the dates shifted by the given number of milliseconds and
+    the ids of users replaced by the given ones.
+    """
+
+    if isinstance(value, dict):
+        date: Any = value.get('$date')
+        if len(value) == 1 and isinstance(date, (int, float, )):
+            return {'$date': date + shift}
+
+        return {
+            key: (user_ids.get(item, item) if isinstance(item, str) and _is_id_key(key)
+                  else rewrite_frame(item, shift, user_ids))
+            for key, item in value.items()
+        }
+
+    if isinstance(value, list):
+        return [rewrite_frame(item, shift, user_ids) for item in value]
+
+    return value
+
+
+class ReplayFinished(Exception):
+    """Raises when all recorded frames are replayed. """
+
+
+class FrameRecorder:
+    """Writes raw frames with the time they were received to gzip-compressed JSONL file. """
+
+    def __init__(self, path: str):
+        self._file: IO[str] = gzip.open(path, 'at', encoding='utf-8')
+
+        self.recorded: int = 0
+
+    @staticmethod
+    def _redact(frame: str) -> str:
+        """Return the frame with the resume token removed if it is the login result. """
+
+        raw_frame: Any = json.loads(frame)
+        if not isinstance(raw_frame, dict) or not is_login_result(raw_frame):
+            return frame
+
+        raw_frame['result']['token'] = REDACTED
+        return json.dumps(raw_frame)
+
+    def record(self, frame: str) -> None:
+        """Writes the frame. The frame is written as is, without parsing it again, unless
+        it may contain the resume token of the bot.
+        """
+
+        if '"token"' in frame:
+            frame = self._redact(frame)
+
+        self._file.write(f'{{"ts": {time.time()!r}, "frame": {frame}}}\n')
+        self.recorded += 1
+
+    def close(self) -> None:
+        """Flushes the recorded frames and closes the file. """
+
+        self._file.close()
+
+
+class FrameReplayer:
+    """Reads frames from the recording. If realtime is True, the frames are returned
+    with the recorded intervals between them, otherwise as fast as possible.
+
+    The dates in the frames are shifted as if the recording started when the replay did,
+    so the recorded messages are as fresh as they were when they were received. If user_id
+    is given, the recorded id of the bot is replaced by it, for example, by the id of the bot
+    known to the mock server.
+    """
+
+    def __init__(self, path: str, realtime: bool = False, user_id: str = ''):
+        self._path: str = path
+        self._realtime: bool = realtime
+        self._user_id: str = user_id
+
+        self.replayed: int = 0
+
+    def _read(self) -> Iterator[tuple[float, Any]]:
+        """Return recorded frames with their timestamps. """
+
+        with gzip.open(self._path, 'rt', encoding='utf-8') as recording:
+            for line in recording:
+                if line.strip():
+                    record: dict[str, Any] = json.loads(line)
+                    yield record['ts'], record['frame']
+
+    async def frames(self) -> AsyncIterator[str]:
+        """Return recorded frames. """
+
+        started_at: float = time.monotonic()
+        first_ts: float | None = None
+        shift: int = 0
+        user_ids: dict[str, str] = {}
+        for ts, frame in self._read():
+            if first_ts is None:
+                first_ts = ts
+                shift = int((time.time() - first_ts) * 1000)
+
+            if self._realtime:
+                delay: float = (ts - first_ts) - (time.monotonic() - started_at)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if self._user_id and isinstance(frame, dict) and is_login_result(frame):
+                user_ids[frame['result']['id']] = self._user_id
+
+            self.replayed += 1
+            yield json.dumps(rewrite_frame(frame, shift, user_ids))
+
+
+class ReplayWebSocket:
+    """Websocket which receives recorded frames and keeps the sent ones. When the recording
+    is over, the given coroutine function is awaited (for example, to wait until the frames
+    are processed) and ReplayFinished is raised.
+    """
+
+    def __init__(
+            self,
+            frames: AsyncIterator[str],
+            on_finish: Callable[[], Awaitable[None]] | None = None,
+    ):
+        self._frames: AsyncIterator[str] = frames
+        self._on_finish: Callable[[], Awaitable[None]] | None = on_finish
+
+        self.sent: list[str] = []
+
+    async def recv(self) -> str:
+        """Return the next recorded frame. """
+
+        try:
+            return await anext(self._frames)
+        except StopAsyncIteration:
+            if self._on_finish is not None:
+                await self._on_finish()
+
+            raise ReplayFinished from None
+
+    async def send(self, message: str) -> None:
+        """Keeps the sent message. """
+
+        self.sent.append(message)
+
+    async def close(self) -> None:
+        """Does nothing because there is no real connection. """
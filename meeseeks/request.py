@@ -0,0 +1,67 @@
+"""Module contains state of the request (the message or the command) an app is processing.
+The state is kept in context variables, so each asyncio task processing a message sees its
+own state, and one app instance can process several messages concurrently.
+"""
+
+from contextvars import ContextVar, Token
+from typing import Any, Generic, TypeVar
+
+from meeseeks.context import ChangedRoomMessageCtx
+from meeseeks.type import CommandMethod
+
+_V = TypeVar('_V')
+
+
+class RequestLocal(Generic[_V]):
+    """Attribute of app which is local to the request being processed. Each app instance
+    keeps its own context variable of the attribute. Reading the attribute which is not set
+    in the current request and has no default raises AttributeError as if it is not set at all.
+    """
+
+    def __init__(self, name: str, *default: _V):
+        self._name: str = name
+        self._default: tuple[_V, ...] = default
+
+    def _get_var(self, obj: Any) -> ContextVar[_V]:
+        """Return context variable of the attribute of the given app. """
+
+        var: ContextVar[_V] | None = obj.__dict__.get(f'_request_local_{self._name}')
+        if var is None:
+            name: str = f'{obj.__class__.__name__}.{self._name}'
+            var = ContextVar(name, default=self._default[0]) if self._default else ContextVar(name)
+            obj.__dict__[f'_request_local_{self._name}'] = var
+
+        return var
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> _V:
+        if obj is None:
+            return self  # type: ignore[return-value]
+
+        try:
+            return self._get_var(obj).get()
+        except LookupError as exc:
+            raise AttributeError(self._name) from exc
+
+    def __set__(self, obj: Any, value: _V) -> None:
+        self._get_var(obj).set(value)
+
+    def bind(self, obj: Any, value: _V) -> Token[_V]:
+        """Sets the attribute of the given app and returns token to restore its previous
+        value.
+        """
+
+        return self._get_var(obj).set(value)
+
+    def reset(self, obj: Any, token: Token[_V]) -> None:
+        """Restores the value the attribute of the given app had before the token was
+        received.
+        """
+
+        self._get_var(obj).reset(token)
+
+
+# Context of the message being processed
+CTX: RequestLocal[ChangedRoomMessageCtx] = RequestLocal('ctx')
+
+# Command method being run
+COMMAND_METHOD: RequestLocal[CommandMethod | None] = RequestLocal('command_method', None)
@@ -1,19 +1,111 @@
 """Module contains functionality for interaction with Rocket.Chat RestAPI. """
 
-import json
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Mapping, Type, TypeVar
+from urllib.parse import quote, urlsplit
 
-from aiohttp import ClientSession, ClientResponse
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
-from meeseeks import settings
+from meeseeks import codec, settings
+from meeseeks.cache import SingleFlight, TTLCache
+from meeseeks.metrics import REGISTRY
+from meeseeks.outbox import PRIORITY_BULK, Outbox
 from meeseeks.type import UserInfo
 
+_R = TypeVar('_R', bound='RestAPI')
+
+_REQUESTS_DURATION = REGISTRY.histogram(
+    'meeseeks_rest_request_duration_seconds',
+    'Duration of requests to Rocket.Chat REST API.',
+    ('method', 'endpoint', ),
+)
+
+_REQUESTS_FAILED = REGISTRY.counter(
+    'meeseeks_rest_requests_failed_total',
+    'Number of failed requests to Rocket.Chat REST API.',
+    ('method', 'endpoint', ),
+)
+
+
+def create_client_session() -> ClientSession:
+    """Return HTTP session with the pool of keep-alive connections. The session is intended
+    to be shared by all Meeseeks apps.
+    """
+
+    connector: TCPConnector = TCPConnector(
+        limit=settings.HTTP_POOL_SIZE,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+    return ClientSession(
+        connector=connector,
+        timeout=ClientTimeout(total=settings.HTTP_REQUEST_TIMEOUT),
+    )
+
 
 class RestAPI:
     """Contains method for interaction with Rocket.Chat RestAPI. """
 
-    def __init__(self, headers: dict[str, str]):
+    def __init__(
+            self,
+            headers: dict[str, str],
+            session: ClientSession | None = None,
+            users_cache: TTLCache[str, UserInfo] | None = None,
+            single_flight: SingleFlight[tuple[str, str], dict[str, Any]] | None = None,
+            outbox: Outbox | None = None,
+    ):
         self._headers: dict[str, str] = headers
+        self._session: ClientSession | None = session
+        self._users_cache: TTLCache[str, UserInfo] | None = users_cache
+        self._single_flight: SingleFlight[tuple[str, str], dict[str, Any]] = (
+            single_flight if single_flight is not None else SingleFlight()
+        )
+        self._outbox: Outbox | None = outbox
+
+    def specialize(self, restapi_class: Type[_R]) -> _R:
+        """Return client of the given class which shares headers, HTTP session and caches
+        and the queue of outbound messages with the current one.
+        """
+
+        return restapi_class(
+            self._headers, self._session, self._users_cache, self._single_flight, self._outbox,
+        )
+
+    async def _request(
+            self, session: ClientSession, url: str, method: str, data: str | None,
+    ) -> tuple[dict[str, Any], Mapping[str, str]]:
+        """Sends http request using the given session. Return response and its headers. """
+
+        async with session.request(
+                method,
+                url=url,
+                headers=self._headers,
+                data=data,
+                raise_for_status=True,
+        ) as response_raw:
+            response: dict[str, Any] = codec.loads(await response_raw.read())
+
+        return response, response_raw.headers
+
+    async def _send_request(
+            self, url: str, method: str, data: str | None,
+    ) -> tuple[dict[str, Any], Mapping[str, str]]:
+        """Sends http request using the shared session or a new one if there is none. """
+
+        labels: tuple[str, str] = (method.upper(), urlsplit(url).path, )
+        started_at: float = time.monotonic()
+        try:
+            if self._session is None:
+                async with ClientSession() as session:
+                    return await self._request(session, url, method, data)
+
+            return await self._request(self._session, url, method, data)
+        except Exception:
+            _REQUESTS_FAILED.labels(*labels).inc()
+            raise
+        finally:
+            _REQUESTS_DURATION.labels(*labels).observe(time.monotonic() - started_at)
 
     async def make_request(
             self, restapi_method: str, method: str, data: str | None = None,
@@ -21,28 +113,77 @@ class RestAPI:
         """Sends async http request. """
 
         url: str = settings.ROCKET_CHAT_API + restapi_method
-        async with ClientSession(raise_for_status=True) as session:
-            response_raw: ClientResponse = await session.request(
-                method,
-                url=url,
-                headers=self._headers,
-                data=data,
+        if method.lower() == 'get':
+            return await self._single_flight.do(
+                (method.lower(), url, ), lambda: self._get_response(url, method, data),
             )
-            response: dict[str, Any] = await response_raw.json()
 
-            return response
+        return await self._get_response(url, method, data)
+
+    async def _get_response(self, url: str, method: str, data: str | None) -> dict[str, Any]:
+        """Sends http request and return response without headers. """
+
+        response, _ = await self._send_request(url, method, data)
+
+        return response
+
+    async def post_message(self, msg: str, priority: int = PRIORITY_BULK) -> dict[str, Any]:
+        """Sends message through the queue of outbound messages if there is one. Messages
+        with lower priority value are sent first.
+        """
+
+        if self._outbox is None:
+            return await self.make_request(settings.CHAT_MESSAGE_POST_REQUEST, 'post', msg)
+
+        url: str = settings.ROCKET_CHAT_API + settings.CHAT_MESSAGE_POST_REQUEST
+
+        return await self._outbox.send(lambda: self._send_request(url, 'post', msg), priority)
+
+    async def get_users_page(
+            self, offset: int = 0, updated_since: int | None = None,
+    ) -> dict[str, Any]:
+        """Receive one page of users. If updated_since (timestamp in milliseconds) is given,
+        receive only users updated after that time.
+        """
+
+        request: str = (f'{settings.USERS_LIST_REQUEST}'
+                        f'?count={settings.USERS_LIST_PAGE_SIZE}&offset={offset}')
+        if updated_since is not None:
+            query: str = codec.dumps({'_updatedAt': {'$gt': {'$date': updated_since}}})
+            request += f'&query={quote(query)}'
+
+        return await self.make_request(request, 'get')
+
+    async def iter_users(self, updated_since: int | None = None) -> AsyncIterator[dict[str, Any]]:
+        """Receive users page by page. """
+
+        offset: int = 0
+        while True:
+            response = await self.get_users_page(offset, updated_since)
+            for user in response['users']:
+                yield user
+
+            offset += response['count']
+            if not response['count'] or offset >= response['total']:
+                break
 
     async def get_users(self) -> dict[str, dict[str, Any]]:
         """Receive all users. """
 
-        response = await self.make_request(settings.USERS_LIST_REQUEST, 'get')
-        return {user['_id']: user for user in response['users']}
+        return {user['_id']: user async for user in self.iter_users()}
 
     async def get_user_info(self, user_id: str) -> UserInfo:
         """Receive information about certain user. """
 
+        if self._users_cache is not None:
+            cached_user: UserInfo | None = self._users_cache.get(user_id)
+            if cached_user is not None:
+                return cached_user
+
         response = await self.make_request(f'{settings.USERS_INFO_REQUEST}?userId={user_id}', 'get')
         user: UserInfo = response['user']
+        if self._users_cache is not None:
+            self._users_cache.set(user_id, user)
 
         return user
 
@@ -70,28 +211,30 @@ class RestAPI:
     async def invite_user_to_group(self, group_id: str, user_id: str) -> dict[str, Any]:
         """Invite one user or bulk users to group. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'roomId': group_id,
             'userId': user_id,
         })
 
         return await self.make_request(f'{settings.GROUPS_INVITE_POST_REQUEST}', 'post', msg)
 
-    async def write_msg(self, text: str, rid: str) -> dict[str, Any]:
+    async def write_msg(
+            self, text: str, rid: str, priority: int = PRIORITY_BULK,
+    ) -> dict[str, Any]:
         """Sends message to chat. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'channel': rid,
             'text': text,
             'alias': settings.ALIAS,
         })
 
-        return await self.make_request(settings.CHAT_MESSAGE_POST_REQUEST, 'post', msg)
+        return await self.post_message(msg, priority)
 
     async def add_reaction(self, msg_id: str, emoji: str, should_react: bool) -> dict[str, Any]:
         """Add or remove reaction on message in chat. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'messageId': msg_id,
             'emoji': emoji,
             'shouldReact': should_react,
@@ -102,7 +245,7 @@ class RestAPI:
     async def create_group(self, name: str, users: list) -> dict[str, Any]:
         """Create group. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'name': name,
             'members': users,
         })
@@ -112,7 +255,7 @@ class RestAPI:
     async def delete_group(self, name: str) -> dict[str, Any]:
         """Delete group. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'roomName': name,
         })
 
@@ -131,7 +274,7 @@ class RestAPI:
     async def set_online_status(self) -> dict[str, Any]:
         """Set online status for bot. When bot will turn off, status will change to offline. """
 
-        msg: str = json.dumps({
+        msg: str = codec.dumps({
             'username': settings.USER_NAME,
             'status': 'online',
         })
@@ -0,0 +1,67 @@
+"""Module contains routing of Meeseeks commands to the apps they belong to. """
+
+from typing import TYPE_CHECKING
+
+from meeseeks.type import CommandMethod
+
+if TYPE_CHECKING:
+    from meeseeks.core import MeeseeksCore
+
+CommandHandler = tuple['MeeseeksCore', CommandMethod]
+
+
+def normalize_msg(message: str) -> str:
+    """Return normalized message. """
+
+    return ' '.join(word.lower() for word in message.split())
+
+
+class _Node:
+    """Contains node of commands prefix tree. """
+
+    __slots__ = ('children', 'handlers', )
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.handlers: list[CommandHandler] = []
+
+
+class CommandRouter:
+    """Prefix tree of the commands names of all installed apps. """
+
+    def __init__(self) -> None:
+        self._root: _Node = _Node()
+        self._handlers: dict[str, list[CommandHandler]] = {}
+
+    def add(self, app: 'MeeseeksCore', command_method: CommandMethod) -> None:
+        """Register the given command method of the app. """
+
+        node: _Node = self._root
+        for char in command_method.command_name:
+            node = node.children.setdefault(char, _Node())
+
+        node.handlers.append((app, command_method, ))
+        self._handlers[command_method.command_name] = node.handlers
+
+    def get(self, command_name: str) -> list[CommandHandler]:
+        """Return handlers of the command with the given name. """
+
+        return self._handlers.get(command_name, [])
+
+    def resolve(self, requested_command: str) -> list[CommandHandler]:
+        """Return handlers of the longest command name which the normalized requested command
+        starts with. Several apps may handle the same command, for example, "help".
+        """
+
+        handlers: list[CommandHandler] = self._root.handlers
+        node: _Node = self._root
+        for char in requested_command:
+            child: _Node | None = node.children.get(char)
+            if child is None:
+                break
+
+            node = child
+            if node.handlers:
+                handlers = node.handlers
+
+        return handlers
@@ -1,56 +1,190 @@
 """Module contains functionality for interaction with Rocket.Chat Realtime API. """
 
-import json
+import asyncio
+import itertools
+import time
+from typing import Any
+
 from websockets import WebSocketClientProtocol  # pylint: disable=no-name-in-module
+from websockets.exceptions import ConnectionClosed
+
+from meeseeks import codec, settings
+from meeseeks.exceptions import CallNotSent, DDPCallFailed
+from meeseeks.metrics import REGISTRY
+
+_CALLS_DURATION = REGISTRY.histogram(
+    'meeseeks_ddp_call_duration_seconds',
+    'Duration of DDP method calls over the websocket.',
+    ('method', ),
+)
 
-from meeseeks import settings
+_CALLS_FAILED = REGISTRY.counter(
+    'meeseeks_ddp_calls_failed_total',
+    'Number of failed DDP method calls.',
+    ('method', ),
+)
 
 
 class RealTimeAPI:
     """Provide functionality for interaction with Rocket.Chat Realtime API. """
 
-    def __init__(self, request: str, websocket: WebSocketClientProtocol):
-        self._request: str = request
+    def __init__(self, websocket: WebSocketClientProtocol):
         self._websocket: WebSocketClientProtocol = websocket
+        self._subscriptions: dict[str, str] = {}
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+        self._call_ids: itertools.count = itertools.count()
+
+    @property
+    def subscriptions(self) -> list[str]:
+        """Return ids of the active subscriptions. """
+
+        return list(self._subscriptions)
+
+    def attach(self, websocket: WebSocketClientProtocol) -> None:
+        """Replaces the lost connection with a new one. Calls made over the lost connection
+        fail because their results will never be received.
+        """
+
+        self._websocket = websocket
+        for future in self._calls.values():
+            if not future.done():
+                future.set_exception(ConnectionResetError('Connection to Rocket.Chat was lost'))
+
+    async def call(self, method: str, *params: Any) -> Any:
+        """Calls the DDP method and waits for its result. Raises CallNotSent if the connection
+        is lost before the call is sent, so the call can be safely made again.
+        """
+
+        call_id: str = f'call-{next(self._call_ids)}'
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = future
+        started_at: float = time.monotonic()
+        try:
+            try:
+                await self._websocket.send(codec.dumps({
+                    'msg': 'method',
+                    'method': method,
+                    'id': call_id,
+                    'params': list(params),
+                }))
+            except ConnectionClosed as exc:
+                raise CallNotSent('Connection to Rocket.Chat is lost') from exc
+
+            return await asyncio.wait_for(future, settings.DDP_CALL_TIMEOUT)
+        except Exception:
+            _CALLS_FAILED.labels(method).inc()
+            raise
+        finally:
+            del self._calls[call_id]
+            _CALLS_DURATION.labels(method).observe(time.monotonic() - started_at)
+
+    def resolve(self, raw_context: dict[str, Any]) -> bool:
+        """Passes the result of DDP method call to the caller. Return False if the callback
+        is not a result of any call in flight.
+        """
+
+        future: asyncio.Future[Any] | None = None
+        if raw_context.get('msg') == 'result':
+            future = self._calls.get(raw_context.get('id', ''))
+
+        if future is None:
+            return False
+
+        if not future.done():
+            if 'error' in raw_context:
+                future.set_exception(DDPCallFailed(raw_context['error']))
+            else:
+                future.set_result(raw_context.get('result'))
+
+        return True
+
+    async def send_message(self, text: str, rid: str) -> dict[str, Any]:
+        """Sends message to chat. Return response in the same format as RestAPI. """
+
+        message: dict[str, Any] = await self.call('sendMessage', {
+            'rid': rid,
+            'msg': text,
+            'alias': settings.ALIAS,
+        })
+
+        return {'message': message, 'success': True}
+
+    async def set_reaction(self, msg_id: str, emoji: str, should_react: bool) -> dict[str, Any]:
+        """Add or remove reaction on message in chat. """
+
+        await self.call('setReaction', emoji, msg_id, should_react)
+
+        return {'success': True}
+
+    async def _subscribe(self, sub_id: str, request: str) -> None:
+        """Subscribes to the stream and remembers the subscription to restore it
+        after reconnection.
+        """
+
+        self._subscriptions[sub_id] = request
+        await self._websocket.send(request)
+
+    async def resubscribe(self) -> None:
+        """Restores all subscriptions after reconnection. """
+
+        for request in self._subscriptions.values():
+            await self._websocket.send(request)
 
     def connect(self) -> WebSocketClientProtocol:
         """Connects to RealtimeAPI. """
 
-        self._request = json.dumps({
+        request: str = codec.dumps({
             'msg': 'connect',
             'version': '1',
             'support': ['1']
         })
 
-        return self._websocket.send(self._request)
+        return self._websocket.send(request)
 
-    def login(self) -> WebSocketClientProtocol:
-        """Login user. """
+    def login(self, token: str | None = None) -> WebSocketClientProtocol:
+        """Login user with password or with resume token if it is given. """
 
-        self._request = json.dumps({
+        params: dict[str, Any] = {'resume': token} if token else {
+            'user': {'username': settings.USER_NAME},
+            'password': settings.PASSWORD,
+        }
+        request: str = codec.dumps({
             'msg': 'method',
             'method': 'login',
             'id': settings.RC_REALTIME_LOGIN,
-            'params': [{
-                'user': {'username': settings.USER_NAME},
-                'password': settings.PASSWORD,
-            }]
+            'params': [params]
         })
 
-        return self._websocket.send(self._request)
+        return self._websocket.send(request)
 
-    def pong(self) -> WebSocketClientProtocol:
+    def pong(self, ping_id: str | None = None) -> WebSocketClientProtocol:
         """Answers to 'ping' message. """
 
-        self._request = json.dumps({'msg': 'pong'})
+        pong: dict[str, str] = {'msg': 'pong'}
+        if ping_id is not None:
+            pong['id'] = ping_id
+
+        request: str = codec.dumps(pong)
+
+        return self._websocket.send(request)
+
+    def ping(self, ping_id: str) -> WebSocketClientProtocol:
+        """Sends 'ping' message which server answers with 'pong' message with the same id. """
+
+        request: str = codec.dumps({'msg': 'ping', 'id': ping_id})
+
+        return self._websocket.send(request)
+
+    async def close(self) -> None:
+        """Closes the current connection. """
 
-        return self._websocket.send(self._request)
+        await self._websocket.close()
 
     @staticmethod
     def stream_room_messages_msg(rid: str) -> str:
         """Subscribes to certain room. """
 
-        return json.dumps({
+        return codec.dumps({
             'msg': 'sub',
             'id': rid,
             'name': 'stream-room-messages',
@@ -60,7 +194,7 @@ class RealTimeAPI:
     async def stream_all_messages(self) -> WebSocketClientProtocol:
         """Subscribes to all messages. """
 
-        await self._websocket.send(json.dumps({
+        await self._subscribe('sub-all', codec.dumps({
             'msg': 'sub',
             'id': 'sub-all',
             'name': 'stream-room-messages',
@@ -72,4 +206,15 @@ class RealTimeAPI:
         """Subscribes to given room list. """
 
         for rid in rids:
-            await self._websocket.send(self.stream_room_messages_msg(rid))
+            await self._subscribe(rid, self.stream_room_messages_msg(rid))
+
+    async def stream_notify_logged(self, events: tuple[str, ...]) -> None:
+        """Subscribes to the given events of logged in users. """
+
+        for event in events:
+            await self._subscribe(f'sub-{event}', codec.dumps({
+                'msg': 'sub',
+                'id': f'sub-{event}',
+                'name': 'stream-notify-logged',
+                'params': [event, False],
+            }))
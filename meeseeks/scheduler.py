@@ -0,0 +1,217 @@
+"""Module contains the scheduler which runs the jobs of all apps. The times of the last runs
+of the jobs are kept in the job store, so the runs missed while the bot was stopped are run
+after restart if they are late less than the misfire grace time, and reported as missed
+otherwise.
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+from apscheduler.events import (
+    EVENT_JOB_EXECUTED, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED, JobExecutionEvent,
+    JobSubmissionEvent,
+)
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from meeseeks import settings
+from meeseeks.leader import LeaderElector
+from meeseeks.logger import LOGGER
+from meeseeks.metrics import REGISTRY, instrument_scheduler
+
+Job = Callable[..., Awaitable[Any]]
+
+_JOBS_LATENESS = REGISTRY.histogram(
+    'meeseeks_scheduler_job_lateness_seconds',
+    'Time from the scheduled run time of jobs to the start of their run.',
+    ('app', 'job', ),
+    buckets=(0.1, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0, 21600.0, 86400.0, ),
+)
+
+
+def parse_crontab(crontab: str) -> dict[str, str]:
+    """Return parsed params from given crontab string. """
+
+    second, minute, hour, day, month, day_of_week = crontab.split()
+
+    return {
+        'second': second,
+        'minute': minute,
+        'hour': hour,
+        'day': day,
+        'month': month,
+        'day_of_week': day_of_week,
+    }
+
+
+class JobStore:
+    """Keeps times of the last runs of the jobs in the JSON file. Empty path means the times
+    are kept only in memory.
+    """
+
+    def __init__(self, path: str):
+        self._path: str = path
+        self._last_runs: dict[str, float] = self._load()
+
+    def _load(self) -> dict[str, float]:
+        """Return times of the last runs saved to the file. """
+
+        if not self._path or not os.path.exists(self._path):
+            return {}
+
+        try:
+            with open(self._path, encoding='utf-8') as infile:
+                last_runs: dict[str, float] = json.load(infile)
+        except (OSError, ValueError, ) as exc:
+            LOGGER.error('%s: Failed to load %s: %s', self.__class__.__name__, self._path, exc)
+            return {}
+
+        return last_runs
+
+    def _save(self) -> None:
+        """Saves times of the last runs to the file. The file is replaced at once, so it is
+        not corrupted if the bot stops while saving it.
+        """
+
+        if not self._path:
+            return
+
+        tmp_path: str = f'{self._path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as outfile:
+                json.dump(self._last_runs, outfile)
+
+            os.replace(tmp_path, self._path)
+        except OSError as exc:
+            LOGGER.error('%s: Failed to save %s: %s', self.__class__.__name__, self._path, exc)
+
+    def get_last_run(self, job_id: str) -> datetime | None:
+        """Return scheduled time of the last run of the job. """
+
+        last_run: float | None = self._last_runs.get(job_id)
+        if last_run is None:
+            return None
+
+        return datetime.fromtimestamp(last_run, timezone.utc)
+
+    def set_last_run(self, job_id: str, run_time: datetime) -> None:
+        """Remembers scheduled time of the last run of the job. """
+
+        self._last_runs[job_id] = run_time.timestamp()
+        self._save()
+
+
+class Scheduler:
+    """Runs the jobs the apps register. The runs are limited by the lease of the leader,
+    so the jobs run on one replica, and by the number of jobs running at the same time.
+    """
+
+    def __init__(
+            self,
+            store: JobStore,
+            leader: LeaderElector,
+            max_concurrency: int,
+            misfire_grace: float,
+            coalesce: bool,
+    ):
+        self._store: JobStore = store
+        self._leader: LeaderElector = leader
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._scheduled_at: dict[str, datetime] = {}
+        self._scheduler: AsyncIOScheduler = AsyncIOScheduler(
+            timezone=settings.TIME_ZONE,
+            job_defaults={
+                'misfire_grace_time': misfire_grace,
+                'coalesce': coalesce,
+                'max_instances': 1,
+            },
+        )
+        self._scheduler.add_listener(self._remember_submission, EVENT_JOB_SUBMITTED)
+        self._scheduler.add_listener(self._remember_run, EVENT_JOB_EXECUTED | EVENT_JOB_MISSED)
+        instrument_scheduler(self._scheduler)
+
+    def _remember_submission(self, event: JobSubmissionEvent) -> None:
+        """Remembers scheduled time of the submitted run to count its lateness. """
+
+        self._scheduled_at[event.job_id] = event.scheduled_run_times[-1]
+
+    def _remember_run(self, event: JobExecutionEvent) -> None:
+        """Saves scheduled time of the run which is completed or missed. The run which is
+        interrupted by the stop of the bot is run again after restart.
+        """
+
+        self._store.set_last_run(event.job_id, event.scheduled_run_time)
+
+    def _limit(self, job_id: str, job: Job) -> Job:
+        """Return job which waits for a free slot before running and counts its lateness. """
+
+        app, _, name = job_id.partition(':')
+
+        @wraps(job)
+        async def run_limited(*args: Any, **kwargs: Any) -> Any:
+            async with self._slots:
+                scheduled_at: datetime | None = self._scheduled_at.pop(job_id, None)
+                if scheduled_at is not None:
+                    _JOBS_LATENESS.labels(app, name).observe(
+                        max(time.time() - scheduled_at.timestamp(), 0),
+                    )
+
+                return await job(*args, **kwargs)
+
+        return run_limited
+
+    def add_job(
+            self,
+            app_name: str,
+            name: str,
+            job: Job,
+            crontab: str,
+            kwargs: dict[str, Any] | None = None,
+            **options: Any,
+    ) -> None:
+        """Registers the job of the app which runs according to the crontab expression.
+        The options of the job, for example, misfire_grace_time (in seconds) or coalesce,
+        default to the ones of the scheduler.
+        """
+
+        job_id: str = f'{app_name}:{name}'
+        trigger: CronTrigger = CronTrigger(
+            timezone=self._scheduler.timezone, **parse_crontab(crontab),
+        )
+        last_run: datetime | None = self._store.get_last_run(job_id)
+        if last_run is not None:
+            # The runs since the last one, including the ones missed while the bot was
+            # stopped, are handled by the misfire grace time and coalescing
+            next_run: datetime | None = trigger.get_next_fire_time(
+                last_run, datetime.now(self._scheduler.timezone),
+            )
+            if next_run is not None:
+                options['next_run_time'] = next_run
+
+        self._scheduler.add_job(
+            self._leader.guard(self._limit(job_id, job)),
+            trigger,
+            id=job_id,
+            name=job_id,
+            kwargs=kwargs or {},
+            replace_existing=True,
+            **options,
+        )
+
+    def start(self) -> None:
+        """Starts running the registered jobs. """
+
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    async def stop(self) -> None:
+        """Stops running the jobs. The running jobs are not waited for. """
+
+        if self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
@@ -1,6 +1,6 @@
 """Module contains base classes for serializing context classes. """
 
-from typing import Type, TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from meeseeks.context import Context
@@ -10,17 +10,19 @@ class ContextFactory:
     """Contains methods for handling context classes. """
 
     def __init__(self) -> None:
-        self._creators: dict[tuple, Type['Context']] = {}
+        self._creators: dict[tuple, Callable[..., 'Context']] = {}
 
-    def register(self, method: str, collection: str, creator: Type['Context']) -> None:
+    def register(self, method: str, collection: str, creator: Callable[..., 'Context']) -> None:
         """Register the given class with context. """
 
         self._creators[(method, collection,)] = creator
 
-    def get_serializer(self, serializable: tuple, method: str, collection: str) -> 'Context':
+    def get_serializer(
+            self, serializable: dict[str, Any], method: str, collection: str,
+    ) -> 'Context':
         """Return object of context. """
 
-        creator: Type['Context'] | None = self._creators.get((method, collection,))
+        creator: Callable[..., 'Context'] | None = self._creators.get((method, collection,))
         if not creator:
             raise ValueError(collection)
 
@@ -33,7 +35,7 @@ ctx_factory: ContextFactory = ContextFactory()
 class ContextSerializer:
     """Contains methods for serializing context. """
 
-    def __init__(self, serializable: tuple, method: str, collection: str):
+    def __init__(self, serializable: dict[str, Any], method: str, collection: str):
         self._serializer = ctx_factory.get_serializer(serializable, method, collection)
 
     def serialize(self) -> 'Context':
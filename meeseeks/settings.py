@@ -22,3 +22,117 @@ CONNECT_ATTEMPTS = int(os.getenv('CONNECT_ATTEMPTS', '5'))
 HELLO_RESPONSE = os.getenv('HELLO_RESPONSE', 'Hello my friend')
 
 TIME_ZONE = os.getenv('TIME_ZONE', 'Europe/Moscow')
+
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.expanduser('~'), '.meeseeks'))
+
+# Reconnection to Rocket.Chat
+RECONNECT_BACKOFF_BASE = float(os.getenv('RECONNECT_BACKOFF_BASE', '0.1'))
+
+RECONNECT_BACKOFF_MAX = float(os.getenv('RECONNECT_BACKOFF_MAX', '30'))
+
+# Profiling of commands
+PROFILE_COMMAND = os.getenv('PROFILE_COMMAND', '')
+
+PROFILE_COMMAND_RATE = int(os.getenv('PROFILE_COMMAND_RATE', '10'))
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', '')
+
+SLOW_COMMAND_THRESHOLD = float(os.getenv('SLOW_COMMAND_THRESHOLD', '5'))
+
+# Recording of received frames
+RECORD_FRAMES = os.getenv('RECORD_FRAMES', '')
+
+# Export of metrics
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+
+# Keepalive of the websocket connection
+KEEPALIVE_INTERVAL = float(os.getenv('KEEPALIVE_INTERVAL', '15'))
+
+KEEPALIVE_MAX_RTT = float(os.getenv('KEEPALIVE_MAX_RTT', '10'))
+
+KEEPALIVE_TIMEOUT = float(os.getenv('KEEPALIVE_TIMEOUT', '45'))
+
+# Encoding of JSON
+JSON_CODEC = os.getenv('JSON_CODEC', 'auto')
+
+# Transport of outbound messages
+DDP_CALL_TIMEOUT = float(os.getenv('DDP_CALL_TIMEOUT', '10'))
+
+MESSAGE_TRANSPORT = os.getenv('MESSAGE_TRANSPORT', 'rest')
+
+# Dispatching of incoming messages
+DISPATCH_CONCURRENCY = int(os.getenv('DISPATCH_CONCURRENCY', '8'))
+
+DISPATCH_QUEUE_SIZE = int(os.getenv('DISPATCH_QUEUE_SIZE', '1000'))
+
+FRESH_MESSAGE_GRACE = float(os.getenv('FRESH_MESSAGE_GRACE', '60'))
+
+SEEN_MESSAGES_SIZE = int(os.getenv('SEEN_MESSAGES_SIZE', '10000'))
+
+# Election of the leader which runs scheduled jobs
+LEADER_CHECK_INTERVAL = float(os.getenv('LEADER_CHECK_INTERVAL', '15'))
+
+LEADER_DSN = os.getenv('LEADER_DSN', '')
+
+LEADER_ELECTION = os.getenv('LEADER_ELECTION', '')
+
+LEADER_LOCK_FILE = os.getenv('LEADER_LOCK_FILE', '')
+
+LEADER_LOCK_KEY = int(os.getenv('LEADER_LOCK_KEY', '1835361651'))
+
+# Scheduling of jobs
+SCHEDULER_COALESCE = os.getenv('SCHEDULER_COALESCE', 'true').lower() == 'true'
+
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv('SCHEDULER_MAX_CONCURRENCY', '4'))
+
+SCHEDULER_MISFIRE_GRACE = float(os.getenv('SCHEDULER_MISFIRE_GRACE', '3600'))
+
+SCHEDULER_STORE = os.getenv('SCHEDULER_STORE', os.path.join(DATA_DIR, 'jobs.json'))
+
+# Startup of apps
+APP_SETUP_TIMEOUT = float(os.getenv('APP_SETUP_TIMEOUT', '60'))
+
+CORE_APPS = os.getenv('CORE_APPS', 'meeseeks')
+
+# Worker processes of apps
+WORKER_APPS = os.getenv('WORKER_APPS', '')
+
+WORKER_START_TIMEOUT = float(os.getenv('WORKER_START_TIMEOUT', '60'))
+
+WORKER_RESTART_BACKOFF_BASE = float(os.getenv('WORKER_RESTART_BACKOFF_BASE', '1'))
+
+WORKER_RESTART_BACKOFF_MAX = float(os.getenv('WORKER_RESTART_BACKOFF_MAX', '60'))
+
+# HTTP client
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '100'))
+
+HTTP_REQUEST_TIMEOUT = float(os.getenv('HTTP_REQUEST_TIMEOUT', '30'))
+
+REST_RESULT_CACHE_TTL = float(os.getenv('REST_RESULT_CACHE_TTL', '0'))
+
+# Queue of outbound messages
+OUTBOX_BACKOFF_BASE = float(os.getenv('OUTBOX_BACKOFF_BASE', '0.5'))
+
+OUTBOX_BACKOFF_MAX = float(os.getenv('OUTBOX_BACKOFF_MAX', '30'))
+
+OUTBOX_BURST = float(os.getenv('OUTBOX_BURST', '10'))
+
+OUTBOX_MAX_RETRIES = int(os.getenv('OUTBOX_MAX_RETRIES', '5'))
+
+OUTBOX_RATE = float(os.getenv('OUTBOX_RATE', '5'))
+
+# Cache of users information
+USERS_CACHE_SIZE = int(os.getenv('USERS_CACHE_SIZE', '1024'))
+
+USERS_CACHE_TTL = float(os.getenv('USERS_CACHE_TTL', '300'))
+
+# Directory of users
+USERS_DIRECTORY_REFRESH_INTERVAL = float(os.getenv('USERS_DIRECTORY_REFRESH_INTERVAL', '60'))
+
+USERS_LIST_PAGE_SIZE = int(os.getenv('USERS_LIST_PAGE_SIZE', '100'))
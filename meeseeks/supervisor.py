@@ -0,0 +1,106 @@
+"""Module contains supervisor of the websocket connection to Rocket.Chat. """
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import websockets
+from websockets import WebSocketClientProtocol  # pylint: disable=no-name-in-module
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+
+from meeseeks.backoff import Backoff
+from meeseeks.logger import LOGGER
+
+# Timeouts and DNS failures are subclasses of OSError
+CONNECTION_ERRORS = (ConnectionClosed, InvalidHandshake, OSError, asyncio.TimeoutError, )
+
+Connect = Callable[[str], Awaitable[WebSocketClientProtocol]]
+
+OnConnect = Callable[[WebSocketClientProtocol], Awaitable[None]]
+
+
+class ConnectionSupervisor:
+    """Keeps the websocket connection open. When the connection is lost, the supervisor
+    reconnects immediately and then with exponential backoff, calling the given coroutine
+    function (for example, to log in) after each successful connection. Connections are opened
+    by websockets.connect unless another coroutine function is given.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            on_connect: OnConnect,
+            backoff_base: float,
+            backoff_max: float,
+            connect: Connect | None = None,
+    ):
+        self._url: str = url
+        self._on_connect: OnConnect = on_connect
+        self._connect: Connect | None = connect
+        self._backoff: Backoff = Backoff(backoff_base, backoff_max)
+        self._websocket: WebSocketClientProtocol | None = None
+
+        self.disconnected_at: float | None = None
+        self.downtime: float = 0.0
+        self.reconnects: int = 0
+
+    async def _open(self) -> None:
+        """Opens new connection and calls the coroutine function passed to the supervisor. """
+
+        connect: Connect = self._connect or websockets.connect
+        websocket: WebSocketClientProtocol = await connect(self._url)
+        try:
+            await self._on_connect(websocket)
+        except BaseException:
+            await websocket.close()
+            raise
+
+        self._websocket = websocket
+
+    async def connect(self) -> None:
+        """Opens connection retrying on connection errors. """
+
+        self._backoff.reset()
+        while True:
+            try:
+                await self._open()
+            except CONNECTION_ERRORS as exc:
+                delay: float = self._backoff.next_delay()
+                LOGGER.warning('%s: Failed to connect (%r), retrying in %.2f seconds',
+                               self.__class__.__name__, exc, delay)
+                await asyncio.sleep(delay)
+            else:
+                return
+
+    async def close(self) -> None:
+        """Closes the current connection. """
+
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+
+    async def reconnect(self) -> None:
+        """Replaces the lost connection with a new one. """
+
+        self.disconnected_at = time.monotonic()
+        await self.close()
+        await self.connect()
+
+        downtime: float = time.monotonic() - self.disconnected_at
+        self.downtime += downtime
+        self.reconnects += 1
+        self.disconnected_at = None
+        LOGGER.info('%s: Reconnected in %.3f seconds', self.__class__.__name__, downtime)
+
+    async def run(self, loop: Callable[[], Awaitable[None]]) -> None:
+        """Calls the given coroutine function in endless loop reconnecting when
+        the connection is lost.
+        """
+
+        while True:
+            try:
+                await loop()
+            except CONNECTION_ERRORS as exc:
+                LOGGER.warning('%s: Connection lost (%r), reconnecting ...',
+                               self.__class__.__name__, exc)
+                await self.reconnect()
@@ -0,0 +1,599 @@
+"""Module contains worker processes which run the apps specified by WORKER_APPS. The core
+keeps the websocket, the REST API client and the directory of users, passes the messages with
+their envelopes to the apps in the worker processes and sends the replies of the apps. The core
+and the workers exchange messages over unix sockets.
+
+The worker is started by the core as `python -m meeseeks.workers APP SOCKET [CPU]`.
+"""
+
+import asyncio
+import importlib
+import itertools
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import astuple
+from typing import Any, Awaitable, Callable, cast
+
+from aiohttp import ClientSession
+
+from meeseeks import codec, settings
+from meeseeks.backoff import Backoff
+from meeseeks.context import ChangedRoomMessageCtx
+from meeseeks.core import MeeseeksCore
+from meeseeks.envelope import Envelope
+from meeseeks.exceptions import AbortCommandExecution, BadConfigure, WorkerError
+from meeseeks.leader import LeaderElector
+from meeseeks.logger import LOGGER
+from meeseeks.outbox import PRIORITY_BULK
+from meeseeks.restapi import create_client_session
+from meeseeks.scheduler import JobStore, Scheduler
+from meeseeks.type import CommandMethod
+
+_HEADER = struct.Struct('!I')
+
+# Methods of the core which the apps in the workers may call
+_CORE_METHODS = ('write_msg', 'add_reaction', )
+
+CallHandler = Callable[[str, list[Any]], Awaitable[Any]]
+
+
+def parse_worker_apps(value: str) -> dict[str, int | None]:
+    """Return apps from the comma-separated list of WORKER_APPS with the numbers of CPUs
+    the workers are pinned to. Each app is specified as 'path' or 'path:cpu'.
+    """
+
+    worker_apps: dict[str, int | None] = {}
+    for item in value.split(','):
+        path, _, cpu = item.strip().partition(':')
+        if not path:
+            continue
+
+        try:
+            worker_apps[path] = int(cpu) if cpu else None
+        except ValueError as exc:
+            raise BadConfigure(f'Wrong CPU of {path} in WORKER_APPS: {cpu!r}') from exc
+
+    return worker_apps
+
+
+def _import_class(path: str) -> Any:
+    """Return class by the dotted path to it. """
+
+    module_name, _, class_name = path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def dump_ctx(ctx: ChangedRoomMessageCtx) -> dict[str, Any]:
+    """Return the room message context as a JSON-serializable dict. """
+
+    return {
+        'message': ctx.message,
+        'room_options': ctx.room_options,
+        'fresh': ctx.fresh_msg_date,
+        'envelope': astuple(ctx.envelope) if ctx.envelope is not None else None,
+    }
+
+
+def load_ctx(data: dict[str, Any]) -> ChangedRoomMessageCtx:
+    """Return the room message context dumped by dump_ctx. """
+
+    ctx: ChangedRoomMessageCtx = ChangedRoomMessageCtx()
+    ctx.method = 'changed'
+    ctx.message = data['message']
+    ctx.room_options = data['room_options']
+    ctx.msg = ctx.message['msg']
+    ctx.fresh_msg_date = data['fresh']
+    if data['envelope'] is not None:
+        mentioned, text, command, arguments, direct = data['envelope']
+        ctx.envelope = Envelope(mentioned, text, command, tuple(arguments), direct)
+
+    return ctx
+
+
+class Channel:
+    """Duplex channel between the core and a worker over a stream. Each message is a JSON
+    document prefixed by its length. Both sides call methods of each other, the calls of
+    the other side are handled concurrently.
+    """
+
+    def __init__(
+            self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+            handler: CallHandler,
+    ):
+        self._reader: asyncio.StreamReader = reader
+        self._writer: asyncio.StreamWriter = writer
+        self._handler: CallHandler = handler
+        self._calls: dict[int, asyncio.Future[Any]] = {}
+        self._call_ids: itertools.count = itertools.count()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        """Sends the message to the other side. """
+
+        data: bytes = codec.dumps(message).encode()
+        self._writer.write(_HEADER.pack(len(data)) + data)
+        await self._writer.drain()
+
+    async def _receive(self) -> dict[str, Any] | None:
+        """Return the next message or None if the other side closed the channel. """
+
+        try:
+            header: bytes = await self._reader.readexactly(_HEADER.size)
+            (size, ) = _HEADER.unpack(header)
+            message: dict[str, Any] = codec.loads(await self._reader.readexactly(size))
+        except (asyncio.IncompleteReadError, ConnectionError, ):
+            return None
+
+        return message
+
+    async def call(self, method: str, *args: Any) -> Any:
+        """Calls the method of the other side and returns its result. """
+
+        call_id: int = next(self._call_ids)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = future
+        try:
+            await self._send({'call': call_id, 'method': method, 'args': args})
+            return await future
+        finally:
+            del self._calls[call_id]
+
+    async def _answer(self, message: dict[str, Any]) -> None:
+        """Handles the call of the other side and sends the result back. """
+
+        reply: dict[str, Any] = {'reply': message['call']}
+        try:
+            reply['result'] = await self._handler(message['method'], message['args'])
+        except AbortCommandExecution as exc:
+            reply['abort'] = str(exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception('%s: Failed to handle call of "%s"',
+                             self.__class__.__name__, message['method'])
+            reply['error'] = f'{exc.__class__.__name__}: {exc}'
+
+        await self._send(reply)
+
+    def _resolve(self, message: dict[str, Any]) -> None:
+        """Passes the reply of the other side to the call waiting for it. """
+
+        future: asyncio.Future[Any] | None = self._calls.get(message['reply'])
+        if future is None or future.done():
+            return
+
+        if 'error' in message:
+            future.set_exception(WorkerError(message['error']))
+        elif 'abort' in message:
+            future.set_exception(AbortCommandExecution(message['abort']))
+        else:
+            future.set_result(message.get('result'))
+
+    async def serve(self) -> None:
+        """Receives messages until the other side closes the channel. The calls which are
+        waiting for replies fail after that.
+        """
+
+        try:
+            while (message := await self._receive()) is not None:
+                if 'reply' in message:
+                    self._resolve(message)
+                    continue
+
+                task: asyncio.Task = asyncio.create_task(self._answer(message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            for future in self._calls.values():
+                if not future.done():
+                    future.set_exception(WorkerError('Channel is closed'))
+
+    async def close(self) -> None:
+        """Closes the channel. """
+
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class _RemoteObject:
+    """Proxy of the object of the core. Calls of its public methods are passed to the core. """
+
+    def __init__(self, channel: Channel, target: str):
+        self._channel: Channel = channel
+        self._target: str = target
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._channel.call(self._target, name, args, kwargs)
+
+        return call
+
+
+class _RemoteElector(LeaderElector):
+    """Leader election of the core. The worker is the leader if the core is. """
+
+    def __init__(self, channel: Channel):
+        super().__init__()
+
+        self._elector: _RemoteObject = _RemoteObject(channel, 'leader')
+
+    async def _acquire(self) -> bool:
+        return bool(await self._elector.try_acquire())
+
+
+class RemoteRestAPI(_RemoteObject):
+    """Proxy of the REST API client of the core. """
+
+    def __init__(self, channel: Channel, restapi_class: str = ''):
+        super().__init__(channel, f'restapi:{restapi_class}' if restapi_class else 'restapi')
+
+    def specialize(self, restapi_class: type) -> 'RemoteRestAPI':
+        """Return proxy of the client of the given class, which the core creates by
+        specializing its own client.
+        """
+
+        return RemoteRestAPI(
+            self._channel, f'{restapi_class.__module__}.{restapi_class.__qualname__}',
+        )
+
+
+class _WorkerApp(MeeseeksCore):  # pylint: disable=abstract-method
+    """Base of the app running in the worker process. The messages and the reactions of
+    the app are sent by the core over its transport and its queue of outbound messages.
+    """
+
+    _core: _RemoteObject
+
+    async def _write_msg(
+            self, text: str, rid: str, priority: int = PRIORITY_BULK, transport: str | None = None,
+    ) -> dict[str, Any]:
+        """Sends message to chat through the core. """
+
+        return cast(dict[str, Any], await self._core.write_msg(text, rid, priority, transport))
+
+    async def _add_reaction(
+            self, msg_id: str, emoji: str, should_react: bool, transport: str | None = None,
+    ) -> dict[str, Any]:
+        """Add or remove reaction on message in chat through the core. """
+
+        return cast(dict[str, Any], await self._core.add_reaction(
+            msg_id, emoji, should_react, transport,
+        ))
+
+
+class _RemoteCommand:
+    """Command of the app running in the worker. """
+
+    def __init__(self, name: str, description: str | None, permissions: list[str] | None):
+        self.command_name: str = name
+        self.command_description: str | None = description
+        self.permissions: list[str] | None = permissions
+
+
+class RemoteApp(MeeseeksCore):
+    """App running in the worker process. Messages and commands are passed to the worker,
+    which calls the REST API client, the directory of users, the leader election and
+    the sending of messages of the core.
+    """
+
+    def __init__(self, path: str, cpu: int | None = None, **kwargs: Any):
+        super().__init__()
+
+        self.__dict__.update(kwargs)
+
+        # The app is not imported in the core, its name is reported by the worker
+        self.app_name: str = path
+        self.path: str = path
+        self._cpu: int | None = cpu
+        self._channel: Channel | None = None
+        self._command_methods: list[CommandMethod] = []
+        self._processes: bool = False
+        self._restapis: dict[str, Any] = {}
+        self._serving: asyncio.Task | None = None
+        self._supervising: asyncio.Task | None = None
+        self._worker: asyncio.subprocess.Process | None = None
+
+    def get_command_methods(self) -> list[CommandMethod]:
+        """Return commands of the app reported by the worker. """
+
+        return self._command_methods
+
+    def _get_target(self, target: str) -> Any:
+        """Return the object of the core the worker calls. """
+
+        if target == 'restapi':
+            return self._restapi
+
+        if target.startswith('restapi:'):
+            if target not in self._restapis:
+                self._restapis[target] = self._restapi.specialize(
+                    _import_class(target.partition(':')[2]),
+                )
+
+            return self._restapis[target]
+
+        if target == 'user_directory':
+            return self._user_directory
+
+        if target == 'leader':
+            return self._leader
+
+        raise WorkerError(f'Unknown target {target!r}')
+
+    async def _handle_call(self, target: str, args: list[Any]) -> Any:
+        """Calls the method of the core on request of the worker. """
+
+        name, call_args, call_kwargs = args
+        if name.startswith('_'):
+            raise WorkerError(f'Method {name!r} is private')
+
+        if target == 'core':
+            if name not in _CORE_METHODS:
+                raise WorkerError(f'Unknown method {name!r} of core')
+
+            name = f'_{name}'
+            return await getattr(self, name)(*call_args, **call_kwargs)
+
+        return await getattr(self._get_target(target), name)(*call_args, **call_kwargs)
+
+    async def _start(self) -> None:
+        """Starts the worker process and sets the app up in it. """
+
+        socket_dir: str = tempfile.mkdtemp(prefix='meeseeks-')
+        socket_path: str = os.path.join(socket_dir, 'worker.sock')
+        connected: asyncio.Future[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+        def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            if connected.done():
+                writer.close()
+            else:
+                connected.set_result((reader, writer, ))
+
+        server: asyncio.AbstractServer = await asyncio.start_unix_server(on_connect, socket_path)
+        try:
+            cpu: list[str] = [str(self._cpu)] if self._cpu is not None else []
+            self._worker = await asyncio.create_subprocess_exec(
+                sys.executable, '-m', 'meeseeks.workers', self.path, socket_path, *cpu,
+            )
+            reader, writer = await asyncio.wait_for(connected, settings.WORKER_START_TIMEOUT)
+        finally:
+            server.close()
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
+        # Messages and commands are passed to the worker only after its app is set up
+        channel: Channel = Channel(reader, writer, self._handle_call)
+        self._serving = asyncio.create_task(channel.serve())
+        try:
+            app: dict[str, Any] = await asyncio.wait_for(
+                channel.call('setup', self._user_id), settings.WORKER_START_TIMEOUT,
+            )
+        except BaseException:
+            await channel.close()
+            raise
+
+        self.app_name = app['app_name']
+        self._command_methods = [
+            cast(CommandMethod, _RemoteCommand(*command)) for command in app['commands']
+        ]
+        self._processes = app['processes']
+        self._channel = channel
+        LOGGER.info('%s: Started %s in worker process %s',
+                    self.__class__.__name__, self.app_name, self._worker.pid)
+
+    async def _stop(self) -> None:
+        """Stops the worker process. The worker exits when the channel is closed. """
+
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+        if self._serving is not None:
+            await self._serving
+
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(self._worker.wait(), settings.WORKER_START_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._worker.kill()
+                await self._worker.wait()
+
+    async def _supervise(self) -> None:
+        """Restarts the worker process when it exits. The delay between restarts grows
+        while the worker keeps exiting soon after its start.
+        """
+
+        backoff: Backoff = Backoff(
+            settings.WORKER_RESTART_BACKOFF_BASE, settings.WORKER_RESTART_BACKOFF_MAX,
+        )
+        while True:
+            started_at: float = time.monotonic()
+            # Waiting does not cancel the channel when the supervision is cancelled
+            await asyncio.wait([cast(asyncio.Task, self._serving)])
+            if time.monotonic() - started_at > settings.WORKER_RESTART_BACKOFF_MAX:
+                backoff.reset()
+
+            await self._stop()
+            LOGGER.error('%s: Worker process of %s exited with code %s',
+                         self.__class__.__name__, self.app_name,
+                         cast(asyncio.subprocess.Process, self._worker).returncode)
+            while True:
+                await asyncio.sleep(backoff.next_delay())
+                try:
+                    await self._start()
+                    break
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception('%s: Failed to restart worker process of %s',
+                                     self.__class__.__name__, self.app_name)
+                    await self._stop()
+
+    async def setup(self) -> None:
+        """Starts the worker process and sets the app up in it. The worker is restarted
+        if it exits before the teardown.
+        """
+
+        try:
+            await self._start()
+        except BaseException:
+            await self._stop()
+            raise
+
+        self._supervising = asyncio.create_task(self._supervise())
+
+    async def process(self, ctx: ChangedRoomMessageCtx) -> None:
+        """Passes the message to the app in the worker if the app processes messages. """
+
+        if self._channel is not None and self._processes:
+            await self._channel.call('process', dump_ctx(ctx))
+
+    async def process_command(
+            self, ctx: ChangedRoomMessageCtx, command_method: CommandMethod,
+    ) -> None:
+        """Runs the command of the app in the worker. """
+
+        if self._channel is None:
+            raise WorkerError(f'Worker process of {self.app_name} is restarting')
+
+        await self._channel.call('command', dump_ctx(ctx), command_method.command_name)
+
+    async def teardown(self) -> None:
+        """Stops the worker process. """
+
+        if self._supervising is not None:
+            self._supervising.cancel()
+            try:
+                await self._supervising
+            except asyncio.CancelledError:
+                pass
+
+        await self._stop()
+
+
+class Worker:
+    """Runs the app in the worker process on requests of the core. """
+
+    def __init__(
+            self, path: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+            http_session: ClientSession,
+    ):
+        self._path: str = path
+        self._channel: Channel = Channel(reader, writer, self._handle_call)
+        self._http_session: ClientSession = http_session
+        self._app: Any = None
+        self._scheduler: Scheduler | None = None
+
+    @staticmethod
+    def _get_store_path(app_name: str) -> str:
+        """Return job store of the app, which is kept next to the job store of the core. """
+
+        if not settings.SCHEDULER_STORE:
+            return ''
+
+        root, ext = os.path.splitext(settings.SCHEDULER_STORE)
+        return f'{root}-{app_name}{ext}'
+
+    async def _setup(self, user_id: str) -> dict[str, Any]:
+        """Creates the app, sets it up and returns its name, its commands and whether
+        it processes messages. The app sends its messages and reactions through the core.
+        """
+
+        imported_class: Any = _import_class(self._path)
+        app_class: Any = type(imported_class.__name__, (_WorkerApp, imported_class, ), {
+            '__module__': imported_class.__module__,
+        })
+        leader: _RemoteElector = _RemoteElector(self._channel)
+        self._scheduler = Scheduler(
+            JobStore(self._get_store_path(app_class.app_name)),
+            leader,
+            settings.SCHEDULER_MAX_CONCURRENCY,
+            settings.SCHEDULER_MISFIRE_GRACE,
+            settings.SCHEDULER_COALESCE,
+        )
+        self._app = app_class(
+            _user_id=user_id,
+            _http_session=self._http_session,
+            _restapi=RemoteRestAPI(self._channel),
+            _user_directory=_RemoteObject(self._channel, 'user_directory'),
+            _leader=leader,
+            _scheduler=self._scheduler,
+            _core=_RemoteObject(self._channel, 'core'),
+        )
+        MeeseeksCore.check_app_name(self._app)
+        await self._app.setup()
+        self._scheduler.start()
+
+        return {
+            'app_name': self._app.app_name,
+            'commands': [
+                [method.command_name, method.command_description, method.permissions]
+                for method in self._app.get_command_methods()
+            ],
+            'processes': app_class.process is not MeeseeksCore.process,
+        }
+
+    def _get_command_method(self, name: str) -> CommandMethod:
+        """Return command method of the app by its name. """
+
+        for command_method in self._app.get_command_methods():
+            if command_method.command_name == name:
+                return cast(CommandMethod, command_method)
+
+        raise WorkerError(f'{self._app.app_name} has no command {name!r}')
+
+    async def _handle_call(self, method: str, args: list[Any]) -> Any:
+        """Sets the app up, passes the message or runs the command on request of the core. """
+
+        if method == 'setup':
+            return await self._setup(*args)
+
+        if method == 'process':
+            return await self._app.process(load_ctx(args[0]))
+
+        if method == 'command':
+            return await self._app.process_command(
+                load_ctx(args[0]), self._get_command_method(args[1]),
+            )
+
+        raise WorkerError(f'Unknown method {method!r}')
+
+    async def run(self) -> None:
+        """Serves the core until it closes the connection. """
+
+        try:
+            await self._channel.serve()
+        finally:
+            if self._scheduler is not None:
+                await self._scheduler.stop()
+
+            await self._channel.close()
+
+
+async def run_worker(path: str, socket_path: str) -> None:
+    """Connects to the core and runs the app until the core closes the connection. """
+
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    async with create_client_session() as http_session:
+        await Worker(path, reader, writer, http_session).run()
+
+
+def main(argv: list[str]) -> None:
+    """Entry point of the worker process. """
+
+    path, socket_path, *cpu = argv
+    if cpu and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {int(cpu[0])})
+
+    asyncio.run(run_worker(path, socket_path))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+"""Module contains command for replaying frames recorded from Rocket.Chat against Meeseeks apps. """
+
+import argparse
+import asyncio
+import time
+
+from websockets import WebSocketClientProtocol  # pylint: disable=no-name-in-module
+
+from meeseeks import settings
+from meeseeks.core import MeeseeksCore
+from meeseeks.logger import LOGGER
+from meeseeks.recorder import FrameReplayer, ReplayFinished, ReplayWebSocket
+
+
+async def replay(path: str, realtime: bool, user_id: str = '') -> None:
+    """Runs the apps receiving frames from the recording instead of Rocket.Chat.
+    The recorded id of the bot is replaced by the given one if there is one.
+    """
+
+    core: MeeseeksCore = MeeseeksCore()
+    replayer = FrameReplayer(path, realtime, user_id)
+    frames = replayer.frames()
+
+    async def connect(_url: str) -> WebSocketClientProtocol:
+        return ReplayWebSocket(frames, core.join)
+
+    started_at: float = time.monotonic()
+    try:
+        await core.run(connect)
+    except ReplayFinished:
+        pass
+
+    elapsed: float = time.monotonic() - started_at
+    LOGGER.info('Replayed %s frames in %.3f seconds (%.1f frames per second)',
+                replayer.replayed, elapsed, replayer.replayed / elapsed)
+
+
+def main() -> None:
+    """Entry point. """
+
+    parser = argparse.ArgumentParser(description='Replay frames recorded from Rocket.Chat')
+    parser.add_argument('path', help='recording made with RECORD_FRAMES')
+    parser.add_argument('--realtime', action='store_true',
+                        help='keep the recorded intervals between frames')
+    parser.add_argument('--api', help='address of Rocket.Chat REST API, by default '
+                                      'the mock server from tests is started')
+    args = parser.parse_args()
+
+    mock_proc = None
+    user_id = ''
+    if args.api:
+        settings.ROCKET_CHAT_API = args.api
+    else:
+        # pylint: disable=import-outside-toplevel
+        from tests.mock_rocket_chat import run_mock_server
+        from tests.server_responses import USERS_LIST_GET_SUCCESS_RESPONSE
+
+        # The bot is the user the mock server knows, whatever user recorded the frames
+        user_id = USERS_LIST_GET_SUCCESS_RESPONSE['users'][0]['_id']
+        settings.ROCKET_CHAT_API, mock_proc = run_mock_server()
+
+    try:
+        asyncio.run(replay(args.path, args.realtime, user_id))
+    finally:
+        if mock_proc is not None:
+            mock_proc.terminate()
+            mock_proc.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -49,6 +49,9 @@ class MockRocketChat(BaseHTTPRequestHandler):
                 INTERNAL_SERVER_ERROR_RESPONSE,
                 status_code=500,
             ),
+            '/users.info_without_permissons': lambda: self._send_response(
+                USER_INFO_GET_SUCCESS_RESPONSE_WITHOUT_BOT_PERMISSIONS,
+            ),
             '/users.list_without_permissons': lambda: self._send_response(
                 USERS_LIST_GET_SUCCESS_RESPONSE_WITHOUT_BOT_PERMISSIONS,
             ),
@@ -76,6 +79,9 @@ class MockRocketChat(BaseHTTPRequestHandler):
             '/groups.create': lambda: self._send_response(GROUPS_CREATE_POST_SUCCESS_RESPONSE),
             '/groups.delete': lambda: self._send_response(GROUPS_DELETE_POST_SUCCESS_RESPONSE),
             '/groups.invite': lambda: self._send_response(GROUPS_INVITE_POST_SUCCESS_RESPONSE),
+            '/users.setStatus': lambda: self._send_response(
+                USERS_SET_STATUS_POST_SUCCESS_RESPONSE,
+            ),
         }
 
         for endpoint, process_request in endpoints.items():
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+
+"""Module contains asyncio implementation of Rocket.Chat mock server which speaks both
+REST API and the subset of DDP used by Meeseeks. It is intended for load tests of the bot.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+from meeseeks import defaults
+
+API_PREFIX = '/api/v1'
+
+BOT_USER_ID = 'ucPgkuQptW4TTqYH2'
+
+BOT_USERNAME = 'meeseeks'
+
+GENERAL_ROOM_ID = 'GENERAL'
+
+
+def _isoformat(timestamp):
+    """Return timestamp in the format used by Rocket.Chat REST API. """
+
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec='milliseconds')
+
+
+def generate_users(count, bot_username=BOT_USERNAME):
+    """Return the bot and the given number of synthetic users by their ids. """
+
+    created_at = _isoformat(time.time())
+    users = {BOT_USER_ID: {
+        '_id': BOT_USER_ID,
+        'username': bot_username,
+        'name': 'Mr.Meeseeks',
+        'type': 'bot',
+        'status': 'online',
+        'active': True,
+        'roles': ['bot', 'admin'],
+        'createdAt': created_at,
+        '_updatedAt': created_at,
+    }}
+    for i in range(count):
+        user_id = f'user{i:013d}'
+        users[user_id] = {
+            '_id': user_id,
+            'username': f'user{i}',
+            'name': f'User {i}',
+            'type': 'user',
+            'status': 'online' if i % 3 else 'offline',
+            'active': True,
+            'roles': ['user', 'admin'] if i == 0 else ['user'],
+            'emails': [{'address': f'user{i}@example.com', 'verified': True}],
+            'createdAt': created_at,
+            '_updatedAt': created_at,
+            'utcOffset': 3,
+        }
+
+    return users
+
+
+def generate_rooms(count, users):
+    """Return #general and the given number of synthetic channels by their ids. """
+
+    user_ids = list(users)
+    rooms = {GENERAL_ROOM_ID: {
+        '_id': GENERAL_ROOM_ID,
+        'name': 'general',
+        't': 'c',
+        'default': True,
+        'members': user_ids,
+    }}
+    for i in range(count):
+        room_id = f'room{i:013d}'
+        rooms[room_id] = {
+            '_id': room_id,
+            'name': f'room{i}',
+            't': 'p' if i % 2 else 'c',
+            'members': user_ids[i::max(count, 1)] + [BOT_USER_ID],
+        }
+
+    return rooms
+
+
+class MockRocketChatServer:
+    """Rocket.Chat mock server. Every response is delayed for the given latency (in seconds),
+    every Nth request or DDP method call is rejected because of the rate limit if
+    rate_limit_every is not 0.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            users=100,
+            rooms=10,
+            latency=0.0,
+            rate_limit_every=0,
+            retry_after=1,
+            bot_username=BOT_USERNAME,
+    ):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.bot_username = bot_username
+
+        self.users = generate_users(users, bot_username)
+        self.rooms = generate_rooms(rooms, self.users)
+        self.messages = []
+        self.requests = Counter()
+        self.rate_limited = 0
+
+        self._ids = itertools.count()
+        self._calls = itertools.count(1)
+        self._subscribers = set()
+        self._websockets = set()
+        self._new_message = asyncio.Condition()
+        self._subscribed = asyncio.Event()
+        self._runner = None
+        self._port = None
+
+    @property
+    def url(self):
+        """Return address of the server. """
+
+        return f'http://127.0.0.1:{self._port}'
+
+    @property
+    def api_url(self):
+        """Return address of REST API to be used as ROCKET_CHAT_API. """
+
+        return self.url + API_PREFIX
+
+    def _next_id(self):
+        """Return unique id in the format of Rocket.Chat ids. """
+
+        return f'mock{next(self._ids):013d}'
+
+    def _is_rate_limited(self):
+        """Check if the current request must be rejected because of the rate limit. """
+
+        if self.rate_limit_every and next(self._calls) % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            return True
+
+        return False
+
+    async def start(self, port=0):
+        """Starts the server on the given port or a free one. """
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/websocket', self._handle_websocket)
+        routes = {
+            ('POST', defaults.CHAT_MESSAGE_POST_REQUEST): self._post_message,
+            ('POST', defaults.CHAT_REACT_POST_REQUEST): self._success,
+            ('POST', defaults.GROUPS_CREATE_POST_REQUEST): self._create_group,
+            ('POST', defaults.GROUPS_DELETE_POST_REQUEST): self._success,
+            ('POST', defaults.GROUPS_INVITE_POST_REQUEST): self._success,
+            ('GET', defaults.GROUPS_MEMBERS_GET_REQUEST): self._get_group_members,
+            ('GET', defaults.GROUP_INFO_GET_REQUEST): self._get_group_info,
+            ('GET', defaults.ROOMS_GET_REQUEST): self._get_rooms,
+            ('GET', defaults.USERS_LIST_REQUEST): self._get_users,
+            ('GET', defaults.USERS_INFO_REQUEST): self._get_user_info,
+            ('POST', defaults.USERS_SET_STATUS_REQUEST): self._success,
+        }
+        for (method, path), handler in routes.items():
+            app.router.add_route(method, API_PREFIX + path, handler)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', port)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        """Closes all connections and stops the server. """
+
+        for websocket in list(self._websockets):
+            await websocket.close()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        """Counts requests, injects latency and rejects requests because of the rate limit. """
+
+        if request.path == '/websocket':
+            return await handler(request)
+
+        self.requests[request.path[len(API_PREFIX):]] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self._is_rate_limited():
+            reset = int((time.time() + self.retry_after) * 1000)
+            return web.json_response({
+                'success': False,
+                'error': 'Error, too many requests. Please slow down.',
+            }, status=429, headers={
+                'Retry-After': str(self.retry_after),
+                'X-RateLimit-Limit': str(self.rate_limit_every),
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': str(reset),
+            })
+
+        return await handler(request)
+
+    @staticmethod
+    async def _success(_request):
+        """Responds with success to requests which change nothing. """
+
+        return web.json_response({'success': True})
+
+    def _create_message(self, rid, text, user_id, **fields):
+        """Creates message and notifies the subscribers. """
+
+        user = self.users[user_id]
+        now = time.time()
+        message = {
+            '_id': self._next_id(),
+            'rid': rid,
+            'msg': text,
+            'ts': {'$date': int(now * 1000)},
+            'u': {'_id': user_id, 'username': user['username'], 'name': user['name']},
+            '_updatedAt': {'$date': int(now * 1000)},
+            **fields,
+        }
+        self.messages.append(message)
+        for websocket in list(self._subscribers):
+            asyncio.create_task(self._send(websocket, self.message_frame(message)))
+
+        return message
+
+    async def _notify_new_message(self):
+        """Wakes up coroutines which wait for messages. """
+
+        async with self._new_message:
+            self._new_message.notify_all()
+
+    def message_frame(self, message):
+        """Return 'changed' event about the given message. """
+
+        room = self.rooms.get(message['rid'], {})
+        room_type = room.get('t', 'd')
+        options = {'roomParticipant': True, 'roomType': room_type}
+        if 'name' in room:
+            options['roomName'] = room['name']
+
+        return {
+            'msg': 'changed',
+            'collection': 'stream-room-messages',
+            'id': 'id',
+            'fields': {'eventName': '__my_messages__', 'args': [message, options]},
+        }
+
+    async def push_message(self, text, rid=GENERAL_ROOM_ID, user_id=None):
+        """Sends message from the given user or the first synthetic one to the subscribers. """
+
+        if user_id is None:
+            user_id = next(user for user in self.users if user != BOT_USER_ID)
+
+        return self._create_message(rid, text, user_id)
+
+    async def wait_for_messages(self, count, user_id=BOT_USER_ID, timeout=10):
+        """Waits until the given user sends the given number of messages. """
+
+        async def wait():
+            async with self._new_message:
+                await self._new_message.wait_for(lambda: len(self.bot_messages(user_id)) >= count)
+
+        await asyncio.wait_for(wait(), timeout)
+
+        return self.bot_messages(user_id)
+
+    async def wait_for_subscribers(self, timeout=10):
+        """Waits until a client subscribes to the messages. """
+
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    def bot_messages(self, user_id=BOT_USER_ID):
+        """Return messages sent by the given user. """
+
+        return [message for message in self.messages if message['u']['_id'] == user_id]
+
+    async def _post_message(self, request):
+        """Handles chat.postMessage request. """
+
+        body = await request.json()
+        room_id = body.get('channel', GENERAL_ROOM_ID)
+        fields = {'alias': body.get('alias', ''), 'attachments': body.get('attachments', [])}
+        message = self._create_message(room_id, body.get('text', ''), BOT_USER_ID, **fields)
+        await self._notify_new_message()
+
+        return web.json_response({
+            'ts': message['ts']['$date'],
+            'channel': room_id,
+            'message': message,
+            'success': True,
+        })
+
+    async def _create_group(self, request):
+        """Handles groups.create request. """
+
+        body = await request.json()
+        group = {'_id': self._next_id(), 'name': body['name'], 't': 'p',
+                 'members': [BOT_USER_ID]}
+        self.rooms[group['_id']] = group
+
+        return web.json_response({'group': group, 'success': True})
+
+    def _get_group(self, request):
+        """Return group with the name passed in the query or None. """
+
+        name = request.query.get('roomName')
+        return next((room for room in self.rooms.values() if room['name'] == name), None)
+
+    async def _get_group_members(self, request):
+        """Handles groups.members request. """
+
+        group = self._get_group(request)
+        if group is None:
+            return web.json_response({'success': False}, status=400)
+
+        members = [self.users[user_id] for user_id in group['members']]
+        return web.json_response({
+            'members': members, 'count': len(members), 'offset': 0, 'total': len(members),
+            'success': True,
+        })
+
+    async def _get_group_info(self, request):
+        """Handles groups.info request. """
+
+        group = self._get_group(request)
+        if group is None:
+            return web.json_response({'success': False}, status=400)
+
+        return web.json_response({'group': group, 'success': True})
+
+    async def _get_rooms(self, _request):
+        """Handles rooms.get request. """
+
+        rooms = [{key: value for key, value in room.items() if key != 'members'}
+                 for room in self.rooms.values()]
+        return web.json_response({'update': rooms, 'remove': [], 'success': True})
+
+    async def _get_users(self, request):
+        """Handles users.list request. The query is ignored. """
+
+        count = int(request.query.get('count', 50))
+        offset = int(request.query.get('offset', 0))
+        users = list(self.users.values())[offset:offset + count]
+
+        return web.json_response({
+            'users': users, 'count': len(users), 'offset': offset, 'total': len(self.users),
+            'success': True,
+        })
+
+    async def _get_user_info(self, request):
+        """Handles users.info request. """
+
+        user = self.users.get(request.query.get('userId', ''))
+        if user is None:
+            return web.json_response({'success': False}, status=400)
+
+        return web.json_response({'user': user, 'success': True})
+
+    @staticmethod
+    async def _send(websocket, frame):
+        """Sends DDP frame ignoring closed connections. """
+
+        if not websocket.closed:
+            await websocket.send_str(json.dumps(frame))
+
+    async def _call_method(self, websocket, frame):
+        """Responds to DDP method call. """
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        method, params = frame.get('method'), frame.get('params', [])
+        response = {'msg': 'result', 'id': frame.get('id')}
+        if method == 'login':
+            response['result'] = {
+                'id': BOT_USER_ID,
+                'token': params[0].get('resume', 'mock-token'),
+                'tokenExpires': {'$date': int((time.time() + 86400) * 1000)},
+                'type': 'resume' if 'resume' in params[0] else 'password',
+            }
+        elif self._is_rate_limited():
+            response['error'] = {
+                'error': 'too-many-requests',
+                'reason': 'Error, too many requests. Please slow down.',
+                'details': {'timeToReset': self.retry_after * 1000},
+            }
+        elif method == 'sendMessage':
+            message = self._create_message(params[0]['rid'], params[0]['msg'], BOT_USER_ID)
+            response['result'] = message
+            await self._notify_new_message()
+        elif method == 'setReaction':
+            response['result'] = None
+        else:
+            response['error'] = {'error': 404, 'reason': f'Method \'{method}\' not found'}
+
+        await self._send(websocket, response)
+
+    async def _handle_frame(self, websocket, frame):
+        """Responds to DDP frame. """
+
+        msg = frame.get('msg')
+        if msg == 'connect':
+            await self._send(websocket, {'msg': 'connected', 'session': self._next_id()})
+        elif msg == 'ping':
+            pong = {'msg': 'pong'}
+            if 'id' in frame:
+                pong['id'] = frame['id']
+            await self._send(websocket, pong)
+        elif msg == 'sub':
+            if frame.get('name') == 'stream-room-messages':
+                self._subscribers.add(websocket)
+                self._subscribed.set()
+            await self._send(websocket, {'msg': 'ready', 'subs': [frame.get('id')]})
+        elif msg == 'method':
+            asyncio.create_task(self._call_method(websocket, frame))
+
+    async def _handle_websocket(self, request):
+        """Handles DDP connection. """
+
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self._websockets.add(websocket)
+        try:
+            async for message in websocket:
+                if message.type == WSMsgType.TEXT:
+                    await self._handle_frame(websocket, json.loads(message.data))
+        finally:
+            self._websockets.discard(websocket)
+            self._subscribers.discard(websocket)
+
+        return websocket
+
+
+async def _serve(args):
+    """Runs the server sending commands to the bot with the given rate. """
+
+    server = MockRocketChatServer(
+        users=args.users,
+        rooms=args.rooms,
+        latency=args.latency,
+        rate_limit_every=args.rate_limit_every,
+        bot_username=args.bot_username,
+    )
+    await server.start(args.port)
+    sys.stderr.write(f'The server is available at {server.api_url}\n')
+    try:
+        while True:
+            if args.load:
+                await server.push_message(f'@{args.bot_username} {args.command}')
+                await asyncio.sleep(1 / args.load)
+            else:
+                await asyncio.sleep(3600)
+    finally:
+        await server.stop()
+
+
+def main():
+    """Entry point. """
+
+    parser = argparse.ArgumentParser(description='Asyncio mock server Rocket.Chat')
+    parser.add_argument('port', metavar='PORT', type=int,
+                        help='port that mock server will listen on')
+    parser.add_argument('--users', type=int, default=100, help='number of synthetic users')
+    parser.add_argument('--rooms', type=int, default=10, help='number of synthetic rooms')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='delay (in seconds) of every response')
+    parser.add_argument('--rate-limit-every', type=int, default=0,
+                        help='reject every Nth request with 429')
+    parser.add_argument('--bot-username', default=BOT_USERNAME, help='user name of the bot')
+    parser.add_argument('--load', type=float, default=0,
+                        help='number of commands per second sent to the bot')
+    parser.add_argument('--command', default='help', help='command sent to the bot')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        sys.stderr.write('Server stopped\n')
+
+
+if __name__ == '__main__':
+    main()
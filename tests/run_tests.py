@@ -2,13 +2,39 @@
 
 import unittest
 
+from tests.test_benchmarks import TestBenchmarkRunner
+from tests.test_cache import TestLatestVersions, TestSingleFlight, TestTTLCache
+from tests.test_codec import TestCodec
 from tests.test_commands_base import TestCommunication, TestCommandsBase, TestDialogsBase
+from tests.test_commands_decorators import TestCommandDecorator
 from tests.test_commands_mixins import TestCommandsMixin
-from tests.test_context import TestContext, TestContextRoom, TestContextUser
+from tests.test_context import (
+    TestChangedRoomMessageCtx,
+    TestContext,
+    TestContextRoom,
+    TestContextUser,
+    TestUserChangedCtx,
+)
 from tests.test_core import TestMeeseeksCore
+from tests.test_directory import TestUserDirectory
+from tests.test_dispatcher import TestDispatcher
+from tests.test_envelope import TestEnvelope
+from tests.test_filters import TestFrameFilter
+from tests.test_keepalive import TestKeepalive
+from tests.test_leader import TestLeaderElector
 from tests.test_meeseeks_app import TestMeeseeksBaseApp
+from tests.test_metrics import TestRegistry
+from tests.test_mock_server import TestMockRocketChatServer
+from tests.test_outbox import TestOutbox
 from tests.test_restapi import TestRestAPI
+from tests.test_recorder import TestFrameRecorder
+from tests.test_request import TestRequestLocal
+from tests.test_router import TestCommandRouter
+from tests.test_rtapi import TestRealTimeAPI
+from tests.test_scheduler import TestScheduler
 from tests.test_serializers import TestContextFactory
+from tests.test_supervisor import TestConnectionSupervisor
+from tests.test_workers import TestWorkers
 
 if __name__ == '__main__':
     unittest.main()
@@ -161,6 +161,8 @@ ROOMS_GET_SUCCESS_RESPONSE = {
     'success': True
 }
 
+USERS_SET_STATUS_POST_SUCCESS_RESPONSE = {'success': True}
+
 USER_INFO_GET_SUCCESS_RESPONSE = {
     'user': {
         '_id': 'X2gR7ZHZdmsrTSDRK',
@@ -201,6 +203,17 @@ USERS_LIST_GET_SUCCESS_RESPONSE = {
     'success': True
 }
 
+USER_INFO_GET_SUCCESS_RESPONSE_WITHOUT_BOT_PERMISSIONS = {
+    'user': {
+        '_id': 'X2gR7ZHZdmsrTSDRK',
+        'status': 'away',
+        'active': True,
+        'name': 'Test',
+        'username': 'test',
+    },
+    'success': True
+}
+
 USERS_LIST_GET_SUCCESS_RESPONSE_WITHOUT_BOT_PERMISSIONS = {
     'users': [{
         '_id': 'X2gR7ZHZdmsrTSDRK',
@@ -0,0 +1,41 @@
+from benchmarks.runner import Result, compare, measure
+from tests.base import BaseTestClass
+
+
+class TestBenchmarkRunner(BaseTestClass):
+    """Tests of runner of benchmarks. """
+
+    def test_measure(self):
+        """Test of success measuring of throughput and allocations. """
+
+        @self.async_case
+        async def body():
+            kept = []
+
+            async def step():
+                kept.append(bytearray(1024))
+
+            result = await measure('step', step, 100, 10)
+
+            self.assertEqual(result.messages, 100)
+            self.assertGreater(result.per_second, 0)
+            self.assertGreaterEqual(result.allocated, 1024)
+            self.assertGreaterEqual(result.retained, 1024)
+
+    def test_compare(self):
+        """Test of detecting regressions compared to the baseline. """
+
+        baseline = {
+            'decode': {'messages_per_second': 1000, 'allocated_bytes_per_message': 100},
+            'loop': {'messages_per_second': 100, 'allocated_bytes_per_message': 1000},
+        }
+        results = [
+            Result('decode', 950, 1, 105, 0),
+            Result('loop', 80, 1, 1200, 0),
+            Result('lookup', 10, 1, 10, 0),
+        ]
+
+        regressions = compare(results, baseline, 0.1)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(regression.startswith('loop: ') for regression in regressions))
@@ -0,0 +1,194 @@
+import asyncio
+from unittest import mock
+
+from meeseeks import RestAPI
+from meeseeks.cache import LatestVersions, SingleFlight, TTLCache
+from tests.base import BaseTestClass
+
+
+class TestTTLCache(BaseTestClass):
+    """Tests of TTLCache class. """
+
+    def test_get(self):
+        """Test of success get method. """
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('X2gR7ZHZdmsrTSDRK', {'roles': ['admin']})
+
+        self.assertEqual(cache.get('X2gR7ZHZdmsrTSDRK'), {'roles': ['admin']})
+        self.assertIsNone(cache.get('ucPgkuQptW4TTqYH2'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_get_expired(self):
+        """Test of get method when the value is expired. """
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        with mock.patch('time.monotonic', return_value=100):
+            cache.set('X2gR7ZHZdmsrTSDRK', {'roles': ['admin']})
+
+        with mock.patch('time.monotonic', return_value=161):
+            self.assertIsNone(cache.get('X2gR7ZHZdmsrTSDRK'))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_set_evicts_least_recently_used(self):
+        """Test of success set method when the cache is full. """
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('first', 1)
+        cache.set('second', 2)
+        cache.get('first')
+        cache.set('third', 3)
+
+        self.assertEqual(cache.get('first'), 1)
+        self.assertIsNone(cache.get('second'))
+        self.assertEqual(cache.get('third'), 3)
+
+    def test_invalidate(self):
+        """Test of success invalidate method. """
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('X2gR7ZHZdmsrTSDRK', {'roles': ['admin']})
+        cache.invalidate('X2gR7ZHZdmsrTSDRK')
+        cache.invalidate('ucPgkuQptW4TTqYH2')
+
+        self.assertIsNone(cache.get('X2gR7ZHZdmsrTSDRK'))
+
+    def test_restapi_get_user_info(self):
+        """Test of success get_user_info method of RestAPI with users cache. """
+
+        @self.async_case
+        async def body():
+            cache = TTLCache(maxsize=2, ttl=60)
+            restapi = RestAPI({}, users_cache=cache)
+            first_response = await restapi.get_user_info('X2gR7ZHZdmsrTSDRK')
+            with mock.patch('meeseeks.restapi.RestAPI.make_request') as make_request:
+                second_response = await restapi.get_user_info('X2gR7ZHZdmsrTSDRK')
+
+            make_request.assert_not_called()
+            self.assertIs(second_response, first_response)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestLatestVersions(BaseTestClass):
+    """Tests of LatestVersions class. """
+
+    def test_update(self):
+        """Test of success update method evicting the least recently updated key. """
+
+        versions = LatestVersions(2)
+
+        self.assertTrue(versions.update('a', 1))
+        self.assertTrue(versions.update('b', 3))
+        self.assertFalse(versions.update('a', 1))
+        self.assertTrue(versions.update('a', 2))
+        self.assertTrue(versions.update('c', 4))
+        self.assertIn('a', versions)
+        self.assertNotIn('b', versions)
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(versions.evicted_version, 3)
+
+    def test_update_evicted(self):
+        """Test of success update method for the evicted keys. Only the versions higher than
+        the versions of the evicted keys are new.
+        """
+
+        versions = LatestVersions(1)
+        versions.update('a', 5)
+        versions.update('b', 6)
+
+        self.assertFalse(versions.update('a', 5))
+        self.assertFalse(versions.update('c', 4))
+        self.assertTrue(versions.update('a', 7))
+
+
+class TestSingleFlight(BaseTestClass):
+    """Tests of SingleFlight class. """
+
+    def test_do(self):
+        """Test of success do method with concurrent calls with the same key. """
+
+        @self.async_case
+        async def body():
+            single_flight = SingleFlight()
+            calls = []
+
+            async def func():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return {'success': True}
+
+            results = await asyncio.gather(*(single_flight.do('key', func) for _ in range(3)))
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(results, [{'success': True}] * 3)
+            self.assertEqual((single_flight.calls, single_flight.collapsed), (1, 2))
+
+            await single_flight.do('key', func)
+            self.assertEqual(len(calls), 2)
+
+    def test_do_with_result_ttl(self):
+        """Test of success do method when results are kept after the call. """
+
+        @self.async_case
+        async def body():
+            single_flight = SingleFlight(result_ttl=60)
+            func = mock.AsyncMock(return_value={'success': True})
+            await single_flight.do('key', func)
+            await single_flight.do('key', func)
+
+            func.assert_awaited_once()
+            self.assertEqual(single_flight.collapsed, 1)
+
+    def test_fail_do(self):
+        """Test of failure do method. All concurrent callers receive the exception. """
+
+        @self.async_case
+        async def body():
+            single_flight = SingleFlight()
+
+            async def func():
+                await asyncio.sleep(0.01)
+                raise ValueError
+
+            results = await asyncio.gather(
+                single_flight.do('key', func),
+                single_flight.do('key', func),
+                return_exceptions=True,
+            )
+
+            self.assertIsInstance(results[0], ValueError)
+            self.assertIsInstance(results[1], ValueError)
+
+    def test_do_cancelled_caller(self):
+        """Test of success do method when the caller which made the call is cancelled.
+        The other callers receive the result.
+        """
+
+        @self.async_case
+        async def body():
+            single_flight = SingleFlight()
+
+            async def func():
+                await asyncio.sleep(0.05)
+                return {'success': True}
+
+            first = asyncio.create_task(single_flight.do('key', func))
+            second = asyncio.create_task(single_flight.do('key', func))
+            await asyncio.sleep(0.01)
+            first.cancel()
+
+            self.assertEqual(await second, {'success': True})
+            self.assertTrue(first.cancelled())
+
+    def test_restapi_make_request(self):
+        """Test of success make_request method of RestAPI with concurrent GET requests. """
+
+        @self.async_case
+        async def body():
+            single_flight = SingleFlight()
+            restapi = RestAPI({}, single_flight=single_flight)
+            results = await asyncio.gather(restapi.get_rooms(), restapi.get_rooms())
+
+            self.assertEqual(results, [{'general': 'GENERAL'}] * 2)
+            self.assertEqual((single_flight.calls, single_flight.collapsed), (1, 1))
@@ -0,0 +1,35 @@
+import json
+from unittest import mock
+
+from meeseeks.codec import get_codec
+from meeseeks.exceptions import BadConfigure
+from tests.base import BaseTestClass
+
+
+class TestCodec(BaseTestClass):
+    """Tests of selecting of JSON codec. """
+
+    def test_get_codec(self):
+        """Test of success get_codec function. Every codec decodes both str and bytes. """
+
+        for name in ('auto', 'json', 'orjson', ):
+            _, loads, dumps = get_codec(name)
+            frame = {'msg': 'changed', 'fields': {'args': ['привет', 1, None]}}
+
+            self.assertEqual(loads(dumps(frame)), frame)
+            self.assertEqual(loads(json.dumps(frame).encode()), frame)
+            self.assertIsInstance(dumps(frame), str)
+
+    @mock.patch('meeseeks.codec.HAS_ORJSON', False)
+    def test_get_codec_without_orjson(self):
+        """Test of falling back to the standard library when orjson is not installed. """
+
+        self.assertEqual(get_codec('auto')[0], 'json')
+        with self.assertRaises(BadConfigure):
+            get_codec('orjson')
+
+    def test_fail_get_codec(self):
+        """Test of failure get_codec function. """
+
+        with self.assertRaises(BadConfigure):
+            get_codec('yaml')
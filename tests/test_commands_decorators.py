@@ -0,0 +1,105 @@
+import asyncio
+import os
+import tempfile
+from unittest import mock
+
+from meeseeks import settings
+from meeseeks.commands.base import CommandsBase
+from meeseeks.commands.decorators import cmd
+from meeseeks.context import ChangedRoomMessageCtx
+from meeseeks.metrics import REGISTRY
+from tests.base import BaseTestClass
+
+
+class _TestApp(CommandsBase):
+    """App with commands for tests. """
+
+    app_name = 'decorators_test_app'
+
+    check_permissions = None
+
+    @cmd(name='get test')
+    async def cmd_get_test(self):
+        """Command for tests. It lets other coroutines run while it runs. """
+
+        await asyncio.sleep(0)
+
+
+class TestCommandDecorator(BaseTestClass):
+    """Tests of CommandDecorator class. """
+
+    @staticmethod
+    def _app():
+        """Return app with the context of command "get test". """
+
+        app = _TestApp()
+        app._ctx = ChangedRoomMessageCtx()
+        app._ctx.msg = f'@{settings.USER_NAME} get test arg1, arg2'
+        app._command_method = app.cmd_get_test
+
+        return app
+
+    def test_decorate_callable_observes_duration(self):
+        """Test of success _decorate_callable method. Duration of the command is counted. """
+
+        @self.async_case
+        async def body():
+            await self._app().cmd_get_test()
+
+            self.assertIn(
+                'meeseeks_command_duration_seconds_count'
+                '{app="decorators_test_app",command="get test",phase="total"}',
+                REGISTRY.render(),
+            )
+
+    @mock.patch('meeseeks.settings.SLOW_COMMAND_THRESHOLD', 0)
+    def test_decorate_callable_logs_slow_command(self):
+        """Test of success _decorate_callable method when the command is slow. """
+
+        @self.async_case
+        async def body():
+            with mock.patch('meeseeks.commands.decorators.LOGGER') as logger:
+                await self._app().cmd_get_test()
+
+            self.assertIn(['arg1', 'arg2'], logger.warning.call_args.args)
+
+    @mock.patch('meeseeks.settings.PROFILE_COMMAND', 'get test')
+    @mock.patch('meeseeks.settings.PROFILE_COMMAND_RATE', 2)
+    def test_decorate_callable_profiles_command(self):
+        """Test of success _decorate_callable method when the command is profiled. """
+
+        @self.async_case
+        async def body():
+            with tempfile.TemporaryDirectory() as profile_dir:
+                with mock.patch('meeseeks.settings.PROFILE_DIR', profile_dir):
+                    app = self._app()
+                    for _ in range(4):
+                        await app.cmd_get_test()
+
+                    profiles = os.listdir(profile_dir)
+
+            task_name = asyncio.current_task().get_name()
+            self.assertEqual(len(profiles), 2)
+            self.assertTrue(profiles[0].startswith(f'get_test-{task_name}-'))
+
+    @mock.patch('meeseeks.settings.PROFILE_COMMAND', 'get test')
+    @mock.patch('meeseeks.settings.PROFILE_COMMAND_RATE', 1)
+    def test_decorate_callable_profiles_one_command(self):
+        """Test of success _decorate_callable method when the profiled command runs
+        concurrently. Only one invocation is profiled at a time.
+        """
+
+        @self.async_case
+        async def body():
+            with tempfile.TemporaryDirectory() as profile_dir:
+                with mock.patch('meeseeks.settings.PROFILE_DIR', profile_dir):
+                    app = self._app()
+                    await asyncio.gather(
+                        asyncio.create_task(app.cmd_get_test(), name='first'),
+                        asyncio.create_task(app.cmd_get_test(), name='second'),
+                    )
+
+                    profiles = os.listdir(profile_dir)
+
+            self.assertEqual(len(profiles), 1)
+            self.assertTrue(profiles[0].startswith('get_test-first-'))
@@ -1,4 +1,14 @@
-from meeseeks.context import Context, ContextRoom, ContextUser
+import time
+from unittest import mock
+
+from meeseeks.context import (
+    ChangedRoomMessageCtx,
+    Context,
+    ContextRoom,
+    ContextUser,
+    UserChangedCtx,
+)
+from meeseeks.exceptions import SerializerError
 from tests.base import BaseTestClass
 
 
@@ -40,3 +50,101 @@ class TestContextRoom(BaseTestClass):
         self.assertEqual(result.type, 'c')
         self.assertEqual(result.participant, True)
         self.assertEqual(result.name, 'General')
+
+
+class TestChangedRoomMessageCtx(BaseTestClass):
+    """Tests of ChangedRoomMessageCtx class. """
+
+    @staticmethod
+    def _serialize(**fields):
+        """Return serialized context of the room message with the given fields. """
+
+        message = {
+            '_id': 'nESwxuPygMksAapZb',
+            'rid': 'GENERAL',
+            'msg': 'hello',
+            'ts': {'$date': int(time.time() * 1000)},
+            'u': {'_id': 'X2gR7ZHZdmsrTSDRK', 'username': 'test', 'name': 'Test'},
+            **fields,
+        }
+        ctx = ChangedRoomMessageCtx({
+            'msg': 'changed',
+            'collection': 'stream-room-messages',
+            'fields': {'args': [message, {'roomType': 'c', 'roomParticipant': True}]},
+        })
+        ctx.serialize()
+
+        return ctx
+
+    def test_serialize(self):
+        """Test of success serialize method. The fields are computed on the first access. """
+
+        ctx = self._serialize()
+
+        with mock.patch('meeseeks.context.ContextUser') as context_user:
+            ctx.user  # pylint: disable=pointless-statement
+            ctx.user  # pylint: disable=pointless-statement
+
+        context_user.assert_called_once_with('X2gR7ZHZdmsrTSDRK', 'test', 'Test')
+        self.assertEqual(ctx.msg, 'hello')
+        self.assertEqual(ctx.room.id, 'GENERAL')
+        self.assertEqual(ctx.room.type, ContextRoom.CHANNEL_ROOM_TYPE)
+        self.assertFalse(ctx.link_previews)
+        self.assertFalse(hasattr(ctx, '__dict__'))
+
+    def test_serialize_link_previews(self):
+        """Test of success serialize method for the update with link previews. """
+
+        ctx = self._serialize(urls=[{'url': 'https://tenor.com', 'meta': {}}])
+
+        self.assertTrue(ctx.link_previews)
+
+    def test_fail_serialize(self):
+        """Test of failure serialize method. """
+
+        with self.assertRaises(SerializerError):
+            self._serialize(u={'username': 'test'})
+
+    def test_set_fields(self):
+        """Test of setting the fields of the context created without a message. """
+
+        ctx = ChangedRoomMessageCtx()
+        ctx.room.id = 'general'
+        ctx.fresh_msg_date = True
+
+        self.assertEqual(ctx.room.id, 'general')
+        self.assertEqual(ctx.user.id, '')
+        self.assertTrue(ctx.fresh_msg_date)
+        self.assertEqual(ChangedRoomMessageCtx().room.id, '')
+
+
+class TestUserChangedCtx(BaseTestClass):
+    """Tests of UserChangedCtx class. """
+
+    def test_serialize(self):
+        """Test of success serialize method. """
+
+        payloads = (
+            ('roles-change', {'type': 'added', '_id': 'admin', 'u': {'_id': 'X2gR7ZHZdmsrTSDRK'}}),
+            ('Users:Deleted', {'userId': 'X2gR7ZHZdmsrTSDRK'}),
+            ('Users:NameChanged', {'_id': 'X2gR7ZHZdmsrTSDRK', 'name': 'Test'}),
+        )
+
+        for event, payload in payloads:
+            ctx = UserChangedCtx({
+                'msg': 'changed',
+                'collection': 'stream-notify-logged',
+                'fields': {'eventName': event, 'args': [payload]},
+            })
+            ctx.serialize()
+
+            self.assertEqual(ctx.event, event)
+            self.assertEqual(ctx.user_id, 'X2gR7ZHZdmsrTSDRK')
+
+    def test_fail_serialize(self):
+        """Test of failure serialize method. """
+
+        ctx = UserChangedCtx({'msg': 'changed', 'collection': 'stream-notify-logged'})
+
+        with self.assertRaises(SerializerError):
+            ctx.serialize()
@@ -1,14 +1,46 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
 from unittest import mock
 
-from meeseeks import MeeseeksCore, RestAPI, MeeseeksBaseApp
+from meeseeks import MeeseeksCore, RestAPI, MeeseeksBaseApp, settings
+from meeseeks.cache import SingleFlight, TTLCache
+from meeseeks.directory import UserDirectory
+from meeseeks.dispatcher import Dispatcher
 from meeseeks.exceptions import BadConfigure
+from meeseeks.filters import DROP_OVERLOAD, FrameFilter
+from meeseeks.keepalive import Keepalive
+from meeseeks.metrics import REGISTRY
+from meeseeks.outbox import Outbox
+from meeseeks.rtapi import RealTimeAPI
+from meeseeks.router import CommandRouter
+from meeseeks.workers import RemoteApp
 from tests.base import BaseTestClass
 
 
+def _command(msg_id):
+    """Return callback of the room message with the help command. """
+
+    return {
+        'msg': 'changed',
+        'collection': 'stream-room-messages',
+        'fields': {'args': [{
+            '_id': msg_id,
+            'rid': 'GENERAL',
+            'msg': f'@{settings.USER_NAME} help',
+            'ts': {'$date': int(time.time() * 1000)},
+            'u': {'_id': 'X2gR7ZHZdmsrTSDRK', 'username': 'test', 'name': 'Test'},
+        }, {'roomType': 'c', 'roomParticipant': True}]},
+    }
+
+
 class TestMeeseeksCore(BaseTestClass):
     """Tests of MeeseeksCore class."""
 
-    @mock.patch('meeseeks.settings.USERS_LIST_REQUEST', '/users.list_without_permissons/')
+    @mock.patch('meeseeks.settings.USERS_INFO_REQUEST', '/users.info_without_permissons/')
     def test_fail_check_bot_permissions(self):
         """Test of failure check_bot_permissions method. """
 
@@ -16,6 +48,7 @@ class TestMeeseeksCore(BaseTestClass):
         async def body():
             core = MeeseeksCore()
             core._restapi = RestAPI({})
+            core._user_directory = UserDirectory(core._restapi)
             core._user_id = 'X2gR7ZHZdmsrTSDRK'
 
             with self.assertRaises(BadConfigure):
@@ -40,3 +73,184 @@ class TestMeeseeksCore(BaseTestClass):
         apps_instances = core._init_apps()
 
         self.assertIsInstance(apps_instances[0], MeeseeksBaseApp)
+
+    @mock.patch('meeseeks.settings.INSTALLED_APPS', ('meeseeks.MeeseeksBaseApp', ))
+    @mock.patch('meeseeks.settings.WORKER_APPS', 'meeseeks.MeeseeksBaseApp:0')
+    def test_init_worker_apps(self):
+        """Test of success _init_apps method when the app runs in the worker process. """
+
+        core = MeeseeksCore()
+        (app, ) = core._init_apps()
+
+        self.assertIsInstance(app, RemoteApp)
+        self.assertEqual(app.app_name, 'meeseeks.MeeseeksBaseApp')
+        self.assertEqual(app.path, 'meeseeks.MeeseeksBaseApp')
+
+    def test_apps_receive(self):
+        """Test of success _apps_receive method. """
+
+        self.assertIs(MeeseeksCore._apps_receive('meeseeks.MeeseeksBaseApp'), MeeseeksBaseApp)
+        self.assertIsNone(MeeseeksCore._apps_receive('meeseeks'))
+
+    def test_lazy_import(self):
+        """Test of success import of the packages. The apps and the core are imported only
+        when they are accessed.
+        """
+
+        code = (
+            'import sys, apps, meeseeks; '
+            'assert \'meeseeks.core\' not in sys.modules; '
+            'assert \'apps.holidays.holidays\' not in sys.modules; '
+            'meeseeks.MeeseeksBaseApp; '
+            'assert \'meeseeks.core\' in sys.modules'
+        )
+
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    @mock.patch('meeseeks.settings.APP_SETUP_TIMEOUT', 0.1)
+    def test_setup_apps(self):
+        """Test of success _setup_apps method. The apps are set up at the same time and
+        the ones which fail or are not set up in time do not receive commands.
+        """
+
+        @self.async_case
+        async def body():
+            core = MeeseeksCore()
+            core._apps, core._router = [], CommandRouter()
+            ready, failed, slow = MeeseeksBaseApp(), MeeseeksBaseApp(), MeeseeksBaseApp()
+            core._starting_apps, core._failed_apps = {ready, failed, slow}, set()
+            ready.setup = mock.AsyncMock()
+            failed.setup = mock.AsyncMock(side_effect=ValueError('test'))
+
+            async def setup_slowly():
+                await asyncio.sleep(10)
+
+            slow.setup = setup_slowly
+
+            errors = await core._setup_apps([ready, failed, slow])
+
+            self.assertEqual(core._apps, [ready])
+            self.assertEqual([type(error) for error in errors], [ValueError, asyncio.TimeoutError])
+            self.assertEqual({app for app, _ in core._router.get('help')}, {ready})
+            self.assertEqual(core._starting_apps, set())
+            self.assertEqual(core._failed_apps, {failed, slow})
+
+    def test_process_command_while_apps_start(self):
+        """Test of success _process_command method. The commands of the apps which are
+        starting or failed to start are answered with their state.
+        """
+
+        @self.async_case
+        async def body():
+            core = MeeseeksCore()
+            core._apps, core._router = [], CommandRouter()
+            core._write_msg = mock.AsyncMock()
+            app = MeeseeksBaseApp()
+            app.process_command = mock.AsyncMock()
+            core._starting_apps, core._failed_apps = {app}, set()
+            core._add_commands(app)
+            ctx = mock.Mock()
+            ctx.room.id = 'GENERAL'
+
+            await core._process_command(ctx, mock.Mock(command='help'))
+            await core._process_command(ctx, mock.Mock(command='unknown'))
+            core._starting_apps, core._failed_apps = set(), {app}
+            await core._process_command(ctx, mock.Mock(command='help'))
+            core._failed_apps = set()
+            await core._process_command(ctx, mock.Mock(command='help'))
+
+            self.assertEqual([call.args[0] for call in core._write_msg.await_args_list], [
+                'meeseeks is starting, try again shortly',
+                'Apps are starting, try again shortly',
+                'meeseeks is not available, it failed to start',
+            ])
+            app.process_command.assert_awaited_once()
+
+    def test_register_metrics(self):
+        """Test of success _register_metrics method. The counters of the caches are
+        computed when the metrics are collected.
+        """
+
+        @self.async_case
+        async def body():
+            core = MeeseeksCore()
+            core._users_cache = TTLCache(10, 60)
+            core._outbox = Outbox(1000, 1000, 0, 0, 0)
+            core._keepalive = Keepalive(RealTimeAPI(mock.AsyncMock()), 15, 45, 10)
+            core._dispatcher, core._supervisor = mock.Mock(), mock.Mock()
+            single_flight = SingleFlight()
+            core._register_metrics(single_flight)
+
+            core._users_cache.set('user', {'roles': ['user']})
+            core._users_cache.get('user')
+            core._users_cache.get('other_user')
+            await single_flight.do('key', mock.AsyncMock(return_value='result'))
+
+            self.assertEqual(REGISTRY.counter('meeseeks_users_cache_hits_total', '')
+                             .labels().get(), 1)
+            self.assertEqual(REGISTRY.counter('meeseeks_users_cache_misses_total', '')
+                             .labels().get(), 1)
+            self.assertEqual(REGISTRY.counter('meeseeks_rest_requests_sent_total', '')
+                             .labels().get(), 1)
+
+    def test_fail_start_metrics_server(self):
+        """Test of failure _start_metrics_server method. The bot works without the metrics
+        if their port is in use.
+        """
+
+        @self.async_case
+        async def body():
+            with socket.socket() as busy_socket:
+                busy_socket.bind(('127.0.0.1', 0))
+                busy_socket.listen()
+                port = busy_socket.getsockname()[1]
+                with mock.patch('meeseeks.settings.METRICS_PORT', port):
+                    self.assertIsNone(await MeeseeksCore()._start_metrics_server())
+
+    def test_loop_when_overloaded(self):
+        """Test of success loop method when the work queue is full. The callbacks which
+        do not fit are dropped and pings are still answered.
+        """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            core = MeeseeksCore()
+            core._rtapi = RealTimeAPI(websocket)
+            core._keepalive = Keepalive(core._rtapi, 15, 45, 10)
+            core._frame_filter = FrameFilter('bot')
+            core._dispatcher = Dispatcher(mock.AsyncMock(), concurrency=1, queue_size=1)
+            frames = [
+                _command('first'),
+                _command('second'),
+                {'msg': 'ping', 'id': 'server-ping'},
+            ]
+            core._recv = mock.AsyncMock(side_effect=[json.dumps(frame) for frame in frames])
+
+            for _ in frames:
+                await asyncio.wait_for(core.loop(), 1)
+
+            self.assertEqual(core._dispatcher.depth, 1)
+            self.assertEqual(core._frame_filter.dropped[DROP_OVERLOAD], 1)
+            self.assertEqual(json.loads(websocket.send.await_args.args[0]),
+                             {'msg': 'pong', 'id': 'server-ping'})
+
+    @mock.patch('meeseeks.settings.MESSAGE_TRANSPORT', 'ddp')
+    def test_write_msg_over_ddp(self):
+        """Test of success _write_msg method when messages are sent over the websocket. """
+
+        @self.async_case
+        async def body():
+            core = MeeseeksCore()
+            core._outbox = Outbox(1000, 1000, 0, 0, 0)
+            core._rtapi = mock.Mock()
+            core._rtapi.send_message = mock.AsyncMock(return_value={'success': True})
+            core._outbox.start()
+            with mock.patch('meeseeks.restapi.RestAPI.write_msg') as write_msg:
+                response = await core._write_msg('Hello my friend', 'GENERAL')
+
+            await core._outbox.stop()
+
+            self.assertEqual(response, {'success': True})
+            core._rtapi.send_message.assert_awaited_once_with('Hello my friend', 'GENERAL')
+            write_msg.assert_not_called()
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from aiohttp import ClientResponseError
+
+from meeseeks import RestAPI
+from meeseeks.context import UserChangedCtx
+from meeseeks.directory import UserDirectory
+from tests.base import BaseTestClass
+
+
+def _user_changed_ctx(event, payload):
+    """Return serialized context of realtime event about user. """
+
+    ctx = UserChangedCtx({
+        'msg': 'changed',
+        'collection': 'stream-notify-logged',
+        'fields': {'eventName': event, 'args': [payload]},
+    })
+    ctx.serialize()
+
+    return ctx
+
+
+class TestUserDirectory(BaseTestClass):
+    """Tests of UserDirectory class. """
+
+    def test_get_user(self):
+        """Test of success get_user and get_user_by_username methods. """
+
+        @self.async_case
+        async def body():
+            directory = UserDirectory(RestAPI({}))
+            user = await directory.get_user_by_username('test')
+
+            self.assertEqual(user['_id'], 'X2gR7ZHZdmsrTSDRK')
+            self.assertIs(await directory.get_user('X2gR7ZHZdmsrTSDRK'), user)
+            self.assertIsNone(await directory.get_user('ucPgkuQptW4TTqYH2'))
+
+    def test_get_user_before_load(self):
+        """Test of success get_user method before all users are loaded. The user is
+        received by users.info without loading all users.
+        """
+
+        @self.async_case
+        async def body():
+            restapi = RestAPI({})
+            directory = UserDirectory(restapi)
+            with mock.patch.object(restapi, 'get_users_page') as get_users_page:
+                user = await directory.get_user('X2gR7ZHZdmsrTSDRK')
+
+            self.assertEqual(user['roles'], ['user', 'admin'])
+            get_users_page.assert_not_called()
+
+    def test_refresh(self):
+        """Test of success refresh method loading only updated users on the second call. """
+
+        @self.async_case
+        async def body():
+            restapi = RestAPI({})
+            directory = UserDirectory(restapi)
+            await directory.refresh()
+            with mock.patch.object(restapi, 'get_users_page', return_value={
+                'users': [{'_id': 'X2gR7ZHZdmsrTSDRK', 'username': 'renamed'}],
+                'count': 1,
+                'total': 1,
+            }) as get_users_page:
+                await directory.refresh()
+
+            self.assertIsNotNone(get_users_page.call_args.args[1])
+            self.assertEqual(list(await directory.get_users()), ['X2gR7ZHZdmsrTSDRK'])
+            self.assertIsNone(await directory.get_user_by_username('test'))
+            self.assertIsNotNone(await directory.get_user_by_username('renamed'))
+
+    def test_refresh_without_query(self):
+        """Test of success refresh method when Rocket.Chat rejects the query of updated
+        users. All users are reloaded then.
+        """
+
+        @self.async_case
+        async def body():
+            restapi = RestAPI({})
+            directory = UserDirectory(restapi)
+            await directory.refresh()
+
+            async def get_users_page(_offset, updated_since=None):
+                if updated_since is not None:
+                    raise ClientResponseError(mock.Mock(), (), status=400)
+
+                return {'users': [{'_id': 'renamedUserId', 'username': 'renamed'}],
+                        'count': 1, 'total': 1}
+
+            with mock.patch.object(restapi, 'get_users_page', side_effect=get_users_page):
+                await directory.refresh()
+                await directory.refresh()
+
+            self.assertEqual(list(await directory.get_users()), ['renamedUserId'])
+            self.assertIsNone(await directory.get_user_by_username('test'))
+
+    def test_apply_event(self):
+        """Test of success apply_event method. """
+
+        @self.async_case
+        async def body():
+            directory = UserDirectory(RestAPI({}))
+            await directory.refresh()
+
+            directory.apply_event(_user_changed_ctx('roles-change', {
+                'type': 'removed', '_id': 'admin', 'u': {'_id': 'X2gR7ZHZdmsrTSDRK'},
+            }))
+            self.assertEqual((await directory.get_user('X2gR7ZHZdmsrTSDRK'))['roles'], ['user'])
+
+            directory.apply_event(_user_changed_ctx('Users:NameChanged', {
+                '_id': 'X2gR7ZHZdmsrTSDRK', 'name': 'Renamed', 'username': 'renamed',
+            }))
+            self.assertEqual((await directory.get_user_by_username('renamed'))['name'], 'Renamed')
+
+            directory.apply_event(_user_changed_ctx('Users:Deleted', {
+                'userId': 'X2gR7ZHZdmsrTSDRK',
+            }))
+            self.assertEqual(await directory.get_users(), {})
@@ -0,0 +1,104 @@
+import asyncio
+
+from meeseeks.dispatcher import Dispatcher
+from tests.base import BaseTestClass
+
+
+class TestDispatcher(BaseTestClass):
+    """Tests of Dispatcher class. """
+
+    def test_keep_order_within_key(self):
+        """Test of success handling of frames with the same key in the submission order. """
+
+        @self.async_case
+        async def body():
+            handled = []
+
+            async def handler(frame):
+                await asyncio.sleep(frame['delay'])
+                handled.append(frame['n'])
+
+            dispatcher = Dispatcher(handler, concurrency=4, queue_size=10)
+            dispatcher.start()
+            for n, delay in enumerate((0.03, 0.02, 0.01, 0, )):
+                await dispatcher.submit('GENERAL', {'n': n, 'delay': delay})
+
+            await asyncio.sleep(0.1)
+            await dispatcher.stop()
+
+            self.assertEqual(handled, [0, 1, 2, 3])
+
+    def test_slow_key_does_not_block_others(self):
+        """Test of success handling of frame while frame with another key is being handled. """
+
+        @self.async_case
+        async def body():
+            release = asyncio.Event()
+            handled = []
+
+            async def handler(frame):
+                if frame['rid'] == 'slow':
+                    await release.wait()
+                handled.append(frame['rid'])
+
+            dispatcher = Dispatcher(handler, concurrency=2, queue_size=10)
+            dispatcher.start()
+            await dispatcher.submit('slow', {'rid': 'slow'})
+            await dispatcher.submit('fast', {'rid': 'fast'})
+            await asyncio.sleep(0.01)
+
+            self.assertEqual(handled, ['fast'])
+            self.assertEqual(dispatcher.depth, 0)
+
+            release.set()
+            await asyncio.sleep(0.01)
+            await dispatcher.stop()
+
+            self.assertEqual(handled, ['fast', 'slow'])
+
+    def test_handler_failure(self):
+        """Test of handling frames after failure of handler. """
+
+        @self.async_case
+        async def body():
+            handled = []
+
+            async def handler(frame):
+                if frame['fail']:
+                    raise ValueError
+                handled.append(frame)
+
+            dispatcher = Dispatcher(handler, concurrency=1, queue_size=1)
+            dispatcher.start()
+            with self.assertLogs() as captured:
+                await dispatcher.submit('GENERAL', {'fail': True})
+                await dispatcher.submit('GENERAL', {'fail': False})
+                await asyncio.sleep(0.01)
+            await dispatcher.stop()
+
+            self.assertEqual(handled, [{'fail': False}])
+            self.assertEqual(captured.records[0].getMessage(), 'Dispatcher: Failed to handle frame')
+
+    def test_handler_cancelled(self):
+        """Test of handling frames after the handler raises CancelledError. The worker
+        keeps handling frames.
+        """
+
+        @self.async_case
+        async def body():
+            handled = []
+
+            async def handler(frame):
+                if frame['cancel']:
+                    raise asyncio.CancelledError
+                handled.append(frame)
+
+            dispatcher = Dispatcher(handler, concurrency=1, queue_size=1)
+            dispatcher.start()
+            with self.assertLogs():
+                await dispatcher.submit('GENERAL', {'cancel': True})
+                await dispatcher.submit('GENERAL', {'cancel': False})
+                await dispatcher.join()
+            await dispatcher.stop()
+
+            self.assertEqual(handled, [{'cancel': False}])
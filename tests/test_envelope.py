@@ -0,0 +1,49 @@
+from unittest import mock
+
+from meeseeks.envelope import Envelope, get_arguments, parse_envelope
+from meeseeks.router import CommandRouter
+from tests.base import BaseTestClass
+
+
+class TestEnvelope(BaseTestClass):
+    """Tests of Envelope class and parse_envelope function. """
+
+    @staticmethod
+    def _router(*names):
+        """Return router of command methods with the given names. """
+
+        router = CommandRouter()
+        for name in names:
+            command_method = mock.Mock()
+            command_method.command_name = name
+            router.add('app', command_method)
+
+        return router
+
+    def test_get_arguments(self):
+        """Test of success get_arguments function. """
+
+        self.assertEqual(get_arguments('vote a, b ,c', 'vote'), ('a', 'b', 'c', ))
+        self.assertEqual(get_arguments('vote', 'vote'), ())
+
+    def test_parse_envelope(self):
+        """Test of success parse_envelope function. """
+
+        envelope = parse_envelope(
+            '@meeseeks  Get Users INFO test, Other', '@meeseeks', False,
+            self._router('get users', 'get users info'),
+        )
+
+        self.assertEqual(
+            envelope,
+            Envelope(True, 'get users info test, other', 'get users info', ('test', 'other', ), False),
+        )
+
+    def test_parse_envelope_without_command(self):
+        """Test of parse_envelope function when there is no such command. """
+
+        envelope = parse_envelope('Hello', '@meeseeks', True, self._router('help'))
+
+        self.assertEqual(envelope, Envelope(False, 'hello', '', (), True))
+        with self.assertRaises(AttributeError):
+            envelope.text = 'bye'  # type: ignore[misc]
@@ -0,0 +1,141 @@
+import time
+from unittest import mock
+
+from meeseeks import settings
+from meeseeks.filters import (
+    DROP_DUPLICATE,
+    DROP_LINK_PREVIEWS,
+    DROP_MALFORMED,
+    DROP_NOT_MENTIONED,
+    DROP_OWN_MESSAGE,
+    DROP_STALE,
+    FrameFilter,
+)
+from tests.base import BaseTestClass
+
+
+def _room_message(msg, user_id='X2gR7ZHZdmsrTSDRK', room_type='c', ts=None, urls=None,
+                  msg_id='HXYrKiNh7SEBsbgHw', **fields):
+    """Return callback of the room message. """
+
+    message = {
+        '_id': msg_id,
+        'rid': 'GENERAL',
+        'msg': msg,
+        'ts': {'$date': ts if ts is not None else int(time.time() * 1000)},
+        'u': {'_id': user_id, 'username': 'test', 'name': 'Test'},
+    }
+    if urls is not None:
+        message['urls'] = urls
+
+    message.update(fields)
+
+    return {
+        'msg': 'changed',
+        'collection': 'stream-room-messages',
+        'id': 'id',
+        'fields': {
+            'eventName': '__my_messages__',
+            'args': [message, {'roomType': room_type, 'roomParticipant': True}],
+        },
+    }
+
+
+class TestFrameFilter(BaseTestClass):
+    """Tests of FrameFilter class. """
+
+    def test_classify(self):
+        """Test of success classify method. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2')
+
+        self.assertIsNone(frame_filter.classify(_room_message(f'@{settings.USER_NAME} help')))
+        self.assertIsNone(frame_filter.classify(
+            _room_message('hello', room_type='d', msg_id='nESwxuPygMksAapZb'),
+        ))
+        self.assertIsNone(frame_filter.classify({'msg': 'ping'}))
+
+    def test_classify_drop_reasons(self):
+        """Test of success classify method for the messages which must be dropped. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2')
+        command = f'@{settings.USER_NAME} help'
+        cases = (
+            (_room_message(command, user_id='ucPgkuQptW4TTqYH2'), DROP_OWN_MESSAGE),
+            (_room_message(command, urls=[{'url': 'https://tenor.com', 'meta': {}}]),
+             DROP_LINK_PREVIEWS),
+            (_room_message(command, ts=1651854972660), DROP_STALE),
+            (_room_message('hello'), DROP_NOT_MENTIONED),
+            ({'msg': 'changed', 'collection': 'stream-room-messages'}, DROP_MALFORMED),
+        )
+
+        for raw_context, reason in cases:
+            self.assertEqual(frame_filter.classify(raw_context), reason)
+
+    def test_classify_duplicates(self):
+        """Test of success classify method for the message resent by Rocket.Chat. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2')
+        command = _room_message(f'@{settings.USER_NAME} help')
+        ts = command['fields']['args'][0]['ts']['$date']
+        reaction = _room_message(f'@{settings.USER_NAME} help', ts=ts,
+                                 reactions={':+1:': {'usernames': ['test']}})
+        edit = _room_message(f'@{settings.USER_NAME} help meeseeks', ts=ts,
+                             editedAt={'$date': ts + 1000})
+
+        self.assertIsNone(frame_filter.classify(command))
+        self.assertEqual(frame_filter.classify(command), DROP_DUPLICATE)
+        self.assertEqual(frame_filter.classify(reaction), DROP_DUPLICATE)
+        self.assertIsNone(frame_filter.classify(edit))
+        self.assertEqual(frame_filter.classify(edit), DROP_DUPLICATE)
+
+    def test_classify_forgotten_duplicates(self):
+        """Test of success classify method for the messages resent by Rocket.Chat after
+        the filter forgot them. Only their edits are passed.
+        """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2', seen_size=1)
+        first = _room_message(f'@{settings.USER_NAME} help', msg_id='first')
+        ts = first['fields']['args'][0]['ts']['$date']
+        second = _room_message(f'@{settings.USER_NAME} help', msg_id='second', ts=ts + 1)
+        reaction = _room_message(f'@{settings.USER_NAME} help', msg_id='first', ts=ts,
+                                 reactions={':+1:': {'usernames': ['test']}})
+        edit = _room_message(f'@{settings.USER_NAME} help meeseeks', msg_id='first', ts=ts,
+                             editedAt={'$date': ts + 1000})
+
+        self.assertIsNone(frame_filter.classify(first))
+        self.assertIsNone(frame_filter.classify(second))
+        self.assertEqual(frame_filter.classify(reaction), DROP_DUPLICATE)
+        self.assertIsNone(frame_filter.classify(edit))
+
+    @mock.patch('time.time', return_value=1651854972.999)
+    def test_classify_grace(self, _):
+        """Test of success classify method for the messages sent before the filter is created. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2', grace=60)
+        command = f'@{settings.USER_NAME} help'
+
+        self.assertIsNone(frame_filter.classify(_room_message(command, ts=1651854942999)))
+        self.assertEqual(frame_filter.classify(_room_message(command, ts=1651854912998)),
+                         DROP_STALE)
+
+    @mock.patch('time.time', return_value=1651854972.999)
+    def test_classify_previous_second(self, _):
+        """Test of success classify method for the message sent in the previous second. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2')
+
+        self.assertIsNone(frame_filter.classify(
+            _room_message(f'@{settings.USER_NAME} help', ts=1651854971001),
+        ))
+
+    def test_accept(self):
+        """Test of success accept method. """
+
+        frame_filter = FrameFilter('ucPgkuQptW4TTqYH2')
+
+        self.assertTrue(frame_filter.accept(_room_message(f'@{settings.USER_NAME} help')))
+        self.assertFalse(frame_filter.accept(_room_message('hello')))
+        self.assertFalse(frame_filter.accept(_room_message('hi')))
+        self.assertEqual(frame_filter.passed, 1)
+        self.assertEqual(frame_filter.dropped, {DROP_NOT_MENTIONED: 2})
@@ -0,0 +1,79 @@
+import json
+from unittest import mock
+
+from meeseeks.keepalive import Keepalive
+from meeseeks.rtapi import RealTimeAPI
+from tests.base import BaseTestClass
+
+
+class TestKeepalive(BaseTestClass):
+    """Tests of Keepalive class. """
+
+    @staticmethod
+    def _keepalive(websocket):
+        """Return keepalive of the given connection. """
+
+        return Keepalive(RealTimeAPI(websocket), interval=15, timeout=45, max_rtt=10)
+
+    def test_process_ping(self):
+        """Test of success process method when server sends ping. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            keepalive = self._keepalive(websocket)
+
+            self.assertTrue(await keepalive.process({'msg': 'ping', 'id': 'server-ping'}))
+            self.assertFalse(await keepalive.process({'msg': 'changed'}))
+            self.assertEqual(json.loads(websocket.send.await_args.args[0]),
+                             {'msg': 'pong', 'id': 'server-ping'})
+
+    def test_check_measures_rtt(self):
+        """Test of success check method. The answer to the ping is counted in the histogram. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            keepalive = self._keepalive(websocket)
+            with mock.patch('time.monotonic', return_value=100):
+                await keepalive.check()
+
+            ping = json.loads(websocket.send.await_args.args[0])
+            with mock.patch('time.monotonic', return_value=100.2):
+                self.assertTrue(await keepalive.process({'msg': 'pong', 'id': ping['id']}))
+
+            self.assertEqual(ping['msg'], 'ping')
+            self.assertEqual(keepalive.rtt.count, 1)
+            self.assertAlmostEqual(keepalive.rtt.sum, 0.2)
+            websocket.close.assert_not_awaited()
+
+    def test_check_closes_silent_connection(self):
+        """Test of success check method when nothing is received for too long. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            with mock.patch('time.monotonic', return_value=100):
+                keepalive = self._keepalive(websocket)
+
+            with mock.patch('time.monotonic', return_value=146):
+                await keepalive.check()
+
+            websocket.close.assert_awaited_once()
+            self.assertEqual(keepalive.forced_reconnects, 1)
+
+    def test_check_closes_when_ping_is_not_answered(self):
+        """Test of success check method when the ping is not answered in time. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            keepalive = self._keepalive(websocket)
+            with mock.patch('time.monotonic', return_value=100):
+                keepalive.reset()
+                await keepalive.check()
+
+            with mock.patch('time.monotonic', return_value=111):
+                await keepalive.check()
+
+            websocket.close.assert_awaited_once()
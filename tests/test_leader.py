@@ -0,0 +1,89 @@
+import os
+import tempfile
+from unittest import mock
+
+from meeseeks.exceptions import BadConfigure
+from meeseeks.leader import FileLockElector, LeaderElector, PostgresLockElector, create_elector
+from tests.base import BaseTestClass
+
+
+class TestLeaderElector(BaseTestClass):
+    """Tests of LeaderElector class and its backends. """
+
+    def test_guard(self):
+        """Test of success guard method. The replica without a backend is the leader. """
+
+        @self.async_case
+        async def body():
+            job = mock.AsyncMock(return_value='done')
+
+            self.assertEqual(await LeaderElector().guard(job)('arg', key='value'), 'done')
+            job.assert_awaited_once_with('arg', key='value')
+
+    def test_file_lock(self):
+        """Test of success FileLockElector class. Only one replica holds the lock. """
+
+        @self.async_case
+        async def body():
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, 'leader.lock')
+                first, second = FileLockElector(path), FileLockElector(path)
+                job = mock.AsyncMock()
+
+                self.assertTrue(await first.try_acquire())
+                self.assertTrue(await first.try_acquire())
+                self.assertFalse(await second.try_acquire())
+                await second.guard(job)()
+                job.assert_not_awaited()
+
+                await first.stop()
+                self.assertFalse(first.is_leader)
+                await second.guard(job)()
+                job.assert_awaited_once()
+                self.assertTrue(second.is_leader)
+                await second.stop()
+
+    @mock.patch('meeseeks.leader.HAS_ASYNCPG', True)
+    def test_postgres_lock(self):
+        """Test of success PostgresLockElector class. The lock is taken again after
+        the connection is lost.
+        """
+
+        @self.async_case
+        async def body():
+            connection = mock.Mock()
+            connection.is_closed.return_value = False
+            connection.close = mock.AsyncMock()
+            connection.execute = mock.AsyncMock()
+            connection.fetchval = mock.AsyncMock(side_effect=[
+                True, 1, ConnectionError('lost'), False,
+            ])
+            asyncpg = mock.Mock()
+            asyncpg.connect = mock.AsyncMock(return_value=connection)
+            with mock.patch('meeseeks.leader.asyncpg', asyncpg, create=True):
+                elector = PostgresLockElector('postgresql://localhost/meeseeks', 42)
+
+                self.assertTrue(await elector.try_acquire())
+                self.assertTrue(await elector.try_acquire())
+                self.assertFalse(await elector.try_acquire())
+                self.assertFalse(await elector.try_acquire())
+                await elector.stop()
+
+            self.assertEqual(asyncpg.connect.await_count, 2)
+            self.assertEqual(connection.fetchval.await_args_list, [
+                mock.call('SELECT pg_try_advisory_lock($1)', 42),
+                mock.call('SELECT 1'),
+                mock.call('SELECT 1'),
+                mock.call('SELECT pg_try_advisory_lock($1)', 42),
+            ])
+            connection.execute.assert_not_awaited()
+
+    @mock.patch('meeseeks.settings.LEADER_DSN', '')
+    def test_fail_create_elector(self):
+        """Test of failure create_elector function. """
+
+        self.assertIsInstance(create_elector(''), LeaderElector)
+        with self.assertRaises(BadConfigure):
+            create_elector('zookeeper')
+        with self.assertRaises(BadConfigure):
+            create_elector('postgres')
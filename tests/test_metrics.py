@@ -0,0 +1,104 @@
+import asyncio
+
+from aiohttp import ClientSession
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from meeseeks.metrics import REGISTRY, Registry, instrument_scheduler, start_metrics_server
+from tests.base import BaseTestClass
+
+
+class TestRegistry(BaseTestClass):
+    """Tests of Registry class. """
+
+    def test_render(self):
+        """Test of success render method. """
+
+        registry = Registry()
+        registry.counter('frames_total', 'Frames.', ('msg', )).labels('changed').inc(2)
+        registry.gauge('queue_depth', 'Depth.').labels().set_function(lambda: 3)
+        histogram = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        histogram.labels().observe(0.5)
+        histogram.labels().observe(2)
+
+        self.assertEqual(registry.render(), '\n'.join([
+            '# HELP frames_total Frames.',
+            '# TYPE frames_total counter',
+            'frames_total{msg="changed"} 2.0',
+            '# HELP queue_depth Depth.',
+            '# TYPE queue_depth gauge',
+            'queue_depth 3.0',
+            '# HELP latency_seconds Latency.',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.1"} 0',
+            'latency_seconds_bucket{le="1.0"} 1',
+            'latency_seconds_bucket{le="+Inf"} 2',
+            'latency_seconds_sum 2.5',
+            'latency_seconds_count 2',
+        ]) + '\n')
+
+    def test_render_escapes_labels(self):
+        """Test of success render method when label values contain special characters. """
+
+        registry = Registry()
+        registry.counter('commands_total', 'Commands.', ('command', )).labels('say "hi"\\').inc()
+
+        self.assertIn(r'commands_total{command="say \"hi\"\\"} 1.0', registry.render())
+
+    def test_fail_register(self):
+        """Test of failure registration of a metric with the name of another type. """
+
+        registry = Registry()
+        registry.counter('frames_total', 'Frames.')
+
+        self.assertIs(registry.counter('frames_total', 'Frames.'),
+                      registry.counter('frames_total', 'Frames.'))
+        with self.assertRaises(ValueError):
+            registry.gauge('frames_total', 'Frames.')
+
+    def test_instrument_scheduler(self):
+        """Test of success instrument_scheduler function. """
+
+        @self.async_case
+        async def body():
+            scheduler = AsyncIOScheduler()
+            instrument_scheduler(scheduler, 'test_app')
+            done = asyncio.Event()
+
+            async def job():
+                done.set()
+
+            scheduler.add_job(job, id='test_job')
+            scheduler.start()
+            await asyncio.wait_for(done.wait(), 1)
+            await asyncio.sleep(0.01)
+            scheduler.shutdown(wait=False)
+
+            metrics = REGISTRY.render()
+            self.assertIn(
+                'meeseeks_scheduler_jobs_total{app="test_app",job="test_job",result="executed"}',
+                metrics,
+            )
+            self.assertIn(
+                'meeseeks_scheduler_job_duration_seconds_count{app="test_app",job="test_job"} 1',
+                metrics,
+            )
+
+    def test_start_metrics_server(self):
+        """Test of success start_metrics_server function. """
+
+        @self.async_case
+        async def body():
+            registry = Registry()
+            registry.counter('frames_total', 'Frames.').labels().inc()
+            runner = await start_metrics_server(registry, '127.0.0.1', 0)
+            port = runner.addresses[0][1]
+            try:
+                async with ClientSession() as session:
+                    async with session.get(f'http://127.0.0.1:{port}/metrics') as response:
+                        text = await response.text()
+                        content_type = response.headers['Content-Type']
+            finally:
+                await runner.cleanup()
+
+            self.assertEqual(text, registry.render())
+            self.assertTrue(content_type.startswith('text/plain; version=0.0.4'))
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from unittest import mock
+from urllib.parse import urlparse
+
+import aiohttp
+
+from meeseeks import MeeseeksCore, defaults, settings
+from tests.base import BaseTestClass
+from tests.mock_server import BOT_USER_ID, GENERAL_ROOM_ID, MockRocketChatServer
+
+
+class TestMockRocketChatServer(BaseTestClass):
+    """Tests of asyncio mock server Rocket.Chat. """
+
+    def _serve(self, body, **kwargs):
+        """Runs the given coroutine function with the started server. """
+
+        @self.async_case
+        async def run():
+            server = MockRocketChatServer(**kwargs)
+            await server.start()
+            try:
+                async with aiohttp.ClientSession() as session:
+                    await body(server, session)
+            finally:
+                await server.stop()
+
+    def test_users_list(self):
+        """Test of success paginated users.list request. """
+
+        async def body(server, session):
+            url = server.api_url + defaults.USERS_LIST_REQUEST
+            async with session.get(url, params={'count': 50, 'offset': 100}) as response:
+                users = await response.json()
+
+            self.assertEqual(users['total'], 201)
+            self.assertEqual(users['count'], 50)
+            self.assertEqual(server.requests[defaults.USERS_LIST_REQUEST], 1)
+
+        self._serve(body, users=200)
+
+    def test_rate_limit(self):
+        """Test of rejection of every Nth request because of the rate limit. """
+
+        async def body(server, session):
+            url = server.api_url + defaults.ROOMS_GET_REQUEST
+            statuses = []
+            for _ in range(4):
+                async with session.get(url) as response:
+                    statuses.append(response.status)
+
+            self.assertEqual(statuses, [200, 429, 200, 429])
+            self.assertEqual(response.headers['Retry-After'], '2')
+            self.assertEqual(server.rate_limited, 2)
+
+        self._serve(body, rate_limit_every=2, retry_after=2)
+
+    def test_ddp(self):
+        """Test of success DDP session: connection, login, subscription and ping. """
+
+        async def body(server, session):
+            async with session.ws_connect(server.url + '/websocket') as websocket:
+                await websocket.send_json({'msg': 'connect', 'version': '1', 'support': ['1']})
+                self.assertEqual((await websocket.receive_json())['msg'], 'connected')
+
+                await websocket.send_json({'msg': 'method', 'method': 'login', 'id': 'login',
+                                           'params': [{'resume': 'token'}]})
+                login = await websocket.receive_json()
+                self.assertEqual(login['result']['id'], BOT_USER_ID)
+                self.assertEqual(login['result']['token'], 'token')
+
+                await websocket.send_json({'msg': 'sub', 'id': 'sub',
+                                           'name': 'stream-room-messages'})
+                self.assertEqual(await websocket.receive_json(), {'msg': 'ready', 'subs': ['sub']})
+
+                await websocket.send_json({'msg': 'ping', 'id': 'ping-1'})
+                self.assertEqual(await websocket.receive_json(), {'msg': 'pong', 'id': 'ping-1'})
+
+                message = await server.push_message('hello')
+                changed = json.loads((await websocket.receive()).data)
+                self.assertEqual(changed['msg'], 'changed')
+                self.assertEqual(changed['fields']['args'][0], message)
+
+        self._serve(body)
+
+    @mock.patch('meeseeks.settings.INSTALLED_APPS', ('meeseeks.MeeseeksBaseApp', ))
+    @mock.patch('meeseeks.settings.METRICS_PORT', 0)
+    def test_run(self):
+        """Test of success run method of MeeseeksCore connected to the server. """
+
+        async def body(server, _session):
+            with mock.patch('meeseeks.settings.ROCKET_CHAT_API', server.api_url), \
+                    mock.patch.object(MeeseeksCore, '_url', urlparse(server.api_url)):
+                task = asyncio.create_task(MeeseeksCore().run())
+                try:
+                    await server.wait_for_subscribers()
+                    await server.push_message(f'@{settings.USER_NAME} help', GENERAL_ROOM_ID)
+                    replies = await server.wait_for_messages(1)
+                finally:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+
+            self.assertEqual(replies[0]['rid'], GENERAL_ROOM_ID)
+            self.assertEqual(server.requests[defaults.USERS_SET_STATUS_REQUEST], 1)
+
+        self._serve(body, bot_username=settings.USER_NAME)
@@ -0,0 +1,258 @@
+import asyncio
+import json
+from unittest import mock
+
+from aiohttp import ClientConnectorError, ClientResponseError
+from multidict import CIMultiDict
+from websockets.exceptions import ConnectionClosedError
+
+from meeseeks import RestAPI
+from meeseeks.exceptions import OutboxStopped
+from meeseeks.outbox import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    Outbox,
+    TokenBucket,
+    get_rate_limit_delay,
+)
+from meeseeks.rtapi import RealTimeAPI
+from tests.base import BaseTestClass
+from tests.server_responses import CHAT_POST_MESSAGE_SUCCESS_RESPONSE
+
+
+class TestOutbox(BaseTestClass):
+    """Tests of Outbox class. """
+
+    @staticmethod
+    def _outbox(max_retries=3):
+        """Return outbox which does not wait between messages. """
+
+        return Outbox(rate=1000, burst=1000, max_retries=max_retries,
+                      backoff_base=0.001, backoff_max=0.001)
+
+    @staticmethod
+    def _rate_limit_error(headers):
+        """Return error of the request rejected because of the rate limit. """
+
+        return ClientResponseError(mock.Mock(), (), status=429, headers=CIMultiDict(headers))
+
+    def test_get_rate_limit_delay(self):
+        """Test of success get_rate_limit_delay function. """
+
+        with mock.patch('time.time', return_value=100):
+            self.assertEqual(get_rate_limit_delay({'Retry-After': '3'}), 3)
+            self.assertEqual(get_rate_limit_delay({
+                'X-RateLimit-Remaining': '0',
+                'X-RateLimit-Reset': '102500',
+            }), 2.5)
+            self.assertEqual(get_rate_limit_delay({
+                'X-RateLimit-Remaining': '5',
+                'X-RateLimit-Reset': '102500',
+            }), 0)
+            self.assertEqual(get_rate_limit_delay(None), 0)
+
+    def test_token_bucket(self):
+        """Test of success acquire method of TokenBucket when tokens are exhausted. """
+
+        @self.async_case
+        async def body():
+            bucket = TokenBucket(rate=100, capacity=2)
+            with mock.patch('asyncio.sleep', wraps=asyncio.sleep) as sleep:
+                await bucket.acquire()
+                await bucket.acquire()
+                sleep.assert_not_called()
+                await bucket.acquire()
+                sleep.assert_called()
+
+    def test_send_priority(self):
+        """Test of success send method. Interactive messages are sent before bulk ones. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            sent = []
+
+            def send(text):
+                async def func():
+                    sent.append(text)
+                    return {'success': True}, {}
+
+                return func
+
+            tasks = [
+                asyncio.create_task(outbox.send(send('bulk'), PRIORITY_BULK)),
+                asyncio.create_task(outbox.send(send('reply'), PRIORITY_INTERACTIVE)),
+            ]
+            await asyncio.sleep(0)
+            self.assertEqual(outbox.depth, 2)
+
+            outbox.start()
+            results = await asyncio.gather(*tasks)
+            await outbox.stop()
+
+            self.assertEqual(sent, ['reply', 'bulk'])
+            self.assertEqual(results, [{'success': True}] * 2)
+            self.assertEqual((outbox.sent, outbox.latency.count), (2, 2))
+
+    def test_send_retries_on_rate_limit(self):
+        """Test of success send method when the first attempt is rejected by the rate limit. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            send = mock.AsyncMock(side_effect=[
+                self._rate_limit_error({'Retry-After': '0'}),
+                ({'success': True}, {}),
+            ])
+            outbox.start()
+            response = await outbox.send(send)
+            await outbox.stop()
+
+            self.assertEqual(response, {'success': True})
+            self.assertEqual((send.await_count, outbox.retries), (2, 1))
+
+    def test_fail_send(self):
+        """Test of failure send method when all attempts are rejected. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox(max_retries=2)
+            send = mock.AsyncMock(side_effect=self._rate_limit_error({}))
+            outbox.start()
+            with self.assertRaises(ClientResponseError):
+                await outbox.send(send)
+
+            await outbox.stop()
+
+            self.assertEqual((send.await_count, outbox.failed), (3, 1))
+
+    def test_fail_send_not_retriable(self):
+        """Test of failure send method when the error can not be fixed by retrying. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            send = mock.AsyncMock(
+                side_effect=ClientResponseError(mock.Mock(), (), status=400),
+            )
+            outbox.start()
+            with self.assertRaises(ClientResponseError):
+                await outbox.send(send)
+
+            await outbox.stop()
+
+            send.assert_awaited_once()
+
+    def test_fail_send_may_be_stored(self):
+        """Test of failure send method when the message may be already stored by
+        Rocket.Chat. The message is not sent again to avoid duplicates.
+        """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            send = mock.AsyncMock(side_effect=[
+                ClientResponseError(mock.Mock(), (), status=503), asyncio.TimeoutError(),
+            ])
+            outbox.start()
+            with self.assertRaises(ClientResponseError):
+                await outbox.send(send)
+            with self.assertRaises(asyncio.TimeoutError):
+                await outbox.send(send)
+
+            await outbox.stop()
+
+            self.assertEqual((send.await_count, outbox.retries), (2, 0))
+
+    @mock.patch('meeseeks.backoff.random.uniform', mock.Mock(return_value=0.1))
+    def test_send_retry_does_not_block(self):
+        """Test of success send method when the connection fails. The message is sent
+        again later and other messages are sent meanwhile.
+        """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            sent = []
+
+            async def send_bulk():
+                if not outbox.retries:
+                    raise ClientConnectorError(mock.Mock(), OSError('Connection refused'))
+                sent.append('bulk')
+                return {'success': True}, {}
+
+            async def send_reply():
+                sent.append('reply')
+                return {'success': True}, {}
+
+            outbox.start()
+            bulk = asyncio.create_task(outbox.send(send_bulk, PRIORITY_BULK))
+            await asyncio.sleep(0.01)
+            self.assertEqual(outbox.depth, 1)
+            await outbox.send(send_reply, PRIORITY_INTERACTIVE)
+            await bulk
+            await outbox.stop()
+
+            self.assertEqual(sent, ['reply', 'bulk'])
+
+    def test_send_retries_on_reconnection(self):
+        """Test of success send method when the message is sent over the lost websocket.
+        The message is sent again after the connection is restored.
+        """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            rtapi = RealTimeAPI(mock.AsyncMock(send=mock.AsyncMock(
+                side_effect=ConnectionClosedError(None, None),
+            )))
+
+            async def send(request):
+                request = json.loads(request)
+                rtapi.resolve({'msg': 'result', 'id': request['id'], 'result': {'_id': 'id'}})
+
+            async def send_message():
+                return await rtapi.send_message('Hello my friend', 'GENERAL'), {}
+
+            websocket = mock.AsyncMock(send=mock.AsyncMock(side_effect=send))
+            outbox.start()
+            task = asyncio.create_task(outbox.send(send_message))
+            while not outbox.retries:
+                await asyncio.sleep(0)
+            rtapi.attach(websocket)
+            response = await task
+            await outbox.stop()
+
+            self.assertEqual(response, {'message': {'_id': 'id'}, 'success': True})
+            self.assertEqual((outbox.retries, outbox.sent), (1, 1))
+
+    def test_stop(self):
+        """Test of success stop method. The message being sent and the queued ones fail. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+
+            async def send():
+                await asyncio.sleep(10)
+
+            outbox.start()
+            tasks = [asyncio.create_task(outbox.send(send)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            await outbox.stop()
+
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                self.assertIsInstance(result, OutboxStopped)
+
+    def test_restapi_write_msg(self):
+        """Test of success write_msg method of RestAPI with the queue of outbound messages. """
+
+        @self.async_case
+        async def body():
+            outbox = self._outbox()
+            outbox.start()
+            response = await RestAPI({}, outbox=outbox).write_msg('Hello my friend', 'GENERAL')
+            await outbox.stop()
+
+            self.assertEqual(response, CHAT_POST_MESSAGE_SUCCESS_RESPONSE)
+            self.assertEqual(outbox.sent, 1)
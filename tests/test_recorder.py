@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from meeseeks import MeeseeksCore, settings
+from meeseeks.recorder import (
+    REDACTED,
+    FrameRecorder,
+    FrameReplayer,
+    ReplayFinished,
+    ReplayWebSocket,
+)
+from tests.base import BaseTestClass
+
+
+class TestFrameRecorder(BaseTestClass):
+    """Tests of FrameRecorder and FrameReplayer classes. """
+
+    def setUp(self):
+        """Creates directory for recordings. """
+
+        super().setUp()
+        self._dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._dir.cleanup)
+        self._path = os.path.join(self._dir.name, 'frames.jsonl.gz')
+
+    def _record(self, frames):
+        """Records the given frames. """
+
+        recorder = FrameRecorder(self._path)
+        for frame in frames:
+            recorder.record(json.dumps(frame))
+
+        recorder.close()
+
+    @staticmethod
+    async def _replay(replayer):
+        """Return all replayed frames. """
+
+        return [json.loads(frame) async for frame in replayer.frames()]
+
+    def test_replay(self):
+        """Test of success replay of the recorded frames. """
+
+        @self.async_case
+        async def body():
+            frames = [{'msg': 'connected'}, {'msg': 'ping'}]
+            self._record(frames)
+            replayer = FrameReplayer(self._path)
+
+            self.assertEqual(await self._replay(replayer), frames)
+            self.assertEqual(replayer.replayed, 2)
+
+    def test_record_login_result(self):
+        """Test of success record method. The resume token is not written to the file. """
+
+        self._record([{'msg': 'result', 'id': 'login',
+                       'result': {'id': 'X2gR7ZHZdmsrTSDRK', 'token': 'secret'}}])
+
+        with gzip.open(self._path, 'rt', encoding='utf-8') as recording:
+            (record, ) = [json.loads(line) for line in recording]
+
+        self.assertEqual(record['frame']['result'], {'id': 'X2gR7ZHZdmsrTSDRK', 'token': REDACTED})
+
+    def test_replay_old_recording(self):
+        """Test of success replay of the frames recorded an hour ago. The dates are shifted
+        to the start of the replay and the recorded id of the bot is replaced.
+        """
+
+        @self.async_case
+        async def body():
+            hour_ago = time.time() - 3600
+            with mock.patch('meeseeks.recorder.time') as recorder_time:
+                recorder_time.time.side_effect = [hour_ago, hour_ago + 1]
+                self._record([
+                    {'msg': 'result', 'id': 'login', 'result': {'id': 'bot', 'token': 'secret'}},
+                    {'msg': 'changed', 'fields': {'args': [{
+                        'ts': {'$date': int((hour_ago + 1) * 1000)},
+                        'u': {'_id': 'bot', 'username': 'bot'},
+                    }]}},
+                ])
+
+            _, message = await self._replay(FrameReplayer(self._path, user_id='X2gR7ZHZdmsrTSDRK'))
+            (args, ) = message['fields']['args']
+
+            self.assertAlmostEqual(args['ts']['$date'] / 1000, time.time() + 1, delta=5)
+            self.assertEqual(args['u'], {'_id': 'X2gR7ZHZdmsrTSDRK', 'username': 'bot'})
+
+    def test_replay_realtime(self):
+        """Test of success replay of the recorded frames keeping the recorded intervals. """
+
+        @self.async_case
+        async def body():
+            with mock.patch('meeseeks.recorder.time') as recorder_time:
+                recorder_time.time.side_effect = [100, 100.05]
+                self._record([{'msg': 'connected'}, {'msg': 'ping'}])
+
+            started_at = time.monotonic()
+            await self._replay(FrameReplayer(self._path, realtime=True))
+
+            self.assertGreaterEqual(time.monotonic() - started_at, 0.05)
+
+    def test_replay_websocket(self):
+        """Test of success recv method of ReplayWebSocket when the recording is over. """
+
+        @self.async_case
+        async def body():
+            self._record([{'msg': 'ping'}])
+            on_finish = mock.AsyncMock()
+            websocket = ReplayWebSocket(FrameReplayer(self._path).frames(), on_finish)
+            await websocket.send('{"msg": "pong"}')
+
+            self.assertEqual(json.loads(await websocket.recv()), {'msg': 'ping'})
+            with self.assertRaises(ReplayFinished):
+                await websocket.recv()
+
+            on_finish.assert_awaited_once()
+            self.assertEqual(websocket.sent, ['{"msg": "pong"}'])
+
+    @mock.patch('meeseeks.settings.INSTALLED_APPS', ('meeseeks.MeeseeksBaseApp', ))
+    @mock.patch('meeseeks.settings.METRICS_PORT', 0)
+    def test_run_replay(self):
+        """Test of success run method of MeeseeksCore receiving frames from the recording. """
+
+        @self.async_case
+        async def body():
+            # The frames were recorded an hour ago by another bot
+            hour_ago = time.time() - 3600
+            with mock.patch('meeseeks.recorder.time') as recorder_time:
+                recorder_time.time.return_value = hour_ago
+                self._record([
+                    {'msg': 'connected', 'session': 'session'},
+                    {'msg': 'result', 'id': 'login',
+                     'result': {'id': 'recordedBot', 'token': 'token'}},
+                    {'msg': 'changed', 'collection': 'stream-room-messages', 'id': 'id',
+                     'fields': {
+                         'eventName': '__my_messages__',
+                         'args': [{
+                             '_id': 'nESwxuPygMksAapZb',
+                             'rid': 'GENERAL',
+                             'msg': f'@{settings.USER_NAME} help',
+                             'ts': {'$date': int(hour_ago * 1000)},
+                             'u': {'_id': 'ucPgkuQptW4TTqYH2', 'username': 'test', 'name': 'Test'},
+                         }, {'roomParticipant': True, 'roomType': 'c', 'roomName': 'general'}],
+                     }},
+                ])
+            core = MeeseeksCore()
+            frames = FrameReplayer(self._path, user_id='X2gR7ZHZdmsrTSDRK').frames()
+
+            async def connect(_url):
+                return ReplayWebSocket(frames, core.join)
+
+            with self.assertRaises(ReplayFinished):
+                await asyncio.wait_for(core.run(connect), 10)
+
+            self.assertEqual(core._outbox.sent, 1)
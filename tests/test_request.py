@@ -0,0 +1,84 @@
+import asyncio
+
+from meeseeks import settings
+from meeseeks.commands.base import CommandsBase
+from meeseeks.commands.decorators import cmd
+from meeseeks.context import ChangedRoomMessageCtx
+from meeseeks.request import RequestLocal
+from tests.base import BaseTestClass
+
+
+class _TestApp(CommandsBase):
+    """App with a command which yields to the event loop before reading its arguments. """
+
+    app_name = 'request_test_app'
+
+    check_permissions = None
+
+    def __init__(self):
+        super().__init__()
+
+        self.results = []
+
+    @cmd(name='echo')
+    async def cmd_echo(self):
+        """Command for tests. """
+
+        await asyncio.sleep(0)
+        self.results.append((self._ctx.msg, self._command_method.command_name,
+                             self.get_command_arguments(), ))
+
+
+class _Holder:
+    """Object with request local attribute. """
+
+    value = RequestLocal('value')
+
+    default = RequestLocal('default', None)
+
+
+class TestRequestLocal(BaseTestClass):
+    """Tests of RequestLocal class. """
+
+    def test_get(self):
+        """Test of success __get__ method. The attribute is local to the object. """
+
+        first, second = _Holder(), _Holder()
+        first.value = 'test'
+
+        self.assertEqual(first.value, 'test')
+        self.assertIsNone(second.default)
+        with self.assertRaises(AttributeError):
+            second.value  # pylint: disable=pointless-statement
+
+    def test_bind(self):
+        """Test of success bind and reset methods. """
+
+        holder = _Holder()
+        token = _Holder.default.bind(holder, 'test')
+        self.assertEqual(holder.default, 'test')
+
+        _Holder.default.reset(holder, token)
+        self.assertIsNone(holder.default)
+
+    def test_concurrent_commands(self):
+        """Test of one app instance running the same command for several messages
+        concurrently.
+        """
+
+        @self.async_case
+        async def body():
+            app = _TestApp()
+
+            async def run(argument):
+                ctx = ChangedRoomMessageCtx()
+                ctx.msg = f'@{settings.USER_NAME} echo {argument}'
+                await app.process_command(ctx, app.cmd_echo)
+
+            await asyncio.gather(run('first'), run('second'))
+
+            self.assertCountEqual(app.results, [
+                (f'@{settings.USER_NAME} echo first', 'echo', ['first'], ),
+                (f'@{settings.USER_NAME} echo second', 'echo', ['second'], ),
+            ])
+            self.assertIsNone(app._command_method)
@@ -3,6 +3,7 @@ from unittest import mock
 from aiohttp import ClientResponseError
 
 from meeseeks import RestAPI
+from meeseeks.restapi import create_client_session
 from tests.base import BaseTestClass
 from tests.server_responses import (
     CHAT_POST_MESSAGE_SUCCESS_RESPONSE,
@@ -25,6 +26,35 @@ class TestRestAPI(BaseTestClass):
             with self.assertRaises(ClientResponseError):
                 await RestAPI({}).get_users()
 
+    def test_make_request_with_session(self):
+        """Test of success make_request method using shared session. """
+
+        @self.async_case
+        async def body():
+            async with create_client_session() as session:
+                restapi = RestAPI({}, session)
+                first_response = await restapi.get_rooms()
+                second_response = await restapi.get_rooms()
+
+                self.assertFalse(session.closed)
+
+            self.assertEqual(first_response, {'general': 'GENERAL'})
+            self.assertEqual(second_response, first_response)
+
+    def test_specialize(self):
+        """Test of success specialize method. """
+
+        class SpecialRestAPI(RestAPI):
+            """RestAPI subclass for tests. """
+
+        headers = {'X-User-Id': 'X2gR7ZHZdmsrTSDRK'}
+        session = mock.Mock()
+        restapi = RestAPI(headers, session).specialize(SpecialRestAPI)
+
+        self.assertIsInstance(restapi, SpecialRestAPI)
+        self.assertIs(restapi._headers, headers)
+        self.assertIs(restapi._session, session)
+
     def test_invite_user_to_group(self):
         """Test of success invite_user_to_group method. """
 
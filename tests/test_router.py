@@ -0,0 +1,80 @@
+from unittest import mock
+
+from meeseeks import MeeseeksBaseApp, MeeseeksCore
+from meeseeks.router import CommandRouter, normalize_msg
+from tests.base import BaseTestClass
+
+
+class TestCommandRouter(BaseTestClass):
+    """Tests of CommandRouter class. """
+
+    @staticmethod
+    def _command_method(name):
+        """Return stub of command method with the given name. """
+
+        command_method = mock.Mock()
+        command_method.command_name = name
+
+        return command_method
+
+    def test_normalize_msg(self):
+        """Test of success normalize_msg function. """
+
+        self.assertEqual(normalize_msg('  Get   Users INFO '), 'get users info')
+
+    def test_resolve_longest_match(self):
+        """Test of success resolve method when one command name is prefix of another. """
+
+        users = self._command_method('get users')
+        users_info = self._command_method('get users info')
+        router = CommandRouter()
+        router.add('app', users)
+        router.add('app', users_info)
+
+        self.assertEqual(router.resolve('get users info, test'), [('app', users_info)])
+        self.assertEqual(router.resolve('get users base'), [('app', users)])
+
+    def test_resolve_several_apps(self):
+        """Test of success resolve method when the command belongs to several apps. """
+
+        first_help = self._command_method('help')
+        second_help = self._command_method('help')
+        router = CommandRouter()
+        router.add('first', first_help)
+        router.add('second', second_help)
+
+        self.assertEqual(router.resolve('help second'),
+                         [('first', first_help), ('second', second_help)])
+
+    def test_fail_resolve(self):
+        """Test of failure resolve method. """
+
+        router = CommandRouter()
+        router.add('app', self._command_method('help'))
+
+        self.assertEqual(router.resolve('hel'), [])
+        self.assertEqual(router.resolve('vote'), [])
+
+    def test_get(self):
+        """Test of success get method. """
+
+        users = self._command_method('get users')
+        router = CommandRouter()
+        router.add('app', users)
+
+        self.assertEqual(router.get('get users'), [('app', users)])
+        self.assertEqual(router.get('get users info'), [])
+        self.assertEqual(router.get(''), [])
+
+    @mock.patch('meeseeks.settings.INSTALLED_APPS', ('meeseeks.MeeseeksBaseApp', ))
+    def test_add_app(self):
+        """Test of success _add_app method. """
+
+        core = MeeseeksCore()
+        core._apps, core._router = [], CommandRouter()
+        (app, ) = core._init_apps()
+        core._add_app(app)
+        ((app, command_method), ) = core._router.resolve('get rooms info')
+
+        self.assertIsInstance(app, MeeseeksBaseApp)
+        self.assertEqual(command_method, app.cmd_rooms_info)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from unittest import mock
+
+from meeseeks.exceptions import DDPCallFailed
+from meeseeks.rtapi import RealTimeAPI
+from tests.base import BaseTestClass
+
+
+class TestRealTimeAPI(BaseTestClass):
+    """Tests of RealTimeAPI class. """
+
+    def test_login_with_resume_token(self):
+        """Test of success login method with resume token. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            await RealTimeAPI(websocket).login('resume-token')
+            request = json.loads(websocket.send.await_args.args[0])
+
+            self.assertEqual(request['params'], [{'resume': 'resume-token'}])
+
+    def test_resubscribe(self):
+        """Test of success resubscribe method after reconnection. """
+
+        @self.async_case
+        async def body():
+            first_websocket, second_websocket = mock.AsyncMock(), mock.AsyncMock()
+            rtapi = RealTimeAPI(first_websocket)
+            await rtapi.stream_all_messages()
+            await rtapi.stream_notify_logged(('Users:Deleted', ))
+            rtapi.attach(second_websocket)
+            await rtapi.resubscribe()
+
+            self.assertEqual(rtapi.subscriptions, ['sub-all', 'sub-Users:Deleted'])
+            self.assertEqual(second_websocket.send.await_args_list,
+                             first_websocket.send.await_args_list)
+
+    def test_send_message(self):
+        """Test of success send_message method. The result of the call is passed to the caller
+        when it is received.
+        """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            rtapi = RealTimeAPI(websocket)
+            task = asyncio.create_task(rtapi.send_message('Hello my friend', 'GENERAL'))
+            await asyncio.sleep(0)
+            request = json.loads(websocket.send.await_args.args[0])
+
+            self.assertFalse(rtapi.resolve({'msg': 'result', 'id': 'unknown'}))
+            self.assertTrue(rtapi.resolve({
+                'msg': 'result',
+                'id': request['id'],
+                'result': {'_id': 'nESwxuPygMksAapZb'},
+            }))
+            self.assertEqual(await task, {'message': {'_id': 'nESwxuPygMksAapZb'}, 'success': True})
+            self.assertEqual(request['method'], 'sendMessage')
+            self.assertEqual(request['params'][0]['rid'], 'GENERAL')
+
+    def test_fail_call(self):
+        """Test of failure call method when Rocket.Chat returns error. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            rtapi = RealTimeAPI(websocket)
+            task = asyncio.create_task(rtapi.set_reaction('nESwxuPygMksAapZb', ':zero:', True))
+            await asyncio.sleep(0)
+            request = json.loads(websocket.send.await_args.args[0])
+            rtapi.resolve({'msg': 'result', 'id': request['id'], 'error': {'error': 'error'}})
+
+            with self.assertRaises(DDPCallFailed):
+                await task
+
+    def test_fail_call_on_reconnection(self):
+        """Test of failure call method when the connection is lost. """
+
+        @self.async_case
+        async def body():
+            rtapi = RealTimeAPI(mock.AsyncMock())
+            task = asyncio.create_task(rtapi.call('sendMessage', {}))
+            await asyncio.sleep(0)
+            rtapi.attach(mock.AsyncMock())
+
+            with self.assertRaises(ConnectionResetError):
+                await task
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from meeseeks.leader import LeaderElector
+from meeseeks.metrics import REGISTRY
+from meeseeks.scheduler import JobStore, Scheduler, parse_crontab
+from tests.base import BaseTestClass
+
+EVERY_SECOND = '* * * * * *'
+
+
+@mock.patch('meeseeks.settings.TIME_ZONE', 'UTC')
+def _scheduler(store, max_concurrency=4):
+    """Return scheduler of the replica which is always the leader. """
+
+    return Scheduler(store, LeaderElector(), max_concurrency, 3600, True)
+
+
+def _seconds_ago(seconds):
+    """Return the time the given number of seconds ago. """
+
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+class TestScheduler(BaseTestClass):
+    """Tests of Scheduler class and its job store. """
+
+    def test_parse_crontab(self):
+        """Test of success parse_crontab function. """
+
+        self.assertEqual(parse_crontab('0 30 8 * * MON,FRI'), {
+            'second': '0',
+            'minute': '30',
+            'hour': '8',
+            'day': '*',
+            'month': '*',
+            'day_of_week': 'MON,FRI',
+        })
+
+    def test_job_store(self):
+        """Test of success JobStore class. The times of the last runs are kept between
+        restarts, the directory of the file is created if there is none.
+        """
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'data', 'jobs.json')
+            run_time = datetime(2024, 5, 1, 7, 0, tzinfo=timezone.utc)
+
+            JobStore(path).set_last_run('app:job', run_time)
+
+            store = JobStore(path)
+            self.assertEqual(store.get_last_run('app:job'), run_time)
+            self.assertIsNone(store.get_last_run('app:other_job'))
+            self.assertEqual(os.listdir(os.path.join(tmp_dir, 'data')), ['jobs.json'])
+
+    def test_missed_run(self):
+        """Test of success add_job method. The run missed while the bot was stopped is run
+        after restart and the lateness of the run is counted.
+        """
+
+        @self.async_case
+        async def body():
+            store = JobStore('')
+            store.set_last_run('test_app:missed_job', _seconds_ago(10))
+            scheduler = _scheduler(store)
+            done = asyncio.Event()
+
+            async def job(text):
+                self.assertEqual(text, 'Hello')
+                done.set()
+
+            scheduler.add_job('test_app', 'missed_job', job, EVERY_SECOND, {'text': 'Hello'})
+            scheduler.start()
+            await asyncio.wait_for(done.wait(), 0.5)
+            await scheduler.stop()
+
+            self.assertGreater(store.get_last_run('test_app:missed_job'), _seconds_ago(5))
+            self.assertIn(
+                'meeseeks_scheduler_job_lateness_seconds_count'
+                '{app="test_app",job="missed_job"} 1',
+                REGISTRY.render(),
+            )
+
+    def test_fail_missed_run(self):
+        """Test of failure add_job method. The run late more than the misfire grace time is
+        not run and counted as missed.
+        """
+
+        @self.async_case
+        async def body():
+            store = JobStore('')
+            store.set_last_run('test_app:late_job', _seconds_ago(3 * 86400))
+            scheduler = _scheduler(store)
+            runs = []
+
+            async def job():
+                runs.append(datetime.now(timezone.utc))
+
+            # The job runs daily and the last time it had to run was over two hours ago
+            crontab = f'0 0 {_seconds_ago(2 * 3600).hour} * * *'
+            scheduler.add_job('test_app', 'late_job', job, crontab, misfire_grace_time=1)
+            scheduler.start()
+            await asyncio.sleep(0.1)
+            await scheduler.stop()
+
+            self.assertEqual(runs, [])
+            self.assertIn(
+                'meeseeks_scheduler_jobs_total{app="test_app",job="late_job",result="missed"}',
+                REGISTRY.render(),
+            )
+
+    def test_max_concurrency(self):
+        """Test of success Scheduler class. The jobs wait for a free slot. """
+
+        @self.async_case
+        async def body():
+            store = JobStore('')
+            scheduler = _scheduler(store, max_concurrency=1)
+            running, max_running, finished = [0], [0], asyncio.Event()
+            runs = []
+
+            async def job(name):
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+                await asyncio.sleep(0.05)
+                running[0] -= 1
+                runs.append(name)
+                if set(runs) == {'first_job', 'second_job'}:
+                    finished.set()
+
+            for name in ('first_job', 'second_job', ):
+                store.set_last_run(f'test_app:{name}', _seconds_ago(2))
+                scheduler.add_job('test_app', name, job, EVERY_SECOND, {'name': name})
+
+            scheduler.start()
+            await asyncio.wait_for(finished.wait(), 1)
+            await scheduler.stop()
+
+            self.assertEqual(max_running, [1])
+
+    def test_interrupted_run(self):
+        """Test of success Scheduler class. The run is remembered only when it is completed,
+        so the run interrupted by the stop of the bot is run again after restart.
+        """
+
+        @self.async_case
+        async def body():
+            store = JobStore('')
+            store.set_last_run('test_app:long_job', _seconds_ago(10))
+            scheduler = _scheduler(store)
+            started, finish = asyncio.Event(), asyncio.Event()
+
+            async def job():
+                started.set()
+                await finish.wait()
+
+            scheduler.add_job('test_app', 'long_job', job, EVERY_SECOND)
+            scheduler.start()
+            await asyncio.wait_for(started.wait(), 0.5)
+            self.assertLess(store.get_last_run('test_app:long_job'), _seconds_ago(5))
+
+            finish.set()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+            self.assertGreater(store.get_last_run('test_app:long_job'), _seconds_ago(5))
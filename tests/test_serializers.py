@@ -27,8 +27,6 @@ class TestContextFactory(BaseTestClass):
             }
         }
         ctx_factory = ContextFactory()
-        login_ctx = LoginCtx
-        login_ctx._raw_context = serializable
         ctx_factory.register('result', 'login', LoginCtx)
         result = ctx_factory.get_serializer(serializable, 'result', 'login')
 
@@ -0,0 +1,71 @@
+import asyncio
+from unittest import mock
+
+from websockets.exceptions import ConnectionClosedError
+
+from meeseeks.exceptions import LogInFailed
+from meeseeks.supervisor import ConnectionSupervisor
+from tests.base import BaseTestClass
+
+
+class TestConnectionSupervisor(BaseTestClass):
+    """Tests of ConnectionSupervisor class. """
+
+    @staticmethod
+    def _supervisor(on_connect):
+        """Return supervisor which does not wait between attempts. """
+
+        return ConnectionSupervisor('ws://localhost/websocket', on_connect, 0, 0)
+
+    def test_connect_retries(self):
+        """Test of success connect method when the first attempts fail. """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            on_connect = mock.AsyncMock()
+            connect = mock.AsyncMock(side_effect=[OSError, asyncio.TimeoutError, websocket])
+            with mock.patch('websockets.connect', connect):
+                await self._supervisor(on_connect).connect()
+
+            self.assertEqual(connect.await_count, 3)
+            on_connect.assert_awaited_once_with(websocket)
+
+    def test_fail_connect(self):
+        """Test of failure connect method when the coroutine function passed to the supervisor
+        raises not a connection error.
+        """
+
+        @self.async_case
+        async def body():
+            websocket = mock.AsyncMock()
+            on_connect = mock.AsyncMock(side_effect=LogInFailed)
+            with mock.patch('websockets.connect', mock.AsyncMock(return_value=websocket)):
+                with self.assertRaises(LogInFailed):
+                    await self._supervisor(on_connect).connect()
+
+            websocket.close.assert_awaited_once()
+
+    def test_run_reconnects(self):
+        """Test of success run method when the connection is lost. """
+
+        @self.async_case
+        async def body():
+            first_websocket, second_websocket = mock.AsyncMock(), mock.AsyncMock()
+            on_connect = mock.AsyncMock()
+            loop = mock.AsyncMock(side_effect=[
+                ConnectionClosedError(None, None),
+                asyncio.CancelledError,
+            ])
+            connect = mock.AsyncMock(side_effect=[first_websocket, second_websocket])
+            supervisor = self._supervisor(on_connect)
+            with mock.patch('websockets.connect', connect):
+                await supervisor.connect()
+                with self.assertRaises(asyncio.CancelledError):
+                    await supervisor.run(loop)
+
+            first_websocket.close.assert_awaited_once()
+            on_connect.assert_awaited_with(second_websocket)
+            self.assertEqual(supervisor.reconnects, 1)
+            self.assertGreaterEqual(supervisor.downtime, 0)
+            self.assertIsNone(supervisor.disconnected_at)
@@ -0,0 +1,190 @@
+import asyncio
+import socket
+from unittest import mock
+
+from meeseeks import settings
+from meeseeks.context import ChangedRoomMessageCtx
+from meeseeks.envelope import Envelope
+from meeseeks.exceptions import AbortCommandExecution, BadConfigure, WorkerError
+from meeseeks.workers import Channel, RemoteApp, dump_ctx, load_ctx, parse_worker_apps
+from tests.base import BaseTestClass
+
+
+async def _channels(first_handler, second_handler):
+    """Return two channels connected to each other. """
+
+    first_socket, second_socket = socket.socketpair()
+    first = Channel(*await asyncio.open_connection(sock=first_socket), first_handler)
+    second = Channel(*await asyncio.open_connection(sock=second_socket), second_handler)
+
+    return first, second
+
+
+def _room_message(msg):
+    """Return context of the room message with its envelope. """
+
+    ctx = ChangedRoomMessageCtx()
+    ctx.message = {
+        '_id': 'message', 'rid': 'general', 'msg': msg, 'ts': {'$date': 0},
+        'u': {'_id': 'user', 'username': 'user', 'name': 'User'},
+    }
+    ctx.room_options = {'roomType': 'c', 'roomParticipant': True, 'roomName': 'general'}
+    ctx.msg = msg
+    ctx.fresh_msg_date = True
+    ctx.envelope = Envelope(True, 'help', 'help', (), False)
+
+    return ctx
+
+
+class TestWorkers(BaseTestClass):
+    """Tests of worker processes of apps. """
+
+    def test_parse_worker_apps(self):
+        """Test of success parse_worker_apps function. """
+
+        self.assertEqual(parse_worker_apps(''), {})
+        self.assertEqual(parse_worker_apps('apps.Holidays:2, apps.Reminder'),
+                         {'apps.Holidays': 2, 'apps.Reminder': None})
+
+    def test_fail_parse_worker_apps(self):
+        """Test of failure parse_worker_apps function. """
+
+        with self.assertRaises(BadConfigure):
+            parse_worker_apps('apps.Holidays:first')
+
+    def test_dump_ctx(self):
+        """Test of success dump_ctx and load_ctx functions. """
+
+        ctx = load_ctx(dump_ctx(_room_message(f'@{settings.USER_NAME} help')))
+
+        self.assertEqual(ctx.msg, f'@{settings.USER_NAME} help')
+        self.assertEqual(ctx.user.id, 'user')
+        self.assertEqual(ctx.room.type, 'c')
+        self.assertTrue(ctx.fresh_msg_date)
+        self.assertEqual(ctx.envelope, Envelope(True, 'help', 'help', (), False))
+
+    def test_channel_call(self):
+        """Test of success call method. Both sides call each other. """
+
+        @self.async_case
+        async def body():
+            async def handle(method, args):
+                if method == 'abort':
+                    raise AbortCommandExecution
+                if method == 'fail':
+                    raise ValueError('test')
+
+                return [method, args]
+
+            first, second = await _channels(handle, handle)
+            serving = [asyncio.create_task(first.serve()), asyncio.create_task(second.serve())]
+
+            self.assertEqual(await first.call('echo', 1, 'a'), ['echo', [1, 'a']])
+            self.assertEqual(await second.call('echo'), ['echo', []])
+            with self.assertRaises(AbortCommandExecution):
+                await first.call('abort')
+            with self.assertRaises(WorkerError):
+                await first.call('fail')
+
+            await first.close()
+            await asyncio.gather(*serving)
+            await second.close()
+
+    def test_channel_closed(self):
+        """Test of failure call method when the other side closes the channel. """
+
+        @self.async_case
+        async def body():
+            async def handle(method, args):
+                await asyncio.sleep(10)
+
+            first, second = await _channels(handle, handle)
+            serving = asyncio.create_task(first.serve())
+            call = asyncio.create_task(first.call('sleep'))
+            await asyncio.sleep(0.1)
+            await second.close()
+
+            with self.assertRaises(WorkerError):
+                await call
+
+            await serving
+            await first.close()
+
+    @mock.patch('meeseeks.settings.WORKER_START_TIMEOUT', 30)
+    def test_remote_app(self):
+        """Test of success RemoteApp class. The command runs in the worker process and
+        the reply is sent by the core.
+        """
+
+        @self.async_case
+        async def body():
+            restapi = mock.Mock()
+            restapi.get_user_info = mock.AsyncMock(return_value={'roles': ['user']})
+            restapi.write_msg = mock.AsyncMock(return_value={'success': True})
+            app = RemoteApp('meeseeks.MeeseeksBaseApp', _user_id='bot', _restapi=restapi)
+            self.assertEqual(app.app_name, 'meeseeks.MeeseeksBaseApp')
+
+            try:
+                await app.setup()
+                self.assertEqual(app.app_name, 'meeseeks')
+                command_method = next(method for method in app.get_command_methods()
+                                      if method.command_name == 'help')
+                await app.process(_room_message(f'@{settings.USER_NAME} help'))
+                await app.process_command(_room_message(f'@{settings.USER_NAME} help'),
+                                          command_method)
+            finally:
+                await app.teardown()
+
+            restapi.get_user_info.assert_awaited_with('user')
+            text, room_id, _ = restapi.write_msg.await_args.args
+            self.assertIn('**meeseeks** commands', text)
+            self.assertEqual(room_id, 'general')
+
+    @mock.patch('meeseeks.settings.WORKER_START_TIMEOUT', 30)
+    @mock.patch('meeseeks.settings.WORKER_RESTART_BACKOFF_BASE', 0.01)
+    def test_remote_app_restart(self):
+        """Test of success RemoteApp class. The worker process which exited is restarted
+        and runs the commands again.
+        """
+
+        @self.async_case
+        async def body():
+            restapi = mock.Mock()
+            restapi.get_user_info = mock.AsyncMock(return_value={'roles': ['user']})
+            restapi.write_msg = mock.AsyncMock(return_value={'success': True})
+            app = RemoteApp('meeseeks.MeeseeksBaseApp', _user_id='bot', _restapi=restapi)
+
+            try:
+                await app.setup()
+                command_method = app.get_command_methods()[0]
+                worker = app._worker
+                worker.kill()
+                await worker.wait()
+
+                while app._channel is None or app._worker is worker:
+                    await asyncio.sleep(0.05)
+
+                await app.process_command(_room_message(f'@{settings.USER_NAME} help'),
+                                          command_method)
+            finally:
+                await app.teardown()
+
+            restapi.write_msg.assert_awaited()
+
+    def test_remote_app_without_process(self):
+        """Test of success RemoteApp class. The messages are not passed to the worker
+        if its app does not process them.
+        """
+
+        @self.async_case
+        async def body():
+            app = RemoteApp('meeseeks.MeeseeksBaseApp')
+            app._channel = mock.Mock()
+            app._channel.call = mock.AsyncMock()
+
+            await app.process(_room_message('Hello'))
+            app._channel.call.assert_not_awaited()
+
+            app._processes = True
+            await app.process(_room_message('Hello'))
+            app._channel.call.assert_awaited_once()